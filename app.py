@@ -1,6 +1,13 @@
+import os
+
 import dash
+import flask
 from dash import html, dcc
 
+from models.sweep import sir_sweep_grid
+from utils import metrics, profiling, static_figures, warmup
+from utils.cache import cached_simulation, simulation_cache
+
 app = dash.Dash(__name__, use_pages=True)
 
 app.layout = html.Div([
@@ -14,5 +21,51 @@ app.layout = html.Div([
     dash.page_container
 ])
 
+static_figures.init_app(app.server)
+metrics.init_app(app)
+profiling.init_app(app)
+
+# Dependencias diferidas, figuras estáticas y resultados de los valores por defecto de
+# las páginas, listos antes de la primera visita (ver utils/warmup.py y TECDEMODEL_LAZY)
+warmup.warm_up(en_segundo_plano=warmup.LAZY)
+
+
+@app.server.route("/healthz")
+def healthz():
+    """Comprobación de salud: 200 cuando el precálculo terminó, 503 mientras sigue en curso."""
+    listo = warmup.ready()
+    return flask.jsonify(status="ok" if listo else "warming", pid=os.getpid()), 200 if listo else 503
+
+
+@app.server.route("/cache/stats")
+def cache_stats():
+    return flask.jsonify(simulation_cache.stats())
+
+
+barrido_sir = cached_simulation(sir_sweep_grid)
+
+
+@app.server.route("/api/barrido-sir")
+def api_barrido_sir():
+    """
+    Barrido SIR como JSON. Parámetros de consulta: beta_min, beta_max,
+    eje (gamma, I0 o N), eje_min, eje_max, resolucion y, opcionales,
+    N, I0, gamma y tiempo_max. Comparte caché con la página /barrido.
+    """
+    consulta = flask.request.args
+    try:
+        resultado = barrido_sir(
+            float(consulta["beta_min"]), float(consulta["beta_max"]), consulta.get("eje", "gamma"),
+            float(consulta["eje_min"]), float(consulta["eje_max"]), int(consulta.get("resolucion", 100)),
+            float(consulta.get("N", 1000)), float(consulta.get("I0", 1)),
+            float(consulta.get("gamma", 0.1)), float(consulta.get("tiempo_max", 160)),
+        )
+    except KeyError as error:
+        return flask.jsonify(error=f"Falta el parámetro {error.args[0]}"), 400
+    except ValueError as error:
+        return flask.jsonify(error=str(error)), 400
+    return flask.jsonify({clave: valor.tolist() for clave, valor in resultado.items()})
+
 if __name__ == "__main__":
+    # Servidor de desarrollo (recarga y depurador); en producción: gunicorn -c gunicorn.conf.py wsgi:server
     app.run(debug=True)
\ No newline at end of file
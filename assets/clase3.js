@@ -0,0 +1,41 @@
+// Curva logística de la clase 3 evaluada en el navegador (ver pages/clase3.py)
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    clase3: {
+        actualizar_grafica: function(p0, r, K, tmax, layoutBase) {
+            if (!p0 || !r || !K || !tmax) {
+                return {data: [], layout: {}};
+            }
+
+            // Modelo logístico: P(t) = K / (1 + ((K - P0)/P0) * e^{-r t})
+            var n = 200, t = new Array(n), P = new Array(n);
+            for (var i = 0; i < n; i++) {
+                t[i] = tmax * i / (n - 1);
+                P[i] = K / (1 + ((K - p0) / p0) * Math.exp(-r * t[i]));
+            }
+
+            var layout = Object.assign({}, layoutBase, {
+                // Línea de capacidad de carga
+                shapes: [{
+                    type: "line", xref: "x domain", x0: 0, x1: 1, yref: "y", y0: K, y1: K,
+                    line: {color: "red", dash: "dot"}
+                }],
+                annotations: [{
+                    text: "K", showarrow: false, xref: "x domain", x: 1, xanchor: "right",
+                    yref: "y", y: K, yanchor: "bottom"
+                }]
+            });
+
+            return {
+                data: [{
+                    type: "scatter", x: t, y: P,
+                    mode: "lines+markers",
+                    name: "P(t)",
+                    line: {color: "blue", width: 2},
+                    marker: {symbol: "circle", size: 4},
+                    hovertemplate: "t=%{x}<br>P=%{y:.2f}"
+                }],
+                layout: layout
+            };
+        }
+    }
+});
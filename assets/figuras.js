@@ -0,0 +1,11 @@
+// Carga en el navegador las figuras preserializadas (utils/static_figures.py)
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    figuras: {
+        cargar: function(id) {
+            var nombre = id.replace(/^figura-estatica-/, "");
+            return fetch("/_figuras/" + nombre + ".json").then(function(respuesta) {
+                return respuesta.json();
+            });
+        }
+    }
+});
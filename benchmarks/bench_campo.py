@@ -0,0 +1,66 @@
+"""
+Tamaño del JSON y tiempo de construcción del campo vectorial de la clase 5:
+una traza por flecha (implementación anterior) frente a `vector_field_traces`.
+
+Uso (desde la raíz del repositorio):
+
+    python -m benchmarks.bench_campo
+"""
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from utils.figures import vector_field_traces
+
+
+def campo(n, xmax=5, ymax=5):
+    X, Y = np.meshgrid(np.linspace(-xmax, xmax, n), np.linspace(-ymax, ymax, n))
+    return X, Y, np.sin(X), np.cos(X)
+
+
+def figura_por_flecha(X, Y, fx, fy):
+    fig = go.Figure()
+    n = X.shape[0]
+    for i in range(n):
+        for j in range(n):
+            x0, y0 = X[i, j], Y[i, j]
+            x1, y1 = x0 + fx[i, j], y0 + fy[i, j]
+            fig.add_trace(go.Scatter(
+                x=[x0, x1], y=[y0, y1],
+                mode="lines+markers",
+                line=dict(color="blue", width=2),
+                showlegend=False
+            ))
+    return fig
+
+
+def medir(construir, X, Y, fx, fy):
+    inicio = time.perf_counter()
+    fig = construir(X, Y, fx, fy)
+    construccion = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    contenido = pio.to_json(fig, validate=False)
+    serializacion = time.perf_counter() - inicio
+    return len(fig.data), len(contenido), construccion, serializacion
+
+
+def main():
+    metodos = [
+        ("por flecha", figura_por_flecha, 50),  # la versión anterior no escala más allá
+        ("vectorizado", lambda *a: go.Figure(data=vector_field_traces(*a)), 200),
+        ("vectorizado gl", lambda *a: go.Figure(data=vector_field_traces(*a, webgl=True)), 200),
+    ]
+    print(f"{'método':<16}{'malla':>8}{'trazas':>8}{'JSON (kB)':>12}{'build (s)':>12}{'json (s)':>10}")
+    for n in (15, 50, 100, 200):
+        for nombre, construir, n_max in metodos:
+            if n > n_max:
+                continue
+            trazas, tamano, construccion, serializacion = medir(construir, *campo(n))
+            print(f"{nombre:<16}{f'{n}x{n}':>8}{trazas:>8}{tamano / 1024:>12.1f}"
+                  f"{construccion:>12.3f}{serializacion:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
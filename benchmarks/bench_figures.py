@@ -0,0 +1,97 @@
+"""
+Construcción y serialización de una figura SIR (3 curvas) por tres caminos:
+
+- go.Figure: `add_trace` + `update_layout` + `update_xaxes/yaxes`, como
+  se hacía en cada página (validación de Plotly y plantilla incluida).
+- dict + listas: `figure_dict` con los arrays convertidos a listas de JSON.
+- dict + base64: `figure_dict` / `line_trace` tal como los usan las páginas.
+
+La serialización usa `plotly.io.json.to_json_plotly`, el mismo codificador
+con el que Dash envía la respuesta del callback.
+
+Uso (desde la raíz del repositorio):
+
+    python -m benchmarks.bench_figures
+"""
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly.io.json import to_json_plotly
+
+from models.compartmental import SIR
+from utils.figures import figure_dict, line_trace
+
+
+REPETICIONES = 20
+SERIES = (("Suceptibles (S)", "blue"), ("Infectados(I)", "red"), ("Recuperados (R)", "green"))
+
+
+def figura_go(t, solucion):
+    fig = go.Figure()
+    for i, (nombre, color) in enumerate(SERIES):
+        fig.add_trace(go.Scatter(
+            x=t, y=solucion[:, i],
+            mode='lines',
+            name=nombre,
+            line=dict(color=color, width=2),
+            hovertemplate="Día: %{x:.0f} <br> %{y:.0f}<extra></extra>"
+        ))
+    fig.update_layout(
+        title=dict(text="<b>Evolucion del modelo SIR</b>", x=0.5, font=dict(size=16, color='darkblue')),
+        xaxis_title="Tiempo (días)",
+        yaxis_title="Número de personas",
+        paper_bgcolor="lightcyan",
+        plot_bgcolor="white",
+    )
+    for actualizar in (fig.update_xaxes, fig.update_yaxes):
+        actualizar(
+            showgrid=True, gridwidth=1, gridcolor="lightpink",
+            zeroline=True, zerolinewidth=2, zerolinecolor="red",
+            showline=True, linecolor="black", linewidth=2, mirror=True,
+        )
+    return fig
+
+
+def figura_dict(t, solucion):
+    return figure_dict(
+        [line_trace(t, solucion[:, i], nombre, color, hovertemplate="Día: %{x:.0f} <br> %{y:.0f}<extra></extra>")
+         for i, (nombre, color) in enumerate(SERIES)],
+        tema="sir", titulo="Evolucion del modelo SIR",
+        x_titulo="Tiempo (días)", y_titulo="Número de personas",
+    )
+
+
+def figura_dict_listas(t, solucion):
+    figura = figura_dict(t, solucion)
+    for traza, i in zip(figura["data"], range(len(SERIES))):
+        traza["x"], traza["y"] = t.tolist(), solucion[:, i].tolist()
+    return figura
+
+
+def medir(construir, t, solucion):
+    inicio = time.perf_counter()
+    for _ in range(REPETICIONES):
+        figura = construir(t, solucion)
+    construccion = (time.perf_counter() - inicio) / REPETICIONES
+    inicio = time.perf_counter()
+    for _ in range(REPETICIONES):
+        contenido = to_json_plotly(figura)
+    serializacion = (time.perf_counter() - inicio) / REPETICIONES
+    return len(contenido), construccion, serializacion
+
+
+def main():
+    metodos = (("go.Figure", figura_go), ("dict + listas", figura_dict_listas), ("dict + base64", figura_dict))
+    print(f"{'método':<15}{'puntos':>9}{'JSON (kB)':>11}{'build (ms)':>12}{'json (ms)':>11}")
+    for puntos in (200, 2_000, 20_000, 200_000):
+        t = np.linspace(0, 160, puntos)
+        solucion = SIR.simulate([999, 1, 0], t, {"beta": 0.3, "gamma": 0.1})
+        for nombre, construir in metodos:
+            tamano, construccion, serializacion = medir(construir, t, solucion)
+            print(f"{nombre:<15}{puntos:>9,}{tamano / 1024:>11.1f}"
+                  f"{1000 * construccion:>12.2f}{1000 * serializacion:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
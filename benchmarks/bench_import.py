@@ -0,0 +1,112 @@
+"""
+Tiempo de arranque: cuánto cuesta `import app` y en qué se va.
+
+Importa la aplicación en un proceso nuevo con `python -X importtime`, en modo
+diferido (TECDEMODEL_LAZY=1, el de producción) y en modo inmediato
+(TECDEMODEL_LAZY=0), sin precálculo, y muestra por separado:
+
+- los módulos del proyecto (models, utils) con su tiempo propio y acumulado;
+- las páginas: Dash las ejecuta sin pasar por el sistema de importación, así
+  que `-X importtime` las omite y su tiempo se mide envolviendo
+  `SourceFileLoader.exec_module` (acumulado, con lo que importan);
+- las dependencias agrupadas por paquete (suma de tiempos propios).
+
+Con `max_ms` el script termina con código 1 si el modo diferido supera ese
+total, para detectar regresiones del arranque.
+
+Uso (desde la raíz del repositorio):
+
+    python -m benchmarks.bench_import [max_ms]
+"""
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+
+REPETICIONES = 3
+MAS_LENTOS = 12
+PROYECTO = ("app", "models", "utils")
+
+# Código del proceso hijo: mide las páginas y el total, y los imprime como JSON
+HIJO = """
+import json, time
+from importlib.machinery import SourceFileLoader
+
+paginas = {}
+exec_module = SourceFileLoader.exec_module
+
+def medir(self, modulo):
+    if not modulo.__name__.startswith("pages."):
+        return exec_module(self, modulo)
+    inicio = time.perf_counter()
+    try:
+        return exec_module(self, modulo)
+    finally:
+        paginas[modulo.__name__] = time.perf_counter() - inicio
+
+SourceFileLoader.exec_module = medir
+inicio = time.perf_counter()
+import app
+print(json.dumps({"total": time.perf_counter() - inicio, "paginas": paginas}))
+"""
+
+
+def importtime(lineas):
+    """(módulo, propio, acumulado) en µs de cada línea de `-X importtime`."""
+    for linea in lineas:
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, nombre = linea[len("import time:"):].split("|")
+        yield nombre.strip(), int(propio), int(acumulado)
+
+
+def medir(lazy):
+    """Mejor de REPETICIONES arranques: (total en s, módulos, páginas)."""
+    entorno = dict(os.environ, TECDEMODEL_LAZY="1" if lazy else "0", TECDEMODEL_WARMUP="0")
+    mejor = None
+    for _ in range(REPETICIONES):
+        proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", HIJO], env=entorno,
+                                 capture_output=True, text=True, check=True)
+        resultado = json.loads(proceso.stdout.strip().splitlines()[-1])
+        if mejor is None or resultado["total"] < mejor[0]:
+            mejor = (resultado["total"], list(importtime(proceso.stderr.splitlines())), resultado["paginas"])
+    return mejor
+
+
+def reporte(titulo, total, modulos, paginas):
+    print(f"\n== {titulo}: import app = {1000 * total:.0f} ms ==")
+
+    print(f"\n{'módulo del proyecto':<32}{'propio (ms)':>12}{'acumulado (ms)':>16}")
+    for nombre, propio, acumulado in sorted(modulos, key=lambda m: -m[2]):
+        if nombre.split(".")[0] in PROYECTO:
+            print(f"{nombre:<32}{propio / 1000:>12.1f}{acumulado / 1000:>16.1f}")
+
+    print(f"\n{'página':<32}{'acumulado (ms)':>28}")
+    for nombre, segundos in sorted(paginas.items(), key=lambda p: -p[1]):
+        print(f"{nombre:<32}{1000 * segundos:>28.1f}")
+
+    por_paquete = defaultdict(int)
+    for nombre, propio, _ in modulos:
+        paquete = nombre.split(".")[0]
+        if paquete not in PROYECTO:
+            por_paquete[paquete] += propio
+    print(f"\n{'dependencia':<32}{'total (ms)':>28}")
+    for paquete, propio in sorted(por_paquete.items(), key=lambda p: -p[1])[:MAS_LENTOS]:
+        print(f"{paquete:<32}{propio / 1000:>28.1f}")
+
+
+def main():
+    max_ms = float(sys.argv[1]) if len(sys.argv) > 1 else None
+    diferido = medir(lazy=True)
+    inmediato = medir(lazy=False)
+    reporte("TECDEMODEL_LAZY=1", *diferido)
+    reporte("TECDEMODEL_LAZY=0", *inmediato)
+    if max_ms is not None and 1000 * diferido[0] > max_ms:
+        print(f"\nRegresión: {1000 * diferido[0]:.0f} ms > {max_ms:.0f} ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Compara el método de Euler de `logistic_with_harvest` con el integrador
+adaptativo Dormand–Prince a igual precisión.
+
+Uso (desde la raíz del repositorio):
+
+    python -m benchmarks.bench_logistic
+"""
+import time
+
+from models.logistic_model import logistic_with_harvest, logistic_with_harvest_adaptive
+
+
+ESCENARIOS = [
+    # (p0, r, K, tmax, h)
+    (200, 0.04, 750, 100, 5),
+    (500, 0.5, 750, 8, 10),
+    (100, 2.0, 750, 2, 50),
+]
+
+
+def cronometrar(funcion, repeticiones=20):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        resultado = funcion()
+    return (time.perf_counter() - inicio) / repeticiones, resultado
+
+
+def main():
+    print(f"{'escenario':<28}{'método':<10}{'pasos':>8}{'error P(tmax)':>16}{'tiempo (ms)':>14}")
+    for p0, r, K, tmax, h in ESCENARIOS:
+        _, referencia, _ = logistic_with_harvest_adaptive(p0, r, K, tmax, h=h, rtol=1e-12, atol=1e-12)
+        referencia = referencia[-1]
+
+        tiempo_rk, (_, P, info) = cronometrar(
+            lambda: logistic_with_harvest_adaptive(p0, r, K, tmax, h=h, rtol=1e-6, atol=1e-9))
+        objetivo = abs(P[-1] - referencia)
+
+        # Se duplica la malla de Euler hasta igualar el error del adaptativo
+        puntos = 200
+        while True:
+            tiempo_euler, (_, P_euler) = cronometrar(
+                lambda: logistic_with_harvest(p0, r, K, tmax, h=h, puntos=puntos), repeticiones=3)
+            error_euler = abs(P_euler[-1] - referencia)
+            if error_euler <= objetivo or puntos >= 2**24:
+                break
+            puntos *= 2
+
+        nombre = f"p0={p0} r={r} h={h}"
+        print(f"{nombre:<28}{'DOPRI5':<10}{info['pasos']:>8}{objetivo:>16.2e}{tiempo_rk * 1e3:>14.3f}")
+        print(f"{'':<28}{'Euler':<10}{puntos - 1:>8}{error_euler:>16.2e}{tiempo_euler * 1e3:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
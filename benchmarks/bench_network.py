@@ -0,0 +1,46 @@
+"""
+Pasos por segundo de `network_simulate` según el tamaño de la red.
+
+Para cada tamaño se construye un grafo aleatorio con grado medio 20 (a 1M de
+nodos son 10M de aristas) y se miden pasos con una epidemia en curso, de
+modo que todos los pasos hacen el producto matriz–vector completo.
+
+Uso (desde la raíz del repositorio):
+
+    python -m benchmarks.bench_network [nodos_max]
+"""
+import sys
+import time
+
+from models.network import network_simulate, random_graph, small_world_graph
+
+
+GRADO_MEDIO = 20
+PASOS = 20
+
+
+def medir(A, modo):
+    # γ pequeño y 1 % de infectados: el brote no se extingue durante la medición
+    inicio = time.perf_counter()
+    network_simulate(A, A.shape[0] // 100, beta=0.05, gamma=0.01, pasos=PASOS, modo=modo, semilla=0)
+    return PASOS / (time.perf_counter() - inicio)
+
+
+def main():
+    nodos_max = int(float(sys.argv[1])) if len(sys.argv) > 1 else 1_000_000
+    print(f"{'red':>14} {'nodos':>10} {'aristas':>11} {'construcción':>13} {'pasos/s SIR':>12} {'pasos/s rumor':>14}")
+    n = 10_000
+    while n <= nodos_max:
+        for nombre, construir in (("aleatoria", lambda: random_graph(n, GRADO_MEDIO, semilla=1)),
+                                  ("mundo pequeño", lambda: small_world_graph(n, GRADO_MEDIO, 0.1, semilla=1))):
+            inicio = time.perf_counter()
+            A = construir()
+            construccion = time.perf_counter() - inicio
+            print(f"{nombre:>14} {n:>10,} {A.nnz // 2:>11,} {construccion:>12.2f}s "
+                  f"{medir(A, 'sir'):>12.1f} {medir(A, 'rumor'):>14.1f}")
+            del A
+        n *= 10
+
+
+if __name__ == "__main__":
+    main()
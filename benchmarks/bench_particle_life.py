@@ -0,0 +1,38 @@
+"""
+Pasos por segundo de `ParticleLife` según el número de partículas.
+
+Con el radio del sketch (0.15) cada partícula tiene ~18 vecinas cuando hay
+1000; para que la densidad de interacciones sea comparable al crecer n el
+radio se escala como 0.15·sqrt(1000/n). Se descartan los primeros pasos
+(las partículas parten de una malla y todavía no se agrupan).
+
+Uso (desde la raíz del repositorio):
+
+    python -m benchmarks.bench_particle_life [particulas_max]
+"""
+import sys
+import time
+
+from models.particle_life import ParticleLife
+
+
+PASOS = 10
+CALENTAMIENTO = 20
+
+
+def main():
+    particulas_max = int(float(sys.argv[1])) if len(sys.argv) > 1 else 100_000
+    print(f"{'partículas':>11} {'radio':>7} {'vecinos':>8} {'pasos/s':>9} {'ms/paso':>9}")
+    n = 1_000
+    while n <= particulas_max:
+        radio = 0.15 * (1_000 / n) ** 0.5
+        sim = ParticleLife(n=n, radio=radio).step(pasos=CALENTAMIENTO)
+        inicio = time.perf_counter()
+        sim.step(pasos=PASOS)
+        duracion = (time.perf_counter() - inicio) / PASOS
+        print(f"{n:>11,} {radio:>7.4f} {sim.vecinos_medios:>8.1f} {1 / duracion:>9.1f} {1000 * duracion:>9.1f}")
+        n *= 10
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Latencia de la comparación de ubicaciones de la clase 8: consultas secuenciales
+frente a `WeatherClient.hourly_temperature_many`, contra un servidor local que
+imita a Open-Meteo con retardos inyectados por ubicación.
+
+Uso (desde la raíz del repositorio):
+
+    python -m benchmarks.bench_weather
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from utils.weather import WeatherClient
+
+
+# Retardo (s) por latitud; la ubicación más lenta tarda 1.5 s
+RETARDOS = {1.0: 0.5, 2.0: 1.0, 3.0: 1.5, 4.0: 0.8, 5.0: 1.2}
+
+
+class ServidorFalso(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        consulta = parse_qs(urlparse(self.path).query)
+        lat = float(consulta["latitude"][0])
+        horas = 24 * (int(consulta["past_days"][0]) + 1)
+        time.sleep(RETARDOS.get(lat, 0))
+        cuerpo = json.dumps({"hourly": {
+            "time": [f"2025-01-{1 + h // 24:02d}T{h % 24:02d}:00" for h in range(horas)],
+            "temperature_2m": [15 + lat + (h % 24) / 4 for h in range(horas)],
+        }}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+
+def main():
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), ServidorFalso)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{servidor.server_port}/v1/forecast"
+    ubicaciones = [(lat, -70.0) for lat in RETARDOS]
+
+    cliente = WeatherClient(base_url=url, ttl=0)
+    inicio = time.perf_counter()
+    for lat, lon in ubicaciones:
+        cliente.hourly_temperature(lat, lon, 7)
+    secuencial = time.perf_counter() - inicio
+
+    cliente = WeatherClient(base_url=url, ttl=0)
+    inicio = time.perf_counter()
+    frame, errores = cliente.hourly_temperature_many(ubicaciones, 7)
+    concurrente = time.perf_counter() - inicio
+
+    print(f"ubicaciones: {len(ubicaciones)}, suma de retardos: {sum(RETARDOS.values()):.2f} s, "
+          f"máximo: {max(RETARDOS.values()):.2f} s")
+    print(f"secuencial:  {secuencial:.2f} s")
+    print(f"concurrente: {concurrente:.2f} s  ({frame.shape[0]} horas x {frame.shape[1]} series, "
+          f"{len(errores)} errores)")
+    print(frame.agg(["min", "max", "mean"]).T)
+    servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Configuración de gunicorn para producción.
+
+    gunicorn -c gunicorn.conf.py wsgi:server
+
+El proceso maestro importa la aplicación una vez (`preload_app`) con el
+precálculo en línea: dependencias, figuras estáticas y simulaciones por
+defecto quedan en memoria antes de crear los workers, que las heredan por
+fork y atienden la primera visita sin calcular nada.
+
+Un solo worker, a propósito: el estado de los trabajos de `utils.jobs`
+(enviar y luego consultar con el Interval) y las simulaciones de
+/particulas viven en la memoria del proceso, y con varios workers la
+consulta suele llegar a uno que nunca vio el trabajo. La concurrencia se
+escala con hilos (los callbacks pasan casi todo el tiempo esperando a los
+procesos de trabajo) y el cálculo con TECDEMODEL_JOB_WORKERS. Por eso
+WEB_CONCURRENCY, que algunas plataformas definen solas, se ignora.
+
+Variables de entorno:
+
+    PORT               puerto (Render lo define; por defecto 8000)
+    GUNICORN_THREADS   hilos del worker (por defecto 4 por CPU)
+    GUNICORN_TIMEOUT   segundos antes de reiniciar un worker colgado (60)
+"""
+import logging
+import math
+import os
+
+# Mensajes de la aplicación (p. ej. la duración del precálculo) en el mismo registro que gunicorn
+logging.basicConfig(level=logging.INFO, format="[%(asctime)s] [%(process)d] [%(levelname)s] %(name)s: %(message)s",
+                    datefmt="%Y-%m-%d %H:%M:%S %z")
+
+# Un hilo de precálculo en el maestro no sobrevive al fork: con preload todo se hace en línea
+os.environ["TECDEMODEL_LAZY"] = "0"
+
+
+def _cpus():
+    """CPU disponibles para el contenedor: cuota de cgroup si la hay, si no las asignadas al proceso."""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as archivo:  # cgroup v2: "cuota periodo" o "max periodo"
+            cuota, periodo = archivo.read().split()
+        if cuota != "max":
+            return max(1, math.ceil(int(cuota) / int(periodo)))
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as archivo:  # cgroup v1
+            cuota = int(archivo.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as archivo:
+            periodo = int(archivo.read())
+        if cuota > 0:
+            return max(1, math.ceil(cuota / periodo))
+    except (OSError, ValueError):
+        pass
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+preload_app = True
+
+# Un worker (ver arriba): las simulaciones pesadas corren en los procesos de
+# utils.jobs, así que sus hilos pasan casi todo el tiempo esperando
+workers = 1
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 4 * _cpus()))
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 60))
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOGLEVEL", "info")
+
+
+def when_ready(server):
+    if os.environ.get("WEB_CONCURRENCY", "1") != "1":
+        server.log.warning("WEB_CONCURRENCY=%s ignorado: un solo worker (ver gunicorn.conf.py)",
+                           os.environ["WEB_CONCURRENCY"])
+    server.log.info("Aplicación precargada: %d worker x %d hilos", workers, threads)
+
+
+def post_worker_init(worker):
+    # Antes de aceptar conexiones. Con preload todo está heredado y esto solo
+    # comprueba la caché; sin preload (--no-preload) el worker ya hizo el
+    # precálculo al importar la aplicación.
+    from utils import warmup
+    from utils.jobs import default_runner
+
+    warmup.warm_up()
+    # Aún sin los hilos de gthread: el único fork del worker, el de la plantilla
+    # que crea los procesos de trabajo (ver utils/jobs.py)
+    default_runner.start()
@@ -0,0 +1,199 @@
+"""
+Motor genérico de modelos compartimentales.
+
+Un modelo se declara una sola vez como una lista de compartimentos y de
+transiciones entre ellos. A partir de esa declaración se generan el lado
+derecho vectorizado del sistema de EDOs y su Jacobiano analítico, que se
+entrega a `odeint` para que LSODA no tenga que aproximarlo por diferencias
+finitas cuando el problema se vuelve rígido.
+
+`scipy.integrate` se importa en la primera integración y no al importar el
+módulo: cuesta casi medio segundo y las páginas solo necesitan las
+declaraciones de los modelos para registrarse.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+
+Transition = namedtuple("Transition", ["origen", "destino", "tasa", "contacto"], defaults=[None])
+Transition.__doc__ = """
+Flujo de individuos de `origen` a `destino`.
+
+origen, destino : str
+    Nombres de los compartimentos
+tasa : str
+    Nombre del parámetro que multiplica el flujo
+contacto : str o None
+    Compartimento que provoca la transición por contacto (acción de masas):
+    flujo = tasa * origen * contacto [/ N]. Si es None el flujo es lineal:
+    flujo = tasa * origen.
+"""
+
+
+class CompartmentalModel:
+    """
+    Modelo compartimental definido por sus transiciones.
+
+    Parámetros:
+    -----------
+    compartimentos : list of str
+        Nombres de los compartimentos, en el orden del vector de estado
+    transiciones : list of Transition
+        Flujos entre compartimentos
+    normalizado : bool
+        Si es True, los flujos por contacto se dividen entre la población
+        total N (β por individuo); si es False, β es la tasa por pareja.
+    """
+
+    def __init__(self, compartimentos, transiciones, normalizado=True):
+        self.compartimentos = tuple(compartimentos)
+        self.transiciones = tuple(transiciones)
+        self.normalizado = normalizado
+        self.parametros = tuple(dict.fromkeys(tr.tasa for tr in self.transiciones))
+
+        indice = {nombre: i for i, nombre in enumerate(self.compartimentos)}
+        n = len(self.compartimentos)
+        self._origen = np.array([indice[tr.origen] for tr in self.transiciones])
+        self._destino = np.array([indice[tr.destino] for tr in self.transiciones])
+        # Los flujos lineales apuntan a una fila auxiliar de unos (índice n)
+        self._contacto = np.array([
+            n if tr.contacto is None else indice[tr.contacto] for tr in self.transiciones
+        ])
+        self._es_contacto = self._contacto < n
+
+        columnas = np.arange(len(self.transiciones))
+        self._estequiometria = np.zeros((n, len(self.transiciones)))
+        self._estequiometria[self._origen, columnas] -= 1
+        self._estequiometria[self._destino, columnas] += 1
+
+    def _tasas(self, parametros, N):
+        """Vector de tasas efectivas (n_transiciones, ...) con 1/N ya aplicado."""
+        faltantes = set(self.parametros) - set(parametros)
+        if faltantes:
+            raise ValueError(f"Faltan parámetros: {', '.join(sorted(faltantes))}")
+        tasas = np.stack(np.broadcast_arrays(
+            *(np.asarray(parametros[tr.tasa], dtype=float) for tr in self.transiciones)
+        ))
+        if self.normalizado:
+            mascara = self._es_contacto.reshape((-1,) + (1,) * (tasas.ndim - 1))
+            tasas = np.where(mascara, tasas / np.asarray(N, dtype=float), tasas)
+        return tasas
+
+    def rhs(self, parametros, N=None):
+        """
+        Lado derecho dy/dt = f(y, t) con la firma que espera `odeint`.
+
+        `y` puede tener forma (n_compartimentos,) o (n_compartimentos, m) para
+        evaluar m escenarios a la vez. Con `y` bidimensional cada parámetro (y
+        N) es un escalar común a todos los escenarios o un array de forma
+        (m,), uno por escenario.
+        """
+        tasas = self._tasas(parametros, N)
+        # Tasas escalares (n_transiciones,) frente a un lote: una columna para todos
+        columna = tasas[:, None] if tasas.ndim == 1 else tasas
+        origen, S = self._origen, self._estequiometria
+        es_contacto, contacto = self._es_contacto, self._contacto[self._es_contacto]
+
+        def f(y, t):
+            flujos = (columna if y.ndim == 2 else tasas) * y[origen]
+            flujos[es_contacto] *= y[contacto]
+            return S @ flujos
+
+        return f
+
+    def jacobian(self, parametros, N=None):
+        """Jacobiano analítico J[i, j] = ∂f_i/∂y_j para un único escenario."""
+        tasas = self._tasas(parametros, N)
+        n, m = len(self.compartimentos), len(self.transiciones)
+        origen, contacto, es_contacto = self._origen, self._contacto, self._es_contacto
+        filas = np.arange(m)
+        S = self._estequiometria
+
+        def J(y, t):
+            extendido = np.append(y, 1.0)
+            derivadas = np.zeros((m, n + 1))
+            derivadas[filas, origen] = tasas * extendido[contacto]
+            derivadas[filas[es_contacto], contacto[es_contacto]] += (tasas * y[origen])[es_contacto]
+            return S @ derivadas[:, :n]
+
+        return J
+
+    def simulate(self, y0, t, parametros, N=None, **kwargs):
+        """
+        Integra el modelo con `odeint`.
+
+        Parámetros:
+        -----------
+        y0 : array_like
+            Estado inicial, forma (n_compartimentos,) o (n_compartimentos, m)
+        t : array_like
+            Instantes de salida
+        parametros : dict
+            Valor de cada tasa (escalar o array para un lote de escenarios)
+        N : float o array_like, opcional
+            Población total; por defecto la suma de `y0`
+        **kwargs
+            Argumentos adicionales para `odeint` (mxstep, rtol, ...)
+
+        Retorna:
+        --------
+        solucion : np.ndarray
+            Forma (len(t), n_compartimentos) o, para un lote,
+            (len(t), n_compartimentos, m)
+        """
+        from scipy.integrate import odeint
+
+        y0 = np.asarray(y0, dtype=float)
+        if N is None:
+            N = y0.sum(axis=0)
+
+        self._tasas(parametros, 1.0)  # valida que estén todos los parámetros
+        lote = np.broadcast_shapes(y0.shape[1:], np.shape(N),
+                                   *(np.shape(parametros[p]) for p in self.parametros))
+        if not lote:
+            return odeint(self.rhs(parametros, N), y0, t,
+                          Dfun=self.jacobian(parametros, N), **kwargs)
+
+        # Lote de escenarios: se aplana el estado (n, m) para odeint
+        n = len(self.compartimentos)
+        extra = (1,) * (len(lote) - (y0.ndim - 1))
+        y0 = np.broadcast_to(y0.reshape((n,) + extra + y0.shape[1:]), (n,) + lote).reshape(n, -1)
+        f = self.rhs({p: np.ravel(np.broadcast_to(parametros[p], lote)) for p in self.parametros},
+                     np.ravel(np.broadcast_to(N, lote)))
+
+        def f_plano(y, t):
+            return f(y.reshape(n, -1), t).ravel()
+
+        solucion = odeint(f_plano, y0.ravel(), t, **kwargs)
+        return solucion.reshape((len(solucion), n) + lote)
+
+
+# --- Modelos del curso ---
+
+# SIR clásico con β normalizado por N (clase 6)
+SIR = CompartmentalModel(
+    ["S", "I", "R"],
+    [Transition("S", "I", "beta", contacto="I"),
+     Transition("I", "R", "gamma")],
+)
+
+# SEIR con periodo de incubación (clase 7)
+SEIR = CompartmentalModel(
+    ["S", "E", "I", "R"],
+    [Transition("S", "E", "beta", contacto="I"),
+     Transition("E", "I", "sigma"),
+     Transition("I", "R", "gamma")],
+)
+
+# SIR de acción de masas con b por pareja de individuos (aplicaciones):
+# epidemia, rumor (I = propagadores, R = racionales) y adopción de
+# políticas (I = influyentes, R = rechazadores) comparten las ecuaciones.
+SIR_MASS_ACTION = CompartmentalModel(
+    ["S", "I", "R"],
+    [Transition("S", "I", "b", contacto="I"),
+     Transition("I", "R", "k")],
+    normalizado=False,
+)
+RUMOR = SIR_MASS_ACTION
+ADOPTION = SIR_MASS_ACTION
@@ -0,0 +1,136 @@
+"""
+Compilador de expresiones de usuario para campos vectoriales.
+
+Las ecuaciones `dx/dt` y `dy/dt` de la clase 5 llegan como texto. En lugar de
+pasarlas a `eval` en cada clic, se analizan una sola vez: el árbol sintáctico
+se valida contra una lista blanca de nodos, variables y funciones, y se
+compila a un objeto de código que se guarda en caché según el texto de la
+expresión. Las evaluaciones posteriores ya no vuelven a analizar nada.
+"""
+import ast
+import functools
+
+import numpy as np
+
+
+# Las mismas funciones y constantes que exponía el diccionario de la clase 5
+FUNCIONES = {
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "exp": np.exp,
+    "sqrt": np.sqrt,
+}
+CONSTANTES = {
+    "pi": np.pi,
+    "e": np.e,
+}
+VARIABLES = ("x", "y")
+
+_NODOS_PERMITIDOS = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Attribute,
+    ast.Constant, ast.Load,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.FloorDiv,
+    ast.UAdd, ast.USub,
+)
+
+
+class ExpressionError(ValueError):
+    """Error de compilación con la posición (columna, desde 1) donde ocurrió."""
+
+    def __init__(self, mensaje, expresion, columna=None):
+        self.mensaje = mensaje
+        self.expresion = expresion
+        self.columna = columna
+        super().__init__(str(self))
+
+    def __str__(self):
+        if self.columna is None:
+            return self.mensaje
+        return f"{self.mensaje} (columna {self.columna}): {self.expresion}"
+
+
+class _Validador(ast.NodeTransformer):
+    """Rechaza nodos fuera de la lista blanca y convierte enteros a float."""
+
+    def __init__(self, expresion, desplazamiento=0):
+        self.expresion = expresion
+        self.desplazamiento = desplazamiento
+
+    def _error(self, mensaje, nodo):
+        columna = getattr(nodo, "col_offset", -1) + 1 + self.desplazamiento
+        raise ExpressionError(mensaje, self.expresion, columna)
+
+    def generic_visit(self, nodo):
+        if not isinstance(nodo, _NODOS_PERMITIDOS):
+            self._error(f"Construcción no permitida: {type(nodo).__name__}", nodo)
+        return super().generic_visit(nodo)
+
+    def visit_Constant(self, nodo):
+        if isinstance(nodo.value, bool) or not isinstance(nodo.value, (int, float)):
+            self._error(f"Constante no permitida: {nodo.value!r}", nodo)
+        # En float, potencias como 9**9**9 desbordan al instante en lugar de colgar el worker
+        return ast.copy_location(ast.Constant(float(nodo.value)), nodo)
+
+    def visit_Name(self, nodo):
+        if nodo.id not in VARIABLES and nodo.id not in FUNCIONES and nodo.id not in CONSTANTES:
+            self._error(f"Nombre desconocido: {nodo.id}", nodo)
+        return nodo
+
+    def visit_Attribute(self, nodo):
+        # Solo np.<función o constante permitida>, por compatibilidad con "np.sin(x)"
+        if not (isinstance(nodo.value, ast.Name) and nodo.value.id == "np"
+                and (nodo.attr in FUNCIONES or nodo.attr in CONSTANTES)):
+            self._error(f"Atributo no permitido: {ast.unparse(nodo)}", nodo)
+        return ast.copy_location(ast.Name(id=nodo.attr, ctx=ast.Load()), nodo)
+
+    def visit_Call(self, nodo):
+        if not (isinstance(nodo.func, (ast.Name, ast.Attribute))):
+            self._error("Solo se pueden llamar funciones permitidas", nodo)
+        nodo = self.generic_visit(nodo)
+        if not (isinstance(nodo.func, ast.Name) and nodo.func.id in FUNCIONES):
+            self._error(f"Función no permitida: {ast.unparse(nodo.func)}", nodo)
+        if nodo.keywords or len(nodo.args) != 1:
+            self._error(f"{nodo.func.id}() recibe exactamente un argumento", nodo)
+        return nodo
+
+
+@functools.lru_cache(maxsize=256)
+def compile_expression(expresion):
+    """
+    Compila una expresión en x, y a una función vectorizada.
+
+    Parámetros:
+    -----------
+    expresion : str
+        Texto como "np.sin(x) - y**2"
+
+    Retorna:
+    --------
+    f : callable
+        f(x, y) -> np.ndarray con la forma de broadcast de x e y
+
+    Lanza ExpressionError (subclase de ValueError) con la columna del error
+    si la expresión no es sintácticamente válida o usa algo no permitido.
+    """
+    if not isinstance(expresion, str) or not expresion.strip():
+        raise ExpressionError("La expresión está vacía", expresion or "")
+    # ast.parse no admite sangría inicial; las columnas se reportan sobre el texto original
+    desplazamiento = len(expresion) - len(expresion.lstrip())
+    try:
+        arbol = ast.parse(expresion.strip(), mode="eval")
+    except SyntaxError as error:
+        columna = None if error.offset is None else error.offset + desplazamiento
+        raise ExpressionError(f"Sintaxis inválida: {error.msg}", expresion, columna) from None
+
+    arbol = ast.fix_missing_locations(_Validador(expresion, desplazamiento).visit(arbol))
+    codigo = compile(arbol, "<expresión>", "eval")
+    globales = {"__builtins__": {}, **FUNCIONES, **CONSTANTES}
+
+    def f(x, y):
+        valor = eval(codigo, globales, {"x": x, "y": y})
+        forma = np.broadcast(x, y).shape
+        return np.broadcast_to(np.asarray(valor, dtype=float), forma)
+
+    f.expresion = expresion
+    return f
@@ -1,6 +1,6 @@
 import numpy as np
 
-def logistic_with_harvest(p0, r, K, tmax, h=5):
+def logistic_with_harvest(p0, r, K, tmax, h=5, puntos=200):
     """
     Modelo logístico con cosecha constante.
     
@@ -16,6 +16,8 @@ def logistic_with_harvest(p0, r, K, tmax, h=5):
         Tiempo máximo
     h : float
         Tasa de cosecha constante
+    puntos : int
+        Número de puntos de la malla temporal
 
     Retorna:
     --------
@@ -25,7 +27,7 @@ def logistic_with_harvest(p0, r, K, tmax, h=5):
         Vector de poblaciones
     """
 
-    t = np.linspace(0, tmax, 200)
+    t = np.linspace(0, tmax, puntos)
     dt = t[1] - t[0]
     P = np.zeros_like(t)
     P[0] = p0
@@ -38,3 +40,284 @@ def logistic_with_harvest(p0, r, K, tmax, h=5):
             P[i] = 0  # evitar valores negativos
 
     return t, P
+
+
+def logistic_with_harvest_batch(p0, r, K, tmax, h=5, puntos=200):
+    """
+    Modelo logístico con cosecha constante para un conjunto de escenarios.
+
+    Integra todas las trayectorias a la vez con el mismo método de Euler que
+    `logistic_with_harvest`: en cada paso de tiempo se avanza el vector
+    completo de escenarios con una sola operación de NumPy.
+
+    Parámetros:
+    -----------
+    p0, r, K, h : float o array_like
+        Población inicial, tasa de crecimiento, capacidad de carga y tasa de
+        cosecha. Deben ser compatibles por *broadcasting*; la forma común
+        define los escenarios.
+    tmax : float
+        Tiempo máximo (común a todos los escenarios)
+    puntos : int
+        Número de puntos de la malla temporal
+
+    Retorna:
+    --------
+    t : np.ndarray
+        Vector de tiempos, forma (puntos,)
+    P : np.ndarray
+        Matriz de poblaciones, forma (puntos, n_escenarios); la columna j es
+        la trayectoria del escenario j (en el orden de `np.ravel` de la forma
+        común de los parámetros)
+    """
+
+    p0, r, K, h = (np.ravel(a).astype(float) for a in np.broadcast_arrays(p0, r, K, h))
+
+    t = np.linspace(0, tmax, puntos)
+    dt = t[1] - t[0]
+    P = np.empty((puntos, p0.size))
+    P[0] = p0
+
+    # Un paso de Euler vectorizado por instante de tiempo
+    for i in range(1, puntos):
+        anterior = P[i-1]
+        dPdt = r * anterior * (1 - anterior/K) - h
+        np.maximum(anterior + dPdt * dt, 0, out=P[i])  # evitar valores negativos
+
+    return t, P
+
+
+# Coeficientes de Dormand–Prince 5(4)
+_DP_C = (0.0, 1/5, 3/10, 4/5, 8/9, 1.0)
+_DP_A = (
+    (),
+    (1/5,),
+    (3/40, 9/40),
+    (44/45, -56/15, 32/9),
+    (19372/6561, -25360/2187, 64448/6561, -212/729),
+    (9017/3168, -355/33, 46732/5247, 49/176, -5103/18656),
+)
+_DP_B = (35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84)
+# Diferencia entre la solución de orden 5 y la embebida de orden 4 (incluye k7)
+_DP_E = (71/57600, 0.0, -71/16695, 71/1920, -17253/339200, 22/525, -1/40)
+
+
+def _dopri_step(f, P, k1, dt):
+    """Un paso de Dormand–Prince; retorna (P_nuevo, k7, error_local)."""
+    k = [k1]
+    for i in range(1, 6):
+        k.append(f(P + dt * sum(a * kj for a, kj in zip(_DP_A[i], k))))
+    P_nuevo = P + dt * sum(b * kj for b, kj in zip(_DP_B, k))
+    k.append(f(P_nuevo))
+    error = dt * sum(e * kj for e, kj in zip(_DP_E, k))
+    return P_nuevo, k[6], abs(error)
+
+
+def logistic_with_harvest_adaptive(p0, r, K, tmax, h=5, rtol=1e-6, atol=1e-9):
+    """
+    Modelo logístico con cosecha constante resuelto con paso adaptativo.
+
+    Usa el par embebido de Runge–Kutta Dormand–Prince 5(4) con control de
+    error local. Si la población llega a cero, se localiza el instante exacto
+    del cruce y la integración termina ahí (en lugar de recortar a cero y
+    seguir integrando ceros como el método de Euler).
+
+    Parámetros:
+    -----------
+    p0, r, K, tmax, h : float
+        Igual que en `logistic_with_harvest`
+    rtol, atol : float
+        Tolerancias relativa y absoluta del error local por paso
+
+    Retorna:
+    --------
+    t : np.ndarray
+        Tiempos de los pasos aceptados (no equiespaciados)
+    P : np.ndarray
+        Poblaciones en esos tiempos
+    info : dict
+        "pasos" (aceptados), "rechazados", "evaluaciones" (de dP/dt),
+        "error_local" (estimación por paso aceptado), "error_estimado"
+        (suma de los errores locales) y "t_extincion" (None si no hay
+        extinción antes de tmax)
+    """
+
+    def f(P):
+        return r * P * (1 - P/K) - h
+
+    t_actual, P_actual = 0.0, float(p0)
+    tiempos, poblaciones, errores = [t_actual], [max(P_actual, 0.0)], []
+    info = {"pasos": 0, "rechazados": 0, "evaluaciones": 0, "t_extincion": None}
+
+    if P_actual < 0 or (P_actual == 0 and h >= 0):
+        # Igual que harvest_extinction_time: desde cero solo hay extinción si hay cosecha;
+        # sin ella la población queda en cero (con h < 0 se repuebla y se integra)
+        if P_actual == 0 and h == 0:
+            tiempos.append(float(tmax))
+            poblaciones.append(0.0)
+        else:
+            info["t_extincion"] = 0.0
+        info["error_local"] = np.array([])
+        info["error_estimado"] = 0.0
+        return np.array(tiempos), np.array(poblaciones), info
+
+    k1 = f(P_actual)
+    info["evaluaciones"] += 1
+    # Paso inicial: cambio relativo de ~1% de la población
+    dt = min(tmax, 0.01 * (abs(P_actual) + atol) / (abs(k1) + 1e-12))
+
+    while t_actual < tmax:
+        dt = min(dt, tmax - t_actual)
+        P_nuevo, k7, error = _dopri_step(f, P_actual, k1, dt)
+        info["evaluaciones"] += 6
+
+        escala = atol + rtol * max(abs(P_actual), abs(P_nuevo))
+        norma = error / escala
+        if norma > 1:
+            info["rechazados"] += 1
+            dt *= max(0.2, 0.9 * norma ** -0.2)
+            continue
+
+        if P_nuevo <= 0:
+            # Evento de extinción: Newton sobre el tiempo, reintegrando desde
+            # el inicio del paso con un único paso de Dormand–Prince.
+            tau = dt * P_actual / (P_actual - P_nuevo)
+            for _ in range(8):
+                P_tau, k_tau, _ = _dopri_step(f, P_actual, k1, tau)
+                info["evaluaciones"] += 6
+                correccion = P_tau / k_tau
+                tau = min(max(tau - correccion, 0.0), dt)
+                if abs(correccion) <= rtol * tau + 1e-15:
+                    break
+            t_actual += tau
+            info["pasos"] += 1
+            info["t_extincion"] = t_actual
+            tiempos.append(t_actual)
+            poblaciones.append(0.0)
+            errores.append(error)
+            break
+
+        t_actual += dt
+        P_actual, k1 = P_nuevo, k7
+        info["pasos"] += 1
+        tiempos.append(t_actual)
+        poblaciones.append(P_actual)
+        errores.append(error)
+        dt *= min(5.0, max(0.2, 0.9 * (norma + 1e-16) ** -0.2))
+
+    info["error_local"] = np.array(errores)
+    info["error_estimado"] = float(np.sum(errores))
+    return np.array(tiempos), np.array(poblaciones), info
+
+
+def _harvest_roots(p0, r, K, h):
+    """Valida parámetros y clasifica el régimen de dP/dt = -(r/K)(P² - K P + hK/r)."""
+    if not (r > 0 and K > 0 and p0 >= 0):
+        raise ValueError("La solución cerrada requiere r > 0, K > 0 y p0 >= 0")
+    discriminante = K**2 / 4 - h * K / r
+    if abs(discriminante) <= 1e-12 * K**2:
+        return "doble", 0.0
+    if discriminante > 0:
+        return "reales", np.sqrt(discriminante)
+    return "complejas", np.sqrt(-discriminante)
+
+
+def harvest_extinction_time(p0, r, K, h=5):
+    """
+    Tiempo exacto en que la población se extingue (P = 0).
+
+    Parámetros:
+    -----------
+    p0, r, K, h : float
+        Igual que en `logistic_with_harvest`
+
+    Retorna:
+    --------
+    t_ext : float o None
+        Instante de extinción, o None si la población nunca llega a cero
+    """
+
+    regimen, s = _harvest_roots(p0, r, K, h)
+    a = r / K
+    if p0 == 0:
+        return 0.0 if h > 0 else None
+
+    if regimen == "reales":
+        P1, P2 = K/2 + s, K/2 - s
+        # Solo hay extinción por debajo del equilibrio inestable P2 > 0
+        if not (0 < P2 and p0 < P2):
+            return None
+        E = P1 * (p0 - P2) / (P2 * (p0 - P1))
+        return -np.log(E) / (a * (P1 - P2))
+    if regimen == "doble":
+        P_doble = K / 2
+        if p0 >= P_doble:
+            return None
+        return p0 / (a * P_doble * (P_doble - p0))
+    # Raíces complejas: la población siempre decrece hasta extinguirse
+    return (np.arctan((p0 - K/2) / s) - np.arctan(-K / (2 * s))) / (a * s)
+
+
+def harvest_solution(p0, r, K, t, h=5):
+    """
+    Solución cerrada (Riccati) de dP/dt = rP(1 - P/K) - h.
+
+    Cubre los tres regímenes del polinomio P² - K P + hK/r: dos raíces
+    reales, raíz doble y raíces complejas. Cada instante se evalúa de forma
+    independiente, sin dependencia secuencial entre puntos. Después de la
+    extinción la población vale cero.
+
+    Parámetros:
+    -----------
+    p0, r, K, h : float
+        Igual que en `logistic_with_harvest`
+    t : float o array_like
+        Instantes (t >= 0) en los que se evalúa la solución
+
+    Retorna:
+    --------
+    P : np.ndarray
+        Poblaciones en los instantes `t`
+
+    Lanza ValueError si los parámetros no admiten la solución cerrada
+    (r <= 0, K <= 0 o p0 < 0).
+    """
+
+    regimen, s = _harvest_roots(p0, r, K, h)
+    t = np.asarray(t, dtype=float)
+    a = r / K
+
+    with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+        if regimen == "reales":
+            P1, P2 = K/2 + s, K/2 - s
+            E = np.exp(-a * (P1 - P2) * t)
+            P = (P1 * (p0 - P2) - P2 * (p0 - P1) * E) / ((p0 - P2) - (p0 - P1) * E)
+        elif regimen == "doble":
+            P_doble = K / 2
+            P = P_doble + (p0 - P_doble) / (1 + a * t * (p0 - P_doble))
+        else:
+            P = K/2 + s * np.tan(np.arctan((p0 - K/2) / s) - a * s * t)
+
+    t_ext = harvest_extinction_time(p0, r, K, h)
+    if t_ext is not None:
+        P = np.where(t >= t_ext, 0.0, P)
+    return P
+
+
+def logistic_with_harvest_analytic(p0, r, K, tmax, h=5, puntos=200):
+    """
+    Modelo logístico con cosecha constante evaluado con la solución cerrada.
+
+    Misma interfaz y malla que `logistic_with_harvest`, pero sin error de
+    discretización. Ver `harvest_solution`.
+
+    Retorna:
+    --------
+    t : np.ndarray
+        Vector de tiempos
+    P : np.ndarray
+        Vector de poblaciones
+    """
+
+    t = np.linspace(0, tmax, puntos)
+    return t, harvest_solution(p0, r, K, t, h=h)
@@ -0,0 +1,167 @@
+"""
+Contagio (SIR o rumor) sobre una red de contactos dispersa.
+
+Los modelos de las clases suponen mezcla perfecta: cualquiera puede
+contagiar a cualquiera. Aquí la población es un grafo guardado como matriz
+de adyacencia `scipy.sparse` (CSR) y cada paso de tiempo cuesta un producto
+matriz dispersa–vector: A @ infectados da, para cada nodo, cuántos vecinos
+infectados tiene. El estado de cada nodo es un entero de 1 byte, así que
+una red de 1M de nodos y 10M de aristas cabe en memoria sin problema.
+
+`scipy.sparse` y `pandas` se importan dentro de las funciones que los usan
+para no alargar el arranque de la aplicación.
+"""
+import numpy as np
+
+
+SUSCEPTIBLE, INFECTADO, RECUPERADO = 0, 1, 2
+
+
+def _adyacencia(origen, destino, n, dirigido=False):
+    """CSR binaria (float32) sin lazos ni aristas repetidas."""
+    import scipy.sparse as sp
+
+    origen = np.asarray(origen, dtype=np.int64)
+    destino = np.asarray(destino, dtype=np.int64)
+    distintos = origen != destino
+    origen, destino = origen[distintos], destino[distintos]
+    if not dirigido:
+        origen, destino = np.concatenate([origen, destino]), np.concatenate([destino, origen])
+    A = sp.csr_matrix((np.ones(len(origen), dtype=np.float32), (origen, destino)), shape=(n, n))
+    A.sum_duplicates()
+    A.data[:] = 1
+    return A
+
+
+def random_graph(n, grado_medio, semilla=None):
+    """
+    Grafo aleatorio de Erdős–Rényi con n nodos y grado medio aproximado.
+
+    Retorna:
+    --------
+    A : scipy.sparse.csr_matrix
+        Adyacencia simétrica (n, n)
+    """
+    rng = np.random.default_rng(semilla)
+    aristas = int(round(n * grado_medio / 2))
+    return _adyacencia(rng.integers(0, n, aristas), rng.integers(0, n, aristas), n)
+
+
+def small_world_graph(n, vecinos, p, semilla=None):
+    """
+    Red de mundo pequeño de Watts–Strogatz.
+
+    Parámetros:
+    -----------
+    n : int
+        Número de nodos
+    vecinos : int
+        Grado del anillo inicial (par): cada nodo se une a vecinos/2 a cada lado
+    p : float
+        Probabilidad de reconectar cada arista a un nodo al azar
+    """
+    rng = np.random.default_rng(semilla)
+    nodos = np.arange(n)
+    origen = np.repeat(nodos, vecinos // 2)
+    destino = (origen + np.tile(np.arange(1, vecinos // 2 + 1), n)) % n
+    reconectar = rng.random(len(destino)) < p
+    destino[reconectar] = rng.integers(0, n, reconectar.sum())
+    return _adyacencia(origen, destino, n)
+
+
+def load_edge_list(ruta, n=None, dirigido=False, separador=None):
+    """
+    Lee una lista de aristas "origen destino" (una por línea, índices desde 0).
+
+    Las líneas que empiezan con # se ignoran. Con `dirigido=False` cada
+    arista se agrega en ambos sentidos.
+    """
+    import pandas as pd
+
+    aristas = pd.read_csv(ruta, sep=separador or r"\s+", comment="#", header=None,
+                          usecols=[0, 1], dtype=np.int64, engine="c")
+    origen, destino = aristas[0].to_numpy(), aristas[1].to_numpy()
+    if n is None:
+        n = int(max(origen.max(), destino.max())) + 1 if len(origen) else 0
+    return _adyacencia(origen, destino, n, dirigido=dirigido)
+
+
+def network_simulate(A, infectados, beta, gamma, pasos, dt=1.0, modo="sir",
+                     recuperados=None, semilla=None):
+    """
+    Simula el contagio en tiempo discreto sobre la red A.
+
+    En cada paso un susceptible con m vecinos infectados se contagia con
+    probabilidad 1 - exp(-β·m·dt). En modo "sir" un infectado se recupera con
+    probabilidad 1 - exp(-γ·dt); en modo "rumor" (Maki–Thompson) un
+    propagador deja de difundir al hablar con quienes ya conocen el rumor:
+    probabilidad 1 - exp(-γ·r·dt), con r sus vecinos infectados o recuperados.
+
+    Parámetros:
+    -----------
+    A : scipy.sparse matrix
+        Adyacencia (n, n); A[i, j] = 1 si j contagia a i
+    infectados : int o array_like
+        Número de infectados iniciales elegidos al azar, o sus índices
+    beta, gamma : float
+        Tasas por arista y de recuperación (u olvido)
+    pasos : int
+        Número de pasos de tiempo
+    dt : float
+        Duración de cada paso
+    modo : str
+        "sir" o "rumor"
+    recuperados : int o array_like, opcional
+        Recuperados (o escépticos) iniciales, igual que `infectados`
+    semilla : int, opcional
+        Semilla del generador aleatorio
+
+    Retorna:
+    --------
+    conteos : np.ndarray
+        Forma (pasos + 1, 3): S, I, R en cada paso
+    """
+    if modo not in ("sir", "rumor"):
+        raise ValueError(f"Modo desconocido: {modo}")
+    import scipy.sparse as sp
+
+    A = sp.csr_matrix(A, dtype=np.float32)
+    n = A.shape[0]
+    rng = np.random.default_rng(semilla)
+
+    estado = np.zeros(n, dtype=np.int8)
+    libres = np.arange(n)
+    for valor, grupo in ((INFECTADO, infectados), (RECUPERADO, recuperados)):
+        if grupo is None:
+            continue
+        if np.ndim(grupo) == 0:
+            grupo = rng.choice(libres, size=int(grupo), replace=False)
+        estado[np.asarray(grupo)] = valor
+        libres = np.flatnonzero(estado == SUSCEPTIBLE)
+
+    conteos = np.zeros((pasos + 1, 3), dtype=np.int64)
+    conteos[0] = np.bincount(estado, minlength=3)
+    p_recuperar = 1 - np.exp(-gamma * dt)
+    for paso in range(1, pasos + 1):
+        infectado = (estado == INFECTADO).astype(np.float32)
+        presion = A @ infectado
+
+        # Solo se sortean los susceptibles con algún vecino infectado
+        expuestos = np.flatnonzero((presion > 0) & (estado == SUSCEPTIBLE))
+        contagio = rng.random(len(expuestos)) < -np.expm1(-beta * dt * presion[expuestos])
+
+        activos = np.flatnonzero(infectado)
+        if modo == "rumor":
+            conocen = (estado != SUSCEPTIBLE).astype(np.float32)
+            r = (A @ conocen)[activos]
+            recupera = rng.random(len(activos)) < -np.expm1(-gamma * dt * r)
+        else:
+            recupera = rng.random(len(activos)) < p_recuperar
+
+        estado[expuestos[contagio]] = INFECTADO
+        estado[activos[recupera]] = RECUPERADO
+        conteos[paso] = np.bincount(estado, minlength=3)
+        if conteos[paso, INFECTADO] == 0:
+            conteos[paso + 1:] = conteos[paso]
+            break
+    return conteos
@@ -0,0 +1,197 @@
+"""
+Particle Life en NumPy, equivalente a `assets/particlesLife.js`.
+
+Misma ley de fuerza (`getForceMagnitude`), mundo cíclico [-1, 1)², caída
+de la velocidad por vida media y matriz de interacción entre clases; el
+estado inicial se genera con el mismo generador congruencial del sketch,
+así que con la misma semilla se parte de la misma configuración.
+
+La búsqueda de vecinos usa una malla uniforme de celdas: las partículas se
+ordenan por celda y, para cada una, los candidatos son las partículas de su
+celda y de las 8 vecinas. Los pares se generan por bloques como arrays
+planos y las fuerzas se acumulan con `np.bincount`, sin bucles de Python
+por partícula.
+"""
+import math
+
+import numpy as np
+
+
+def _lcg(semilla):
+    """Generador `seededRandom` del sketch de p5.js."""
+    m, a, c = 0x80000000, 1103515245, 12345
+    estado = semilla % m
+
+    def siguiente():
+        nonlocal estado
+        estado = (a * estado + c) % m
+        return estado / (m - 1)
+
+    return siguiente
+
+
+def force_magnitude(r, m, distancia_critica=0.3, factor_fuerza=10.0):
+    """
+    Ley de fuerza `getForceMagnitude` vectorizada.
+
+    Parámetros:
+    -----------
+    r : np.ndarray
+        Distancia normalizada por el radio de interacción
+    m : np.ndarray
+        Coeficiente de la matriz de interacción para cada par
+    """
+    repulsion = r / distancia_critica - 1
+    interaccion = m * (1 - np.abs(2 * r - 1 - distancia_critica) / (1 - distancia_critica))
+    fuerza = np.where(r < distancia_critica, repulsion, interaccion) * factor_fuerza
+    return np.where(r < 1.0, fuerza, 0.0)
+
+
+class ParticleLife:
+    """
+    Simulación de Particle Life con búsqueda de vecinos por celdas.
+
+    Parámetros:
+    -----------
+    n : int
+        Número de partículas
+    clases : int
+        Número de clases (tamaño de la matriz de interacción)
+    semilla : int
+        Semilla del generador del sketch (2 reproduce la página de inicio)
+    radio : float
+        Distancia máxima de interacción (`max_distance_interaction`)
+    distancia_critica : float
+        Fracción del radio por debajo de la cual las partículas se repelen
+    factor_fuerza : float
+        Escala de la fuerza
+    vida_media : float
+        Tiempo en que la velocidad se reduce a la mitad sin fuerzas
+    amplificacion_inversa : float
+        Divisor de los coeficientes de la matriz de interacción
+    max_pares : int
+        Pares candidatos por bloque (acota la memoria de cada paso)
+    """
+
+    def __init__(self, n=1000, clases=6, semilla=2, radio=0.15, distancia_critica=0.3,
+                 factor_fuerza=10.0, vida_media=0.05, amplificacion_inversa=2.0,
+                 max_pares=2_000_000):
+        self.radio = radio
+        self.distancia_critica = distancia_critica
+        self.factor_fuerza = factor_fuerza
+        self.vida_media = vida_media
+        self.max_pares = max_pares
+        self.masa = 1.0
+        self.tiempo = 0.0
+        self.pasos = 0
+        self.vecinos_medios = 0.0
+
+        # Mismo orden de sorteos que setup(): primero la matriz, luego (x, y, clase) por partícula
+        rng = _lcg(semilla)
+        self.matriz = np.array([
+            [(math.floor(rng() * 20) / 10.0 - 1.0) / amplificacion_inversa for _ in range(clases)]
+            for _ in range(clases)
+        ])
+        sorteos = np.array([[rng() for _ in range(3)] for _ in range(n)]).reshape(n, 3)
+        self.posicion = (np.floor(sorteos[:, :2] * 200) - 100) / 100.0
+        self.clase = np.floor(sorteos[:, 2] * clases).astype(np.intp)
+        self.velocidad = np.zeros_like(self.posicion)
+
+        # Celdas de lado ≥ radio: todo vecino a distancia < radio está en las 9 celdas
+        self.celdas = max(1, math.floor(2.0 / radio))
+        desplazamientos = {(dx % self.celdas, dy % self.celdas) for dx in (-1, 0, 1) for dy in (-1, 0, 1)}
+        self._desplazamientos = np.array(sorted(desplazamientos))
+
+    def _indices_celda(self, posicion):
+        c = np.floor((posicion + 1.0) / 2.0 * self.celdas).astype(np.intp) % self.celdas
+        return c[:, 0] * self.celdas + c[:, 1]
+
+    def candidate_pairs(self):
+        """
+        Pares candidatos (partículas en las 9 celdas vecinas) del estado
+        actual: el costo de un paso es proporcional a este número.
+        """
+        nc = self.celdas
+        conteo = np.bincount(self._indices_celda(self.posicion), minlength=nc * nc).reshape(nc, nc)
+        vecinos = sum(np.roll(conteo, (dx, dy), axis=(0, 1)) for dx, dy in self._desplazamientos)
+        return int(np.sum(conteo * vecinos))
+
+    def accelerations(self):
+        """Aceleración de cada partícula, forma (n, 2)."""
+        n, nc = len(self.posicion), self.celdas
+        celda = self._indices_celda(self.posicion)
+        orden = np.argsort(celda, kind="stable")
+        x, y = self.posicion[orden, 0], self.posicion[orden, 1]
+        cls, celda = self.clase[orden], celda[orden]
+        conteo = np.bincount(celda, minlength=nc * nc)
+        inicio = np.concatenate([[0], np.cumsum(conteo)[:-1]])
+
+        # Celdas candidatas de cada partícula, forma (n, n_desplazamientos)
+        cx, cy = celda // nc, celda % nc
+        vecinas = (((cx[:, None] + self._desplazamientos[:, 0]) % nc) * nc
+                   + (cy[:, None] + self._desplazamientos[:, 1]) % nc)
+        candidatos = conteo[vecinas].sum(axis=1)
+
+        ax = np.zeros(n)
+        ay = np.zeros(n)
+        pares_en_rango = 0
+        radio2 = self.radio ** 2
+        # Bloques de partículas consecutivas con a lo sumo ~max_pares candidatos
+        acumulado = np.cumsum(candidatos)
+        cortes = np.searchsorted(acumulado, np.arange(self.max_pares, acumulado[-1] if n else 0, self.max_pares))
+        for bloque in np.split(np.arange(n), np.unique(cortes)):
+            if bloque.size == 0:
+                continue
+            celdas_j = vecinas[bloque].ravel()
+            cuantos = conteo[celdas_j]
+            i = np.repeat(np.repeat(bloque, vecinas.shape[1]), cuantos)
+            # arange "irregular": inicio[celda] + 0..conteo-1 para cada celda candidata
+            j = np.repeat(inicio[celdas_j] - (np.cumsum(cuantos) - cuantos), cuantos)
+            j += np.arange(len(j))
+
+            # Diferencia cíclica (|d| < 2, así que basta redondear d/2)
+            dx = x[j] - x[i]
+            dx -= 2.0 * np.rint(dx * 0.5)
+            dy = y[j] - y[i]
+            dy -= 2.0 * np.rint(dy * 0.5)
+            d2 = dx * dx + dy * dy
+            dentro = np.flatnonzero((d2 > 0) & (d2 < radio2))
+            i, j, dx, dy = i[dentro], j[dentro], dx[dentro], dy[dentro]
+            distancia = np.sqrt(d2[dentro])
+            pares_en_rango += len(i)
+
+            fuerza = force_magnitude(distancia / self.radio, self.matriz[cls[i], cls[j]],
+                                     self.distancia_critica, self.factor_fuerza)
+            escala = fuerza * (self.radio / self.masa) / distancia
+            ax += np.bincount(i, weights=dx * escala, minlength=n)
+            ay += np.bincount(i, weights=dy * escala, minlength=n)
+
+        self.vecinos_medios = pares_en_rango / n if n else 0.0
+        aceleracion = np.empty((n, 2))
+        aceleracion[orden, 0] = ax
+        aceleracion[orden, 1] = ay
+        return aceleracion
+
+    def step(self, dt=0.02, pasos=1):
+        """Avanza `pasos` pasos de tamaño dt (igual que `Circle.update`)."""
+        decaimiento = math.exp(-math.log(2.0) * dt / self.vida_media)
+        for _ in range(pasos):
+            aceleracion = self.accelerations()
+            self.velocidad *= decaimiento
+            self.velocidad += aceleracion * dt
+            self.posicion += self.velocidad * dt
+            self.posicion = (self.posicion + 1.0) % 2.0 - 1.0
+            self.tiempo += dt
+            self.pasos += 1
+        return self
+
+    def stats(self):
+        """Indicadores del estado actual."""
+        rapidez = np.hypot(self.velocidad[:, 0], self.velocidad[:, 1])
+        return {
+            "paso": self.pasos,
+            "tiempo": self.tiempo,
+            "velocidad_media": float(rapidez.mean()) if len(rapidez) else 0.0,
+            "energia_cinetica": float(0.5 * self.masa * np.sum(rapidez ** 2)),
+            "vecinos_medios": float(self.vecinos_medios),
+        }
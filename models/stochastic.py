@@ -0,0 +1,163 @@
+"""
+Versión estocástica (conteos enteros) de los modelos compartimentales.
+
+En poblaciones pequeñas la curva determinista engaña: con pocos infectados
+iniciales el brote puede extinguirse por azar antes de despegar. Aquí cada
+transición del modelo es un evento aleatorio y se simulan miles de réplicas
+a la vez: el estado es un array (n_compartimentos, réplicas) y cada
+iteración avanza todas las réplicas activas con operaciones de NumPy.
+
+- "gillespie": algoritmo exacto (SSA); cada réplica salta de evento en
+  evento con su propio reloj.
+- "tau": tau-leaping; en cada paso fijo cada transición ocurre un número
+  Poisson de veces. Mucho más rápido en poblaciones grandes.
+"""
+import math
+
+import numpy as np
+
+
+def _propensidades(modelo, x, tasas):
+    """Tasas de ocurrencia de cada transición, forma (n_transiciones, réplicas)."""
+    a = tasas * x[modelo._origen]
+    a[modelo._es_contacto] *= x[modelo._contacto[modelo._es_contacto]]
+    return a
+
+
+def _gillespie(modelo, x, t, tasas, rng):
+    n_t = len(t)
+    salida = np.empty((n_t, x.shape[0], x.shape[1]), dtype=x.dtype)
+    reloj = np.full(x.shape[1], float(t[0]))
+    siguiente = np.zeros(x.shape[1], dtype=int)
+    cambios = modelo._estequiometria.astype(x.dtype)
+    activas = np.arange(x.shape[1])
+
+    while activas.size:
+        a = _propensidades(modelo, x[:, activas], tasas[:, activas])
+        a0 = a.sum(axis=0)
+        vivas = a0 > 0
+        espera = np.full(activas.size, np.inf)
+        espera[vivas] = rng.exponential(size=vivas.sum()) / a0[vivas]
+        nuevo_reloj = reloj[activas] + espera
+
+        # El estado actual vale para todos los instantes de salida anteriores al salto
+        while True:
+            puntero = siguiente[activas]
+            pendiente = puntero < n_t
+            pendiente[pendiente] = t[puntero[pendiente]] < nuevo_reloj[pendiente]
+            if not pendiente.any():
+                break
+            cuales = activas[pendiente]
+            salida[puntero[pendiente], :, cuales] = x[:, cuales].T
+            siguiente[cuales] += 1
+
+        # Evento: transición j con probabilidad a_j / a0
+        saltan = vivas & (siguiente[activas] < n_t)
+        cuales = activas[saltan]
+        u = rng.random(cuales.size) * a0[saltan]
+        j = np.minimum((np.cumsum(a[:, saltan], axis=0) < u).sum(axis=0), len(cambios.T) - 1)
+        x[:, cuales] += cambios[:, j]
+        reloj[cuales] = nuevo_reloj[saltan]
+        activas = activas[siguiente[activas] < n_t]
+    return salida
+
+
+def _tau_leaping(modelo, x, t, tasas, rng, tau):
+    salida = np.empty((len(t), x.shape[0], x.shape[1]), dtype=x.dtype)
+    salida[0] = x
+    cambios = modelo._estequiometria.astype(x.dtype)
+    for i in range(1, len(t)):
+        pasos = max(1, math.ceil((t[i] - t[i - 1]) / tau))
+        h = (t[i] - t[i - 1]) / pasos
+        for _ in range(pasos):
+            disparos = rng.poisson(_propensidades(modelo, x, tasas) * h)
+            # En orden, sin vaciar un compartimento por debajo de cero
+            for j, origen in enumerate(modelo._origen):
+                k = np.minimum(disparos[j], x[origen])
+                x += cambios[:, j, None] * k
+        salida[i] = x
+    return salida
+
+
+def stochastic_simulate(modelo, y0, t, parametros, replicas=1000, metodo="gillespie",
+                        tau=None, N=None, semilla=None):
+    """
+    Simula réplicas estocásticas de un modelo compartimental.
+
+    Parámetros:
+    -----------
+    modelo : CompartmentalModel
+        Modelo cuyas transiciones se tratan como eventos aleatorios
+    y0 : array_like
+        Conteos iniciales por compartimento (enteros)
+    t : array_like
+        Instantes de salida, crecientes
+    parametros : dict
+        Tasas del modelo (escalares o arrays de longitud `replicas`)
+    replicas : int
+        Número de simulaciones independientes
+    metodo : str
+        "gillespie" (exacto) o "tau" (tau-leaping)
+    tau : float, opcional
+        Paso del tau-leaping; por defecto 1/10 del espaciado de `t`
+    N : float, opcional
+        Población para los flujos normalizados; por defecto la suma de `y0`
+    semilla : int, opcional
+        Semilla del generador aleatorio (resultados reproducibles)
+
+    Retorna:
+    --------
+    trayectorias : np.ndarray
+        Conteos de forma (len(t), n_compartimentos, replicas)
+    """
+    t = np.asarray(t, dtype=float)
+    y0 = np.asarray(y0)
+    if not np.issubdtype(y0.dtype, np.integer) and not np.all(np.equal(np.round(y0), y0)):
+        raise ValueError("El estado inicial debe ser de conteos enteros")
+    if metodo not in ("gillespie", "tau"):
+        raise ValueError(f"Método desconocido: {metodo}")
+
+    rng = np.random.default_rng(semilla)
+    x = np.repeat(y0.astype(np.int64).reshape(-1, 1), replicas, axis=1)
+    tasas = modelo._tasas(parametros, y0.sum() if N is None else N)
+    tasas = np.broadcast_to(tasas.reshape(len(tasas), -1), (len(tasas), replicas))
+
+    if metodo == "gillespie":
+        return _gillespie(modelo, x, t, tasas, rng)
+    if tau is None:
+        tau = np.min(np.diff(t)) / 10 if len(t) > 1 else 1.0
+    return _tau_leaping(modelo, x, t, tasas, rng, tau)
+
+
+def replicate_summary(trayectorias, percentiles=(5, 25, 50, 75, 95), umbral=0.1, susceptibles=0):
+    """
+    Resume un lote de réplicas en bandas y probabilidad de brote.
+
+    Parámetros:
+    -----------
+    trayectorias : np.ndarray
+        Salida de `stochastic_simulate`, forma (len(t), n_compartimentos, réplicas)
+    percentiles : tuple
+        Percentiles de las bandas
+    umbral : float
+        Fracción de los susceptibles iniciales que deben contagiarse para
+        contar la réplica como brote mayor
+    susceptibles : int
+        Índice del compartimento de susceptibles
+
+    Retorna:
+    --------
+    resumen : dict
+        "bandas" (len(percentiles), len(t), n_compartimentos), "media"
+        (len(t), n_compartimentos), "tamano_final" por réplica,
+        "prob_brote" y "percentiles"
+    """
+    S = trayectorias[:, susceptibles, :]
+    tamano_final = S[0] - S[-1]
+    return {
+        "percentiles": np.asarray(percentiles),
+        "bandas": np.percentile(trayectorias, percentiles, axis=2),
+        "media": trayectorias.mean(axis=2),
+        "tamano_final": tamano_final,
+        "prob_brote": float(np.mean(tamano_final >= umbral * S[0])),
+    }
@@ -0,0 +1,203 @@
+"""
+Barridos de parámetros resueltos como un solo ensamble vectorizado.
+
+En lugar de llamar a `odeint` una vez por punto de la malla, todos los
+escenarios avanzan juntos con RK4 de paso fijo: el estado es un array
+(n_compartimentos, n_escenarios) y cada evaluación del lado derecho es una
+sola operación de NumPy sobre la malla completa. Durante la integración solo
+se guardan los resúmenes (pico, día del pico y estado final), no las
+trayectorias, así que la memoria no crece con el horizonte de tiempo.
+"""
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from models.compartmental import SIR
+
+
+def ensemble_summary(modelo, y0, parametros, tiempo_max, N=None, compartimento="I",
+                     dt=None, hilos=1, max_operaciones=None):
+    """
+    Integra un lote de escenarios y retorna sus indicadores principales.
+
+    Parámetros:
+    -----------
+    modelo : CompartmentalModel
+        Modelo a integrar
+    y0 : array_like
+        Estado inicial, forma (n_compartimentos, ...) con las dimensiones del lote
+    parametros : dict
+        Tasas del modelo (escalares o arrays que se combinan por broadcasting)
+    tiempo_max : float
+        Horizonte de integración
+    N : float o array_like, opcional
+        Población total; por defecto la suma de `y0`
+    compartimento : str
+        Compartimento cuyo pico se registra
+    dt : float, opcional
+        Paso de RK4; por defecto 0.1 o menos si las tasas son grandes
+    hilos : int
+        Bloques del lote que se integran en paralelo (NumPy libera el GIL
+        en las operaciones sobre arrays grandes)
+    max_operaciones : int, opcional
+        Límite de pasos × escenarios; si la integración lo supera se lanza
+        ValueError antes de empezar
+
+    Retorna:
+    --------
+    resumen : dict
+        "pico" y "dia_pico" con la forma del lote, y "final" con forma
+        (n_compartimentos, ...)
+    """
+    y0 = np.asarray(y0, dtype=float)
+    n = len(modelo.compartimentos)
+    if N is None:
+        N = y0.sum(axis=0)
+    lote = np.broadcast_shapes(y0.shape[1:], np.shape(N),
+                               *(np.shape(parametros[p]) for p in modelo.parametros))
+
+    extra = (1,) * (len(lote) - (y0.ndim - 1))
+    estado = np.broadcast_to(y0.reshape((n,) + extra + y0.shape[1:]), (n,) + lote).reshape(n, -1)
+    tasas = {p: np.ravel(np.broadcast_to(parametros[p], lote)) for p in modelo.parametros}
+    poblacion = np.ravel(np.broadcast_to(N, lote))
+
+    if dt is None:
+        # |λ| ≤ suma de tasas por individuo; RK4 es estable y preciso con |λ|·dt ≤ 0.5
+        mayor = sum(np.max(np.abs(v)) for v in tasas.values())
+        if not modelo.normalizado:
+            mayor *= max(1.0, np.max(poblacion))
+        dt = min(0.1, 0.5 / mayor) if mayor > 0 else 0.1
+    pasos = max(1, math.ceil(tiempo_max / dt))
+    dt = tiempo_max / pasos
+    if max_operaciones is not None and pasos * estado.shape[1] > max_operaciones:
+        raise ValueError(
+            f"El barrido requiere {pasos} pasos para {estado.shape[1]} escenarios (máximo "
+            f"{max_operaciones:.2g} en total): reduzca el tiempo, las tasas o la resolución")
+    k = modelo.compartimentos.index(compartimento)
+
+    def integrar(bloque):
+        f = modelo.rhs({p: v[bloque] for p, v in tasas.items()}, poblacion[bloque])
+        y = estado[:, bloque].copy()
+        pico = y[k].copy()
+        dia = np.zeros_like(pico)
+        for paso in range(1, pasos + 1):
+            k1 = f(y, None)
+            k2 = f(y + 0.5 * dt * k1, None)
+            k3 = f(y + 0.5 * dt * k2, None)
+            k4 = f(y + dt * k3, None)
+            # y += dt/6 (k1 + 2 k2 + 2 k3 + k4), reutilizando k2 como acumulador
+            k2 += k3
+            k2 *= 2
+            k2 += k1
+            k2 += k4
+            k2 *= dt / 6
+            y += k2
+            np.copyto(dia, paso * dt, where=y[k] > pico)
+            np.maximum(pico, y[k], out=pico)
+        return y, pico, dia
+
+    total = estado.shape[1]
+    tamano = max(1, math.ceil(total / max(1, hilos)))
+    bloques = [slice(i, i + tamano) for i in range(0, total, tamano)] or [slice(0, 0)]
+    if len(bloques) == 1:
+        partes = [integrar(bloques[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=len(bloques)) as pool:
+            partes = list(pool.map(integrar, bloques))
+
+    final = np.concatenate([p[0] for p in partes], axis=1)
+    return {
+        "pico": np.concatenate([p[1] for p in partes]).reshape(lote),
+        "dia_pico": np.concatenate([p[2] for p in partes]).reshape(lote),
+        "final": final.reshape((n,) + lote),
+    }
+
+
+# Parámetros del SIR de la clase 6 que se pueden barrer junto con β
+EJES_SIR = ("gamma", "I0", "N")
+
+
+def sir_sweep(betas, valores, eje="gamma", N=1000, I0=1, gamma=0.1, tiempo_max=160, hilos=None,
+              max_operaciones=None):
+    """
+    Barrido del SIR de la clase 6 sobre una malla (β, eje).
+
+    Parámetros:
+    -----------
+    betas : array_like
+        Valores de la tasa de transmisión (columnas de la malla)
+    valores : array_like
+        Valores del segundo parámetro (filas de la malla)
+    eje : str
+        Segundo parámetro: "gamma", "I0" o "N"
+    N, I0, gamma : float
+        Valores fijos de los parámetros que no se barren
+    tiempo_max : float
+        Horizonte de simulación en días
+    hilos : int, opcional
+        Bloques en paralelo; por defecto uno por CPU
+    max_operaciones : int, opcional
+        Límite de pasos × escenarios (ver `ensemble_summary`)
+
+    Retorna:
+    --------
+    resultado : dict
+        "beta", "valores" y, con forma (len(valores), len(betas)), el pico de
+        infectados "pico", su día "dia_pico" y la tasa de ataque final
+        "ataque" (fracción que dejó de ser susceptible)
+    """
+    if eje not in EJES_SIR:
+        raise ValueError(f"Eje desconocido: {eje} (use {', '.join(EJES_SIR)})")
+    betas = np.asarray(betas, dtype=float)
+    valores = np.asarray(valores, dtype=float)
+    fijos = {"gamma": gamma, "I0": I0, "N": N}
+    fijos[eje] = valores[:, None]
+    N, I0 = np.asarray(fijos["N"], dtype=float), np.asarray(fijos["I0"], dtype=float)
+
+    if np.any(N <= 0) or np.any(I0 < 0) or np.any(I0 > N):
+        raise ValueError("Se requiere N > 0 y 0 ≤ I0 ≤ N")
+
+    y0 = np.stack(np.broadcast_arrays(N - I0, I0, np.zeros_like(N)))
+    resumen = ensemble_summary(
+        SIR, y0, {"beta": betas[None, :], "gamma": fijos["gamma"]}, tiempo_max, N=N,
+        hilos=hilos or min(8, os.cpu_count() or 1), max_operaciones=max_operaciones,
+    )
+    S_final = resumen["final"][0]
+    return {
+        "beta": betas,
+        "valores": valores,
+        "pico": resumen["pico"],
+        "dia_pico": resumen["dia_pico"],
+        "ataque": 1 - S_final / N,
+    }
+
+
+# Límite de puntos por eje (la malla completa tiene MAX_RESOLUCION² escenarios)
+MAX_RESOLUCION = 300
+MAX_TIEMPO = 1000
+# Pasos de RK4 × escenarios: ~10 s en una CPU. Cubre la resolución máxima con las
+# tasas por defecto; el paso se acorta con β + γ, así que también acota las tasas
+MAX_OPERACIONES = 150_000_000
+
+
+def sir_sweep_grid(beta_min, beta_max, eje, eje_min, eje_max, resolucion,
+                   N=1000, I0=1, gamma=0.1, tiempo_max=160):
+    """
+    `sir_sweep` sobre una malla uniforme de `resolucion` × `resolucion` puntos.
+
+    Recibe solo escalares, de modo que la página y la API generan la misma
+    clave de caché para el mismo barrido. La resolución, el horizonte y el
+    trabajo total están acotados (MAX_RESOLUCION, MAX_TIEMPO y
+    MAX_OPERACIONES): la API lo calcula en el hilo de la petición.
+    """
+    resolucion = int(resolucion)
+    if not 2 <= resolucion <= MAX_RESOLUCION:
+        raise ValueError(f"La resolución debe estar entre 2 y {MAX_RESOLUCION}")
+    if not 0 < float(tiempo_max) <= MAX_TIEMPO:
+        raise ValueError(f"El tiempo de simulación debe estar entre 0 y {MAX_TIEMPO}")
+    betas = np.linspace(float(beta_min), float(beta_max), resolucion)
+    valores = np.linspace(float(eje_min), float(eje_max), resolucion)
+    return sir_sweep(betas, valores, eje, N=N, I0=I0, gamma=gamma, tiempo_max=tiempo_max,
+                     max_operaciones=MAX_OPERACIONES)
@@ -1,12 +1,27 @@
 import dash
-from dash import html, dcc, callback, Input, Output, State
+from dash import html, dcc, callback, Input, Output, State, ctx
 import numpy as np
-import plotly.graph_objects as go
-from scipy.integrate import odeint 
+from models.compartmental import SIR_MASS_ACTION, RUMOR, ADOPTION
+from models.network import network_simulate, small_world_graph
+from models.stochastic import stochastic_simulate, replicate_summary
+from utils.cache import cached_simulation
+from utils.downsample import decimate
+from utils.figures import THEMES, encode_array, figure_dict, line_trace
+from utils.jobs import default_runner, follow_job, job_components
+from utils import warmup
 
 
 dash.register_page(__name__, path="/aplicaciones", name="Aplicaciones")
 
+warmup.register_import("scipy.integrate", "scipy.sparse")
+
+MAX_REPLICAS = 5000
+MAX_VALORES_K = 8
+MAX_GRADO = 50
+RUMOR_Y0 = [266, 1, 8]
+ADOPCION_Y0 = [10000, 50, 0]
+ESTILOS_K = ["solid", "dash", "dot", "dashdot", "longdash", "longdashdot"]
+
 
 # --- 2. Definición del Layout ---
 layout = html.Div(className='content-container', children=[
@@ -83,6 +98,7 @@ layout = html.Div(className='content-container', children=[
         ]),
         
         html.Button("Generar campo", id = "btn-generar-2"),
+        job_components("sir-2"),
         
         #Ejemplos
         # html.Div([
@@ -117,7 +133,64 @@ layout = html.Div(className='content-container', children=[
                         * Se analizan dos tasas de "racionalidad" $k$: $0.01$ y $0.02$.
                     """, mathjax=True),
 
-                    html.Img(src=dash.get_asset_url('grafica-rumor.png')),
+                    html.Div([
+                        html.Div([
+                            html.Div([
+                                html.Label("b = "),
+                                dcc.Input(id="rumor-det-b", type="number", value=0.004, step=0.001, className="input-field")
+                            ]),
+                            html.Div([
+                                html.Label("Valores de k (separados por comas): "),
+                                dcc.Input(id="rumor-det-k", type="text", value="0.01, 0.02", className="input-field")
+                            ]),
+                            html.Div([
+                                html.Label("Tiempo de simulación: "),
+                                dcc.Input(id="rumor-det-tiempo", type="number", value=15, className="input-field")
+                            ]),
+                            html.Button("Comparar valores de k", id="btn-rumor-det"),
+                            job_components("rumor-det"),
+                        ], className="contain-left"),
+                        html.Div([
+                            dcc.Graph(id="grafica-rumor", style={"height":"450px","width":"100%"}),
+                        ], className="contain-right"),
+                    ], className="page-container"),
+
+                    html.H4("Simulación estocástica"),
+                    dcc.Markdown(r"""
+                        Con un solo propagador inicial el rumor puede apagarse por azar antes de
+                        despegar, algo que la curva determinista no muestra. Cada réplica simula
+                        los contagios y olvidos como eventos aleatorios; la banda muestra la
+                        dispersión de $I(t)$ entre réplicas.
+                    """, mathjax=True),
+                    html.Div([
+                        html.Div([
+                            html.Div([
+                                html.Label("b = "),
+                                dcc.Input(id="rumor-b", type="number", value=0.004, step=0.001, className="input-field")
+                            ]),
+                            html.Div([
+                                html.Label("k = "),
+                                dcc.Input(id="rumor-k", type="number", value=0.01, step=0.01, className="input-field")
+                            ]),
+                            html.Div([
+                                html.Label("Réplicas: "),
+                                dcc.Input(id="rumor-replicas", type="number", value=1000, min=10, max=MAX_REPLICAS, className="input-field")
+                            ]),
+                            html.Div([
+                                html.Label("Tiempo de simulación: "),
+                                dcc.Input(id="rumor-tiempo", type="number", value=100, className="input-field")
+                            ]),
+                            dcc.RadioItems(id="rumor-metodo", value="gillespie", options=[
+                                {"label": "Gillespie (exacto)", "value": "gillespie"},
+                                {"label": "Tau-leaping", "value": "tau"},
+                            ]),
+                            html.Button("Simular réplicas", id="btn-rumor"),
+                            job_components("rumor"),
+                        ], className="contain-left"),
+                        html.Div([
+                            dcc.Graph(id="grafica-rumor-estocastico", style={"height":"450px","width":"100%"}),
+                        ], className="contain-right"),
+                    ], className="page-container"),
 
                     dcc.Markdown(r"""
                         **Conclusión Clave:** El modelo muestra cómo el factor social $k$ (escepticismo,
@@ -144,7 +217,53 @@ layout = html.Div(className='content-container', children=[
                         * $k = 0.00002$ (Tasa de rechazo)
                     """, mathjax=True),
 
-                    html.Img(src=dash.get_asset_url('simulacion_a3.png')),
+                    html.Div([
+                        html.Div([
+                            html.Div([
+                                html.Label("b = "),
+                                dcc.Input(id="adopcion-b", type="number", value=0.00005, step=0.00001, className="input-field")
+                            ]),
+                            html.Div([
+                                html.Label("k = "),
+                                dcc.Input(id="adopcion-k", type="number", value=0.00002, step=0.00001, className="input-field")
+                            ]),
+                            html.Div([
+                                html.Label("Tiempo de simulación: "),
+                                dcc.Input(id="adopcion-tiempo", type="number", value=100, className="input-field")
+                            ]),
+                            html.Button("Simular adopción", id="btn-adopcion"),
+                            job_components("adopcion"),
+                        ], className="contain-left"),
+                        html.Div([
+                            dcc.Graph(id="grafica-adopcion", style={"height":"450px","width":"100%"}),
+                        ], className="contain-right"),
+                    ], className="page-container"),
+
+                    html.H4("Adopción en una red de contactos"),
+                    dcc.Markdown(r"""
+                        El modelo supone que cada ciudadano puede influir en cualquier otro. En una
+                        red de mundo pequeño cada uno solo habla con sus vecinos (y unos pocos
+                        contactos lejanos); la tasa por contacto se ajusta a $b N / \langle k \rangle$
+                        para que la presión inicial sea la misma que en mezcla perfecta. Se usan los
+                        valores de $b$ y $k$ de la simulación anterior.
+                    """, mathjax=True),
+                    html.Div([
+                        html.Div([
+                            html.Div([
+                                html.Label("Contactos por persona ⟨k⟩ = "),
+                                dcc.Input(id="red-grado", type="number", value=10, min=2, max=MAX_GRADO, step=2, className="input-field")
+                            ]),
+                            html.Div([
+                                html.Label("Probabilidad de contacto lejano p = "),
+                                dcc.Input(id="red-p", type="number", value=0.1, min=0, max=1, step=0.05, className="input-field")
+                            ]),
+                            html.Button("Simular en red", id="btn-red"),
+                            job_components("red"),
+                        ], className="contain-left"),
+                        html.Div([
+                            dcc.Graph(id="grafica-red", style={"height":"450px","width":"100%"}),
+                        ], className="contain-right"),
+                    ], className="page-container"),
 
                     dcc.Markdown(r"""
                         **Conclusión Clave:** El modelo puede simular procesos sociales lentos.
@@ -160,21 +279,26 @@ layout = html.Div(className='content-container', children=[
 ]) # Fin de 'content-container'
 
 
-def modelo_sir(y, t, b, g, N):
-    S,I,R = y 
+@cached_simulation
+@default_runner.task
+def resolver_sir(n, beta, gamma, I0, tiempo_max):
+    t = np.linspace(0, tiempo_max, 500)
+    return SIR_MASS_ACTION.simulate([n - I0, I0, 0], t, {"b": beta, "k": gamma}, N=n, mxstep=5000)
 
-    dS_dt = -b*S*I
-    dI_dt = b*S*I-g*I
-    dR_dt = g*I
 
-    return [dS_dt, dI_dt, dR_dt]
+# Los valores por defecto del layout se precalculan al arrancar (utils.warmup)
+warmup.register(resolver_sir, 7138, round(1/7138,5), 0.4, 1, 40)
 
 
 @callback(
-    Output("grafica-sir-2", "figure")
+    Output("grafica-sir-2", "figure"),
      #Output("info-campo", "children")
-     ,
+    Output("trabajo-sir-2", "data"),
+    Output("sondeo-sir-2", "disabled"),
+    Output("estado-sir-2", "children"),
      Input("btn-generar-2", "n_clicks"),
+     Input("sondeo-sir-2", "n_intervals"),
+     State("trabajo-sir-2", "data"),
      State("input-n-2", "value"),
      State("input-b-2", "value"),
      State("input-g-2", "value"),
@@ -182,66 +306,298 @@ def modelo_sir(y, t, b, g, N):
      State("input-tiempo-2", "value"),
     prevent_initial_call=False
     )
-def simular_sir(n_clicks, n, beta, gamma, I0, tiempo_max):
+def simular_sir(n_clicks, n_intervals, trabajo, n, beta, gamma, I0, tiempo_max):
+    if None in (n, beta, gamma, I0, tiempo_max):
+        return figure_dict([], tema="sir"), None, True, "Complete todos los campos"
+    # La integración corre en un proceso aparte; el Interval consulta su estado
+    return follow_job(
+        ctx.triggered_id == "sondeo-sir-2", trabajo,
+        resolver_sir, (n, beta, gamma, I0, tiempo_max),
+        lambda solucion: figura_sir(solucion, n, I0, tiempo_max),
+    )
+
+
+def figura_sir(solucion, n, I0, tiempo_max):
     S0 = n-I0 
     R0_inicial = 0
-    y0 = [S0, I0, R0_inicial]
     t = np.linspace(0, tiempo_max, 500)
-    try:
-        solucion = odeint(modelo_sir, y0, t, args=(beta, gamma, n), full_output=False, mxstep=5000)
+    if solucion is not None:
         S, I, R = solucion.T
-    except Exception as e:
+    else:
         S = np.full_like(t, S0)
         I = np.full_like(t, I0)
         R = np.full_like(t, R0_inicial)
+    # Como mucho MAX_PUNTOS por curva, sin importar la resolución del integrador
+    (tS, S), (tI, I), (tR, R) = (decimate(t, serie) for serie in (S, I, R))
     
-    fig = go.Figure()
-
-    fig.add_trace(go.Scatter(
-        x=t, y=S,
-        mode = 'lines',
-        name = 'Suceptibles (S)',
-        line = dict(color='blue', width=2),
-        hovertemplate = "Día: %{x:.0f} <br> Suceptibles :%{y:.0f}<extra></extra>"
-    ))
-    fig.add_trace(go.Scatter(
-        x=t, y=I,
-        mode = 'lines',
-        name='Infectados(I)',
-        line = dict(color='red', width=2),
-        hovertemplate = "Día: %{x:.0f} <br> Infectados :%{y:.0f}<extra></extra>"
-    ))
-    fig.add_trace(go.Scatter(
-        x=t, y=R,
-        mode = 'lines',
-        name='Recuperados (R)',
-        line = dict(color='green', width=2),
-        hovertemplate = "Día: %{x:.0f} <br> Recuperados :%{y:.0f}<extra></extra>"
-    ))
-
-    fig.update_layout(
-        title=dict(
-            text = f"<b>Evolucion del modelo SIR</b>",
-            x=0.5, font=dict(size=16, color='darkblue')
-        ),
-        xaxis_title = "Tiempo (días)",
-        yaxis_title="Número de personas",
-        paper_bgcolor="lightcyan",
-        plot_bgcolor="white",
-        legend=dict(
-            orientation='h', yanchor='bottom',y=1.02,
-            xanchor='right', x=.5
-        )
+    return figure_dict(
+        [line_trace(tS, S, 'Suceptibles (S)', 'blue',
+                    hovertemplate="Día: %{x:.0f} <br> Suceptibles :%{y:.0f}<extra></extra>"),
+         line_trace(tI, I, 'Infectados(I)', 'red',
+                    hovertemplate="Día: %{x:.0f} <br> Infectados :%{y:.0f}<extra></extra>"),
+         line_trace(tR, R, 'Recuperados (R)', 'green',
+                    hovertemplate="Día: %{x:.0f} <br> Recuperados :%{y:.0f}<extra></extra>")],
+        tema="sir",
+        titulo="Evolucion del modelo SIR",
+        x_titulo="Tiempo (días)",
+        y_titulo="Número de personas",
+        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=.5),
+    )
+
+
+# --- Rumor (caso 2: N = 275, S0 = 266, I0 = 1, R0 = 8) ---
+def _leer_valores(texto):
+    """'0.01, 0.02' -> (0.01, 0.02); ValueError si no es una lista de números."""
+    valores = tuple(float(v) for v in str(texto).replace(";", ",").split(",") if v.strip())
+    if not valores:
+        raise ValueError("Ingrese al menos un valor")
+    return valores
+
+
+@cached_simulation
+@default_runner.task
+def resolver_rumor(b, ks, tiempo_max):
+    # Todos los k en una sola integración: el lote va en la última dimensión
+    t = np.linspace(0, tiempo_max, 300)
+    return RUMOR.simulate(RUMOR_Y0, t, {"b": b, "k": np.asarray(ks, dtype=float)})
+
+
+warmup.register(resolver_rumor, 0.004, (0.01, 0.02), 15)
+
+
+@callback(
+    Output("grafica-rumor", "figure"),
+    Output("trabajo-rumor-det", "data"),
+    Output("sondeo-rumor-det", "disabled"),
+    Output("estado-rumor-det", "children"),
+    Input("btn-rumor-det", "n_clicks"),
+    Input("sondeo-rumor-det", "n_intervals"),
+    State("trabajo-rumor-det", "data"),
+    State("rumor-det-b", "value"),
+    State("rumor-det-k", "value"),
+    State("rumor-det-tiempo", "value"),
+    prevent_initial_call=False
+)
+def simular_rumor(n_clicks, n_intervals, trabajo, b, texto_k, tiempo_max):
+    if None in (b, texto_k, tiempo_max):
+        return figure_dict([], tema="casos"), None, True, "Complete todos los campos"
+    try:
+        ks = _leer_valores(texto_k)
+    except ValueError:
+        return figure_dict([], tema="casos"), None, True, "Los valores de k deben ser números separados por comas"
+    if len(ks) > MAX_VALORES_K:
+        return figure_dict([], tema="casos"), None, True, f"Máximo {MAX_VALORES_K} valores de k"
+    return follow_job(
+        ctx.triggered_id == "sondeo-rumor-det", trabajo,
+        resolver_rumor, (b, ks, tiempo_max),
+        lambda solucion: figura_rumor(solucion, ks, tiempo_max),
+    )
+
+
+def figura_rumor(solucion, ks, tiempo_max):
+    trazas = []
+    if solucion is not None:
+        t = np.linspace(0, tiempo_max, 300)
+        for j, k in enumerate(ks):
+            estilo = ESTILOS_K[j % len(ESTILOS_K)]
+            for i, (nombre, color) in enumerate((("Susceptibles", "blue"), ("Propagadores", "red"),
+                                                 ("Racionales", "green"))):
+                x, y = decimate(t, solucion[:, i, j])
+                trazas.append(line_trace(
+                    x, y, f'{nombre} (k={k:g})', color,
+                    line=dict(dash=estilo),
+                    hovertemplate=f"Día: %{{x:.1f}} <br> {nombre} :%{{y:.0f}}<extra>k={k:g}</extra>"
+                ))
+    return figure_dict(trazas, tema="casos", titulo="Propagación de un rumor",
+                       x_titulo="Tiempo (días)", y_titulo="Número de personas")
+
+
+# --- Rumor estocástico ---
+@cached_simulation
+@default_runner.task
+def resolver_rumor_estocastico(b, k, replicas, tiempo_max, metodo):
+    t = np.linspace(0, tiempo_max, 201)
+    y0 = RUMOR_Y0
+    replicas = int(min(max(replicas, 1), MAX_REPLICAS))
+    # Semilla fija: los mismos parámetros producen (y cachean) las mismas réplicas
+    trayectorias = stochastic_simulate(RUMOR, y0, t, {"b": b, "k": k},
+                                       replicas=replicas, metodo=metodo, semilla=0)
+    resumen = replicate_summary(trayectorias)
+    resumen["t"] = t
+    resumen["determinista"] = RUMOR.simulate(y0, t, {"b": b, "k": k})
+    return resumen
+
+
+warmup.register(resolver_rumor_estocastico, 0.004, 0.01, 1000, 100, "gillespie")
+
+
+@callback(
+    Output("grafica-rumor-estocastico", "figure"),
+    Output("trabajo-rumor", "data"),
+    Output("sondeo-rumor", "disabled"),
+    Output("estado-rumor", "children"),
+    Input("btn-rumor", "n_clicks"),
+    Input("sondeo-rumor", "n_intervals"),
+    State("trabajo-rumor", "data"),
+    State("rumor-b", "value"),
+    State("rumor-k", "value"),
+    State("rumor-replicas", "value"),
+    State("rumor-tiempo", "value"),
+    State("rumor-metodo", "value"),
+    prevent_initial_call=False
+)
+def simular_rumor_estocastico(n_clicks, n_intervals, trabajo, b, k, replicas, tiempo_max, metodo):
+    if None in (b, k, replicas, tiempo_max):
+        return figure_dict([], tema="marco"), None, True, "Complete todos los campos"
+    return follow_job(
+        ctx.triggered_id == "sondeo-rumor", trabajo,
+        resolver_rumor_estocastico, (b, k, replicas, tiempo_max, metodo),
+        figura_rumor_estocastico,
+    )
+
+
+def figura_rumor_estocastico(resumen):
+    # Dos paneles (trayectorias e histograma) con los dominios de make_subplots(column_widths=[0.7, 0.3])
+    ejes = THEMES["marco"]["ejes"]
+    paneles = dict(
+        xaxis=dict(anchor="y", domain=[0.0, 0.63]),
+        yaxis=dict(anchor="x"),
+        xaxis2=dict(ejes, anchor="y2", domain=[0.73, 1.0], title={"text": "Personas alcanzadas"}),
+        yaxis2=dict(ejes, anchor="x2"),
+        annotations=[
+            dict(text=texto, x=x, y=1.0, xref="paper", yref="paper", xanchor="center", yanchor="bottom",
+                 showarrow=False, font=dict(size=16))
+            for texto, x in (("Propagadores I(t)", 0.315), ("Tamaño final", 0.865))
+        ],
+    )
+    if resumen is None:
+        return figure_dict([], tema="marco", x_titulo="Tiempo", y_titulo="Número de personas", **paneles)
+
+    t = resumen["t"]
+    p5, p25, p50, p75, p95 = resumen["bandas"][:, :, 1]
+    trazas = []
+    for inferior, superior, opacidad, nombre in ((p5, p95, 0.15, "5–95 %"), (p25, p75, 0.3, "25–75 %")):
+        trazas.append(line_trace(*decimate(t, superior), ancho=0, showlegend=False, hoverinfo="skip"))
+        trazas.append(line_trace(*decimate(t, inferior), f"Réplicas {nombre}", ancho=0,
+                                 fill="tonexty", fillcolor=f"rgba(255,0,0,{opacidad})", hoverinfo="skip"))
+    trazas.append(line_trace(*decimate(t, p50), "Mediana", "red"))
+    trazas.append(line_trace(*decimate(t, resumen["determinista"][:, 1]), "Determinista", "black",
+                             line=dict(dash="dash")))
+    trazas.append(dict(type="histogram", x=encode_array(resumen["tamano_final"]), nbinsx=40,
+                       marker=dict(color="gray"), showlegend=False, xaxis="x2", yaxis="y2"))
+
+    return figure_dict(
+        trazas, tema="marco", titulo=f"Probabilidad de brote mayor: {resumen['prob_brote']:.0%}",
+        x_titulo="Tiempo", y_titulo="Número de personas",
+        legend=dict(orientation='h', yanchor='bottom', y=-0.3, xanchor='center', x=.5),
+        **paneles,
+    )
+
+
+# --- Adopción de política (caso 3: N = 10050, S0 = 10000, I0 = 50) ---
+@cached_simulation
+@default_runner.task
+def resolver_adopcion(b, k, tiempo_max):
+    t = np.linspace(0, tiempo_max, 500)
+    return ADOPTION.simulate(ADOPCION_Y0, t, {"b": b, "k": k})
+
+
+warmup.register(resolver_adopcion, 0.00005, 0.00002, 100)
+
+
+@callback(
+    Output("grafica-adopcion", "figure"),
+    Output("trabajo-adopcion", "data"),
+    Output("sondeo-adopcion", "disabled"),
+    Output("estado-adopcion", "children"),
+    Input("btn-adopcion", "n_clicks"),
+    Input("sondeo-adopcion", "n_intervals"),
+    State("trabajo-adopcion", "data"),
+    State("adopcion-b", "value"),
+    State("adopcion-k", "value"),
+    State("adopcion-tiempo", "value"),
+    prevent_initial_call=False
+)
+def simular_adopcion(n_clicks, n_intervals, trabajo, b, k, tiempo_max):
+    if None in (b, k, tiempo_max):
+        return figure_dict([], tema="casos"), None, True, "Complete todos los campos"
+    return follow_job(
+        ctx.triggered_id == "sondeo-adopcion", trabajo,
+        resolver_adopcion, (b, k, tiempo_max),
+        lambda solucion: figura_adopcion(solucion, tiempo_max),
     )
-    fig.update_xaxes(
-        showgrid=True, gridwidth=1, gridcolor = "lightpink",
-        zeroline=True, zerolinewidth=2, zerolinecolor="red",
-        showline=True, linecolor="black", linewidth=2, mirror=True,
+
+
+def figura_adopcion(solucion, tiempo_max):
+    trazas = []
+    if solucion is not None:
+        t = np.linspace(0, tiempo_max, 500)
+        for i, (nombre, color) in enumerate((("Susceptibles (S)", "blue"), ("Influyentes (I)", "red"),
+                                             ("Rechazadores (R)", "green"))):
+            x, y = decimate(t, solucion[:, i])
+            trazas.append(line_trace(
+                x, y, nombre, color,
+                hovertemplate=f"Día: %{{x:.0f}} <br> {nombre} :%{{y:.0f}}<extra></extra>"
+            ))
+    return figure_dict(
+        trazas, tema="casos", titulo="Adopción de una política pública",
+        x_titulo="Tiempo (días)", y_titulo="Número de ciudadanos",
+        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=.5),
     )
-    fig.update_yaxes(
-        showgrid=True, gridwidth=1, gridcolor = "lightpink",
-        zeroline=True, zerolinewidth=2, zerolinecolor="red",
-        showline=True, linecolor="black", linewidth=2, mirror=True,
+
+
+# --- Adopción de política en red ---
+@cached_simulation
+@default_runner.task
+def resolver_adopcion_red(grado, p, b=0.00005, k=0.00002, tiempo_max=60):
+    N, dt = 10050, 0.25
+    t = np.linspace(0, tiempo_max, int(round(tiempo_max / dt)) + 1)
+    A = small_world_graph(N, int(grado), p, semilla=0)
+    red = network_simulate(A, 50, b * N / grado, k, len(t) - 1, dt=dt, semilla=0)
+    mezcla = ADOPTION.simulate(ADOPCION_Y0, t, {"b": b, "k": k})
+    return t, red, mezcla
+
+
+warmup.register(resolver_adopcion_red, 10, 0.1, 0.00005, 0.00002)
+
+
+@callback(
+    Output("grafica-red", "figure"),
+    Output("trabajo-red", "data"),
+    Output("sondeo-red", "disabled"),
+    Output("estado-red", "children"),
+    Input("btn-red", "n_clicks"),
+    Input("sondeo-red", "n_intervals"),
+    State("trabajo-red", "data"),
+    State("red-grado", "value"),
+    State("red-p", "value"),
+    State("adopcion-b", "value"),
+    State("adopcion-k", "value"),
+    prevent_initial_call=False
+)
+def simular_adopcion_red(n_clicks, n_intervals, trabajo, grado, p, b, k):
+    if None in (grado, p, b, k):
+        return figure_dict([], tema="marco"), None, True, "Complete todos los campos"
+    if grado != int(grado) or grado % 2 or not 2 <= grado <= MAX_GRADO:
+        return figure_dict([], tema="marco"), None, True, f"⟨k⟩ debe ser un entero par entre 2 y {MAX_GRADO}"
+    if not 0 <= p <= 1:
+        return figure_dict([], tema="marco"), None, True, "p debe estar entre 0 y 1"
+    return follow_job(
+        ctx.triggered_id == "sondeo-red", trabajo,
+        resolver_adopcion_red, (int(grado), p, b, k),
+        figura_adopcion_red,
     )
 
-    return fig
\ No newline at end of file
+
+def figura_adopcion_red(resultado):
+    trazas = []
+    if resultado is not None:
+        t, red, mezcla = resultado
+        trazas.append(line_trace(*decimate(t, mezcla[:, 1]), "Mezcla perfecta (EDO)", "black",
+                                 line=dict(dash="dash")))
+        trazas.append(line_trace(*decimate(t, red[:, 1]), "Red de mundo pequeño", "green"))
+    return figure_dict(
+        trazas, tema="marco", titulo="Influyentes I(t)",
+        x_titulo="Tiempo", y_titulo="Número de personas",
+        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=.5),
+    )
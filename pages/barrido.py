@@ -0,0 +1,150 @@
+import dash
+from dash import html, dcc, callback, Input, Output, State, ctx
+from models.sweep import sir_sweep_grid, MAX_RESOLUCION, MAX_TIEMPO
+from utils.cache import cached_simulation
+from utils.figures import encode_array, figure_dict
+from utils.jobs import default_runner, follow_job, job_components
+from utils import warmup
+
+dash.register_page(__name__, path="/barrido", name="Barrido SIR")
+
+# Misma función (y mismas claves de caché) que la API /api/barrido-sir
+barrer_sir = cached_simulation(default_runner.task(sir_sweep_grid))
+
+# Los valores por defecto del layout se precalculan al arrancar (utils.warmup)
+warmup.register(barrer_sir, 0.05, 1.0, "gamma", 0.02, 0.5, 100, 1000, 1, 0.1, 160)
+
+ETIQUETAS_EJE = {
+    "gamma": "Tasa de recuperación (γ)",
+    "I0": "Infectados iniciales (I₀)",
+    "N": "Población total (N)",
+}
+RANGOS_EJE = {
+    "gamma": (0.02, 0.5),
+    "I0": (1, 50),
+    "N": (100, 10000),
+}
+METRICAS = {
+    "pico": ("Pico de infectados", "personas"),
+    "dia_pico": ("Día del pico", "días"),
+    "ataque": ("Tasa de ataque final", "fracción"),
+}
+
+layout = html.Div([
+    html.Div([
+        html.H2("Barrido de parámetros - SIR", className="title"),
+        html.P("Resuelve toda la malla de escenarios a la vez y muestra el resultado como mapa de calor.",
+               style={'color': 'gray', 'fontSize': '14px'}),
+        html.Div([
+            html.Label("β mínimo = "),
+            dcc.Input(id="barrido-beta-min", type="number", value=0.05, step=0.01, className="input-field")
+        ]),
+        html.Div([
+            html.Label("β máximo = "),
+            dcc.Input(id="barrido-beta-max", type="number", value=1.0, step=0.01, className="input-field")
+        ]),
+        html.Div([
+            html.Label("Segundo parámetro: "),
+            dcc.Dropdown(id="barrido-eje", options=[{"label": v, "value": k} for k, v in ETIQUETAS_EJE.items()],
+                         value="gamma", clearable=False)
+        ]),
+        html.Div([
+            html.Label("Mínimo = "),
+            dcc.Input(id="barrido-eje-min", type="number", value=0.02, className="input-field")
+        ]),
+        html.Div([
+            html.Label("Máximo = "),
+            dcc.Input(id="barrido-eje-max", type="number", value=0.5, className="input-field")
+        ]),
+        html.Div([
+            html.Label("Resolución (puntos por eje) = "),
+            dcc.Input(id="barrido-resolucion", type="number", value=100, min=2, max=MAX_RESOLUCION, className="input-field")
+        ]),
+        html.H3("Valores fijos"),
+        html.Div([
+            html.Label("Población Total N = "),
+            dcc.Input(id="barrido-n", type="number", value=1000, className="input-field")
+        ]),
+        html.Div([
+            html.Label("Infectados iniciales (I) = "),
+            dcc.Input(id="barrido-I0", type="number", value=1, className="input-field")
+        ]),
+        html.Div([
+            html.Label("Tasa de recuperación (g) = "),
+            dcc.Input(id="barrido-g", type="number", value=0.1, step=0.01, className="input-field")
+        ]),
+        html.Div([
+            html.Label("Tiempo de simulación: "),
+            dcc.Input(id="barrido-tiempo", type="number", value=160, min=1, max=MAX_TIEMPO, className="input-field")
+        ]),
+
+        html.Button("Calcular barrido", id="btn-barrido"),
+        job_components("barrido"),
+    ], className="contain-left"),
+    html.Div([
+        html.H2("Mapa de calor", className="title"),
+        dcc.RadioItems(id="barrido-metrica", options=[{"label": v[0], "value": k} for k, v in METRICAS.items()],
+                       value="pico", inline=True),
+        dcc.Graph(id="grafica-barrido", style={"height": "550px", "width": "100%"}),
+    ], className="contain-right")
+], className="page-container")
+
+
+@callback(
+    Output("barrido-eje-min", "value"),
+    Output("barrido-eje-max", "value"),
+    Input("barrido-eje", "value"),
+    prevent_initial_call=True
+)
+def rango_por_eje(eje):
+    return RANGOS_EJE[eje]
+
+
+@callback(
+    Output("grafica-barrido", "figure"),
+    Output("trabajo-barrido", "data"),
+    Output("sondeo-barrido", "disabled"),
+    Output("estado-barrido", "children"),
+    Input("btn-barrido", "n_clicks"),
+    Input("sondeo-barrido", "n_intervals"),
+    Input("barrido-metrica", "value"),
+    State("trabajo-barrido", "data"),
+    State("barrido-beta-min", "value"),
+    State("barrido-beta-max", "value"),
+    State("barrido-eje", "value"),
+    State("barrido-eje-min", "value"),
+    State("barrido-eje-max", "value"),
+    State("barrido-resolucion", "value"),
+    State("barrido-n", "value"),
+    State("barrido-I0", "value"),
+    State("barrido-g", "value"),
+    State("barrido-tiempo", "value"),
+    prevent_initial_call=False
+)
+def calcular_barrido(n_clicks, n_intervals, metrica, trabajo,
+                     beta_min, beta_max, eje, eje_min, eje_max, resolucion, n, I0, gamma, tiempo_max):
+    if None in (beta_min, beta_max, eje_min, eje_max, resolucion, n, I0, gamma, tiempo_max):
+        return figure_dict([], tema="marco"), None, True, "Complete todos los campos"
+    args = (beta_min, beta_max, eje, eje_min, eje_max, resolucion, n, I0, gamma, tiempo_max)
+    # Cambiar de métrica reutiliza el barrido en caché (o sigue esperando el que está en curso)
+    sondeo = ctx.triggered_id == "sondeo-barrido" or (ctx.triggered_id == "barrido-metrica" and trabajo)
+    return follow_job(
+        bool(sondeo), trabajo, barrer_sir, args,
+        lambda resultado: figura_barrido(resultado, metrica, args[2]),
+    )
+
+
+def figura_barrido(resultado, metrica, eje):
+    trazas, titulo = [], None
+    if resultado is not None:
+        titulo, unidad = METRICAS[metrica]
+        trazas.append(dict(
+            type="heatmap",
+            x=encode_array(resultado["beta"]), y=encode_array(resultado["valores"]),
+            z=encode_array(resultado[metrica]),
+            colorscale="Viridis",
+            colorbar=dict(title=dict(text=unidad)),
+            hovertemplate=f"β: %{{x:.3f}}<br>{eje}: %{{y:.3f}}<br>{titulo}: %{{z:.2f}}<extra></extra>",
+        ))
+    return figure_dict(trazas, tema="marco", titulo=titulo,
+                       x_titulo="Tasa de transmisión (β)", y_titulo=ETIQUETAS_EJE.get(eje, eje))
@@ -2,75 +2,80 @@ import dash
 from dash import html, dcc
 import numpy as np
 import plotly.graph_objects as go
+from utils.static_figures import static_graph
 
 
 dash.register_page(__name__, path="/clase1", name="Clase 1")
 
 
-p_0 = 100
-r = 0.03
+def figura_crecimiento():
+    p_0 = 100
+    r = 0.03
 
-t = np.linspace(0, 100, num=200)
-P = p_0*np.exp(r*t)
+    t = np.linspace(0, 100, num=200)
+    P = p_0*np.exp(r*t)
 
-trace = go.Scatter(
-    x=t,
-    y=P,
-    mode="lines+markers",
-    # color="red"
-    line=dict(
-        dash='dot',
-        color='black'
-    ),
-    marker=dict(
-        symbol="square",
-        size=2
-    ),
-    # name="P(t)=P_0*e^{rt}",
-    hovertemplate="t=%{x}<br> P=%{y}"
-)
+    trace = go.Scatter(
+        x=t,
+        y=P,
+        mode="lines+markers",
+        # color="red"
+        line=dict(
+            dash='dot',
+            color='black'
+        ),
+        marker=dict(
+            symbol="square",
+            size=2
+        ),
+        # name="P(t)=P_0*e^{rt}",
+        hovertemplate="t=%{x}<br> P=%{y}"
+    )
 
-fig = go.Figure(data=trace)
+    fig = go.Figure(data=trace)
 
-fig.update_layout(
-    title=dict(
-        text="<b>Crecimiento de la población</b>",
-        font=dict(
-            size=20,
-            color="red"
+    fig.update_layout(
+        title=dict(
+            text="<b>Crecimiento de la población</b>",
+            font=dict(
+                size=20,
+                color="red"
+            ),
+            x=0.5,
+            y=.93
         ),
-        x=0.5,
-        y=.93
-    ),
-    xaxis_title="Tiempo",
-    yaxis_title="Poblacion",
-    margin=dict(l=40, r=20, t=20, b=10),
-    paper_bgcolor="lightblue",
-    plot_bgcolor="white",
-    font=dict(
-        family="Outfit",
-        size=11,
-        color="black"
+        xaxis_title="Tiempo",
+        yaxis_title="Poblacion",
+        margin=dict(l=40, r=20, t=20, b=10),
+        paper_bgcolor="lightblue",
+        plot_bgcolor="white",
+        font=dict(
+            family="Outfit",
+            size=11,
+            color="black"
+        )
+    )
+
+    fig.update_xaxes(
+        showgrid=True,
+        gridwidth=1,
+        gridcolor="lightpink",
+        zeroline=True,
+        zerolinewidth=2,
+        zerolinecolor="red"
+    )
+
+    fig.update_yaxes(
+        showgrid=True,
+        gridwidth=1,
+        gridcolor="lightpink",
+        zeroline=True,
+        zerolinewidth=2,
+        zerolinecolor="red"
     )
-)
 
-fig.update_xaxes(
-    showgrid=True,
-    gridwidth=1,
-    gridcolor="lightpink",
-    zeroline=True,
-    zerolinewidth=2,
-    zerolinecolor="red"
-)
+    return fig
 
-fig.update_yaxes(
-    showgrid=True,
-    gridwidth=1,
-    gridcolor="lightpink",
-    zeroline=True,
-    zerolinewidth=2,
-    zerolinecolor="red"
-)
 
 dash.register_page(__name__, path="/1", name="Clase 1")
 
@@ -95,8 +100,8 @@ layout = html.Div(children=[
 
         """
     , mathjax=True, style={"flex":1}, className="card"),
-    dcc.Graph(
-        figure=fig,
+    static_graph(
+        "clase1", figura_crecimiento,
         style={"height": "400px", "width":"100%", "flex":1},
         className="card"
     )], style={"display":"flex"})
@@ -2,77 +2,82 @@ import dash
 from dash import html, dcc
 import numpy as np
 import plotly.graph_objects as go
+from utils.static_figures import static_graph
 
 
 dash.register_page(__name__, path="/clase2", name="Clase 2")
 
 
 
-p_0 = 50
-r = 0.1
-k=200
-
-t = np.linspace(0, 60, num=500)
-P = k*p_0*np.exp(r*t)/(k+p_0*np.exp(r*t)-1)
-
-trace = go.Scatter(
-    x=t,
-    y=P,
-    mode="lines+markers",
-    # color="red"
-    line=dict(
-        dash='dot',
-        color='black'
-    ),
-    marker=dict(
-        symbol="square",
-        size=2
-    ),
-    # name="P(t)=P_0*e^{rt}",
-    hovertemplate="t=%{x}<br> P=%{y}"
-)
-
-fig = go.Figure(data=trace)
-
-fig.update_layout(
-    title=dict(
-        text="<b>Crecimiento de la población</b>",
-        font=dict(
-            size=20,
-            color="red"
+def figura_logistica():
+    p_0 = 50
+    r = 0.1
+    k=200
+
+    t = np.linspace(0, 60, num=500)
+    P = k*p_0*np.exp(r*t)/(k+p_0*np.exp(r*t)-1)
+
+    trace = go.Scatter(
+        x=t,
+        y=P,
+        mode="lines+markers",
+        # color="red"
+        line=dict(
+            dash='dot',
+            color='black'
+        ),
+        marker=dict(
+            symbol="square",
+            size=2
+        ),
+        # name="P(t)=P_0*e^{rt}",
+        hovertemplate="t=%{x}<br> P=%{y}"
+    )
+
+    fig = go.Figure(data=trace)
+
+    fig.update_layout(
+        title=dict(
+            text="<b>Crecimiento de la población</b>",
+            font=dict(
+                size=20,
+                color="red"
+            ),
+            x=0.5,
+            y=.93
         ),
-        x=0.5,
-        y=.93
-    ),
-    xaxis_title="Tiempo",
-    yaxis_title="Poblacion",
-    margin=dict(l=40, r=20, t=20, b=10),
-    paper_bgcolor="lightblue",
-    plot_bgcolor="white",
-    font=dict(
-        family="Outfit",
-        size=11,
-        color="black"
+        xaxis_title="Tiempo",
+        yaxis_title="Poblacion",
+        margin=dict(l=40, r=20, t=20, b=10),
+        paper_bgcolor="lightblue",
+        plot_bgcolor="white",
+        font=dict(
+            family="Outfit",
+            size=11,
+            color="black"
+        )
+    )
+
+    fig.update_xaxes(
+        showgrid=True,
+        gridwidth=1,
+        gridcolor="lightpink",
+        zeroline=True,
+        zerolinewidth=2,
+        zerolinecolor="red"
     )
-)
-
-fig.update_xaxes(
-    showgrid=True,
-    gridwidth=1,
-    gridcolor="lightpink",
-    zeroline=True,
-    zerolinewidth=2,
-    zerolinecolor="red"
-)
-
-fig.update_yaxes(
-    showgrid=True,
-    gridwidth=1,
-    gridcolor="lightpink",
-    zeroline=True,
-    zerolinewidth=2,
-    zerolinecolor="red"
-)
+
+    fig.update_yaxes(
+        showgrid=True,
+        gridwidth=1,
+        gridcolor="lightpink",
+        zeroline=True,
+        zerolinewidth=2,
+        zerolinecolor="red"
+    )
+
+    return fig
+
 
 layout = html.Div(children=[
     html.H1("Crecimiento Logístico", style={"text-align":"center"}),
@@ -107,8 +112,8 @@ layout = html.Div(children=[
         En este caso, la población crece rápidamente al inicio y se estabiliza cerca de $200$ cuando $t$ es grande.
         """
     , mathjax=True, style={"flex":1}, className="card"),
-    dcc.Graph(
-        figure=fig,
+    static_graph(
+        "clase2", figura_logistica,
         style={"height": "400px", "width":"100%", "flex":1},
         className="card"
     )], style={"display":"flex"})
@@ -1,88 +1,96 @@
+import os
+
 import dash
-from dash import html, dcc, Input, Output, callback
+from dash import html, dcc, Input, Output, State, callback, clientside_callback, ClientsideFunction
 import numpy as np
-import plotly.graph_objects as go
+from utils.figures import figure_dict, line_trace, reference_line
 
 dash.register_page(__name__, path="/clase3", name="Clase 3")
 
+CLIENTSIDE = os.environ.get("TECDEMODEL_CLIENTSIDE", "1") != "0"
+
+
+def figura_base(trazas=(), **layout):
+    """Figura con el estilo de la página (compartida por ambas versiones)."""
+    return figure_dict(trazas, tema="logistica", titulo="Crecimiento de la población",
+                       x_titulo="Tiempo (t)", y_titulo="Población P(t)", **layout)
+
+
+def layout_base():
+    """Layout de `figura_base` para la versión en el navegador."""
+    return figura_base()["layout"]
+
 
-layout = html.Div(
-    children=[
-        # html.H2("Técnicas de Modelamiento Matemático", style={"textAlign": "center", "color": "white", "backgroundColor": "#0033cc", "padding": "10px"}),
+def layout(**kwargs):
+    return html.Div(
+        children=[
+            # html.H2("Técnicas de Modelamiento Matemático", style={"textAlign": "center", "color": "white", "backgroundColor": "#0033cc", "padding": "10px"}),
 
-        html.Div([
             html.Div([
-                html.H4("Parámetros del modelo", style={"textAlign": "center"}),
+                html.Div([
+                    html.H4("Parámetros del modelo", style={"textAlign": "center"}),
 
-                html.Label("Población inicial P(0):"),
-                dcc.Input(id="p0", type="number", value=200, style={"width": "100%", "marginBottom": "10px"}),
+                    html.Label("Población inicial P(0):"),
+                    dcc.Input(id="p0", type="number", value=200, style={"width": "100%", "marginBottom": "10px"}),
 
-                html.Label("Tasa de crecimiento (r):"),
-                dcc.Input(id="r", type="number", value=0.04, step=0.01, style={"width": "100%", "marginBottom": "10px"}),
+                    html.Label("Tasa de crecimiento (r):"),
+                    dcc.Input(id="r", type="number", value=0.04, step=0.01, style={"width": "100%", "marginBottom": "10px"}),
 
-                html.Label("Capacidad de carga (K):"),
-                dcc.Input(id="K", type="number", value=750, style={"width": "100%", "marginBottom": "10px"}),
+                    html.Label("Capacidad de carga (K):"),
+                    dcc.Input(id="K", type="number", value=750, style={"width": "100%", "marginBottom": "10px"}),
 
-                html.Label("Tiempo máximo (t):"),
-                dcc.Input(id="tmax", type="number", value=100, style={"width": "100%", "marginBottom": "10px"}),
+                    html.Label("Tiempo máximo (t):"),
+                    dcc.Input(id="tmax", type="number", value=100, style={"width": "100%", "marginBottom": "10px"}),
 
-                # html.Button("Generar gráfica", id="btn-generar", n_clicks=0,
-                #             style={"width": "100%", "backgroundColor": "#0033cc", "color": "white", "padding": "10px", "border": "none", "cursor": "pointer", "marginTop": "10px"}),
+                    # html.Button("Generar gráfica", id="btn-generar", n_clicks=0,
+                    #             style={"width": "100%", "backgroundColor": "#0033cc", "color": "white", "padding": "10px", "border": "none", "cursor": "pointer", "marginTop": "10px"}),
 
-            ], style={"flex": "1", "padding": "20px", "backgroundColor": "white", "borderRadius": "8px", "marginRight": "20px"}),
+                ], style={"flex": "1", "padding": "20px", "backgroundColor": "white", "borderRadius": "8px", "marginRight": "20px"}),
 
-            html.Div([
-                html.H4("Gráfica", style={"textAlign": "center"}),
-                dcc.Graph(id="grafica-logistica", style={"height": "400px"})
-            ], style={"flex": "2", "padding": "20px", "backgroundColor": "#e8f0ff", "borderRadius": "8px"})
-        ], style={"display": "flex", "justifyContent": "center", "alignItems": "stretch", "padding": "20px"})
-    ],
-    style={"fontFamily": "Outfit", "backgroundColor": "#f5f6fa", "minHeight": "100vh"}
-)
+                html.Div([
+                    html.H4("Gráfica", style={"textAlign": "center"}),
+                    dcc.Graph(id="grafica-logistica", style={"height": "400px"}),
+                    dcc.Store(id="layout-base-clase3", data=layout_base() if CLIENTSIDE else None)
+                ], style={"flex": "2", "padding": "20px", "backgroundColor": "#e8f0ff", "borderRadius": "8px"})
+            ], style={"display": "flex", "justifyContent": "center", "alignItems": "stretch", "padding": "20px"})
+        ],
+        style={"fontFamily": "Outfit", "backgroundColor": "#f5f6fa", "minHeight": "100vh"}
+    )
 
 
-@callback(
-    Output("grafica-logistica", "figure"),
-    # Input("btn-generar", "n_clicks"),
-    Input("p0", "value"),
-    Input("r", "value"),
-    Input("K", "value"),
-    Input("tmax", "value"),
-)
 def actualizar_grafica(p0, r, K, tmax):
     if not all([p0, r, K, tmax]):
-        return go.Figure()
+        return figure_dict([], tema="logistica")
 
     # Modelo logístico: P(t) = K / (1 + ((K - P0)/P0) * e^{-r t})
     t = np.linspace(0, tmax, 200)
     P = K / (1 + ((K - p0) / p0) * np.exp(-r * t))
 
-    fig = go.Figure()
-
-    fig.add_trace(go.Scatter(
-        x=t,
-        y=P,
-        mode="lines+markers",
-        name="P(t)",
-        line=dict(color="blue", width=2),
-        marker=dict(symbol="circle", size=4),
-        hovertemplate="t=%{x}<br>P=%{y:.2f}"
-    ))
-
     # Línea de capacidad de carga
-    fig.add_hline(y=K, line=dict(color="red", dash="dot"), annotation_text="K", annotation_position="top right")
-
-    fig.update_layout(
-        title="<b>Crecimiento de la población</b>",
-        xaxis_title="Tiempo (t)",
-        yaxis_title="Población P(t)",
-        plot_bgcolor="white",
-        paper_bgcolor="#e8f0ff",
-        font=dict(family="Outfit", size=12),
-        margin=dict(l=40, r=40, t=60, b=40)
+    forma, anotacion = reference_line(K, "K")
+    return figura_base(
+        [line_trace(t, P, "P(t)", "blue", mode="lines+markers",
+                    marker=dict(symbol="circle", size=4), hovertemplate="t=%{x}<br>P=%{y:.2f}")],
+        shapes=[forma], annotations=[anotacion],
     )
 
-    fig.update_xaxes(gridcolor="lightgray", zeroline=True, zerolinecolor="red")
-    fig.update_yaxes(gridcolor="lightgray", zeroline=True, zerolinecolor="red")
 
-    return fig
+# La curva es una expresión cerrada: por defecto se evalúa en el navegador
+# (assets/clase3.js) y se evita un viaje al servidor por cada tecla.
+# TECDEMODEL_CLIENTSIDE=0 vuelve a la callback del servidor.
+entradas = [
+    Output("grafica-logistica", "figure"),
+    # Input("btn-generar", "n_clicks"),
+    Input("p0", "value"),
+    Input("r", "value"),
+    Input("K", "value"),
+    Input("tmax", "value"),
+]
+if CLIENTSIDE:
+    clientside_callback(
+        ClientsideFunction(namespace="clase3", function_name="actualizar_grafica"),
+        *entradas,
+        State("layout-base-clase3", "data"),
+    )
+else:
+    callback(*entradas)(actualizar_grafica)
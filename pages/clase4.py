@@ -1,7 +1,11 @@
 import dash
 from dash import html, dcc, Input, Output, callback
-import plotly.graph_objects as go
-from models.logistic_model import logistic_with_harvest  
+from models.logistic_model import (
+    logistic_with_harvest,
+    logistic_with_harvest_analytic,
+    harvest_extinction_time,
+)
+from utils.figures import figure_dict, line_trace, reference_line
 
 dash.register_page(__name__, path="/clase4", name="Clase 4")
 
@@ -54,33 +58,24 @@ layout = html.Div(
 )
 def actualizar_grafica(p0, r, K, tmax, h):
     if not all([p0, r, K, tmax]):
-        return go.Figure()
-
-    t, P = logistic_with_harvest(p0, r, K, tmax, h=h)
-
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=t, y=P,
-        mode="lines+markers",
-        name="P(t)",
-        line=dict(color="blue", width=2),
-        marker=dict(size=3),
-        hovertemplate="t=%{x}<br>P=%{y:.2f}"
-    ))
-
-    fig.add_hline(y=K, line=dict(color="red", dash="dot"), annotation_text="K", annotation_position="top right")
-
-    fig.update_layout(
-        title="<b>Crecimiento logístico con cosecha</b>",
-        xaxis_title="Tiempo (t)",
-        yaxis_title="Población P(t)",
-        plot_bgcolor="white",
-        paper_bgcolor="#e8f0ff",
-        font=dict(family="Outfit", size=12),
-        margin=dict(l=40, r=40, t=60, b=40)
+        return figure_dict([], tema="logistica")
+
+    h = h or 0
+    # Solución cerrada por defecto; Euler solo si los parámetros no la admiten
+    try:
+        t, P = logistic_with_harvest_analytic(p0, r, K, tmax, h=h)
+        t_ext = harvest_extinction_time(p0, r, K, h=h)
+    except ValueError:
+        t, P = logistic_with_harvest(p0, r, K, tmax, h=h)
+        t_ext = None
+
+    lineas = [reference_line(K, "K")]
+    if t_ext is not None and t_ext <= tmax:
+        lineas.append(reference_line(t_ext, f"Extinción t={t_ext:.2f}", vertical=True, color="gray", dash="dash"))
+
+    return figure_dict(
+        [line_trace(t, P, "P(t)", "blue", mode="lines+markers", marker=dict(size=3), hovertemplate="t=%{x}<br>P=%{y:.2f}")],
+        tema="logistica", titulo="Crecimiento logístico con cosecha",
+        x_titulo="Tiempo (t)", y_titulo="Población P(t)",
+        shapes=[forma for forma, _ in lineas], annotations=[anotacion for _, anotacion in lineas],
     )
-
-    fig.update_xaxes(gridcolor="lightgray", zeroline=True, zerolinecolor="red")
-    fig.update_yaxes(gridcolor="lightgray", zeroline=True, zerolinecolor="red")
-
-    return fig
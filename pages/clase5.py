@@ -1,10 +1,16 @@
 import dash 
 from dash import html, dcc, callback, Input, Output, State
 import numpy as np
-import plotly.graph_objects as go
+from models.expression import compile_expression
+from models.vector_field import integrate_streamlines, streamline_polyline
+from utils.figures import figure_dict, line_trace, vector_field_traces
 
 dash.register_page(__name__, path="/clase5", name="Campo Vectorial")
 
+# Cada semilla son dos curvas de 401 puntos: acota la memoria del cálculo
+MAX_SEMILLAS = 2500
+MAX_PUNTOS_TRAYECTORIAS = 40000
+
 layout = html.Div([
     html.Div([
         html.H2("Campo Vectorial", className="title"),
@@ -28,6 +34,14 @@ layout = html.Div([
             html.Label("Mallado= "),
             dcc.Input(id="input-n", type = "number", value = 15, className="input-field")
         ]),
+        html.Div([
+            html.Label("Semillas de trayectorias = "),
+            dcc.Input(id="input-semillas", type = "number", value = 100, min=0, max=MAX_SEMILLAS, className="input-field")
+        ]),
+        dcc.Checklist(id="input-opciones", options=[
+            {"label": " Mostrar trayectorias", "value": "trayectorias"},
+            {"label": " Usar WebGL (mallas grandes)", "value": "webgl"},
+        ], value=[]),
         
         html.Button("Generar campo", id = "btn-generar"),
         
@@ -46,6 +60,40 @@ layout = html.Div([
     ], className="contain-right")
 ], className="page-container")
 
+
+def trazar_trayectorias(fx_str, fy_str, xmax, ymax, semillas, fx, fy, webgl=False):
+    """
+    Trayectorias desde una malla de semillas, todas en una sola traza.
+
+    Retorna None si el campo no tiene ningún valor finito en la malla.
+    """
+    magnitud = np.hypot(fx, fy)
+    finitas = magnitud[np.isfinite(magnitud)]
+    if finitas.size == 0:
+        return None
+    lado = max(int(np.sqrt(min(semillas, MAX_SEMILLAS))), 1)
+    sx, sy = np.meshgrid(np.linspace(-xmax, xmax, lado), np.linspace(-ymax, ymax, lado))
+    f, g = compile_expression(fx_str), compile_expression(fy_str)
+
+    # Paso de tiempo tal que una flecha típica avance ~1% del dominio
+    tipica = np.percentile(finitas, 95) or 1.0
+    dt = 0.01 * max(xmax, ymax) / tipica
+
+    curvas = integrate_streamlines(
+        lambda a, b: (f(a, b), g(a, b)),
+        np.column_stack((sx.ravel(), sy.ravel())),
+        dt, 400, (-xmax, xmax, -ymax, ymax), tol=1e-3 * tipica,
+    )
+    # Se submuestrea en el tiempo para acotar el tamaño de la traza
+    validos = np.count_nonzero(~np.isnan(curvas[..., 0]))
+    x_c, y_c = streamline_polyline(curvas[::max(1, -(-validos // MAX_PUNTOS_TRAYECTORIAS))])
+    return line_trace(
+        x_c, y_c, "Trayectorias", "black", ancho=1, webgl=webgl,
+        hoverinfo="skip",
+        showlegend=False,
+    )
+
+
 @callback(
     [Output("grafica-campo", "figure"),
      Output("info-campo", "children")],
@@ -55,69 +103,41 @@ layout = html.Div([
      State("input-xmax", "value"),
      State("input-ymax", "value"),
      State("input-n", "value"),
+     State("input-semillas", "value"),
+     State("input-opciones", "value"),
         prevent_initial_call=False
     )
-def generar_campo(n_clicks, fx_str, fy_str, xmax, ymax, n):
+def generar_campo(n_clicks, fx_str, fy_str, xmax, ymax, n, semillas=0, opciones=None):
+    opciones = opciones or []
+    webgl = "webgl" in opciones
     x=np.linspace(-xmax,xmax, n )
     y = np.linspace(-ymax,ymax,n)
     X,Y = np.meshgrid(x,y)
     info_mensaje = ""
+    campo_valido = False
     try:
-        diccionario = {
-            "x":X,
-            "y":Y,
-            "np":np,
-            "sin":np.sin,
-            "cos":np.cos,
-            "tan":np.tan,
-            "exp":np.exp,
-            'sqrt':np.sqrt,
-            'pi':np.pi,
-            'e':np.e 
-        }
-        fx = eval(fx_str, {}, diccionario)
-        fy = eval(fy_str, {}, diccionario)
+        # Expresiones validadas y compiladas una sola vez (ver models/expression.py)
+        fx = compile_expression(fx_str)(X, Y)
+        fy = compile_expression(fy_str)(X, Y)
         mag_max = np.max(np.sqrt(fx**2+fy**2))
         mag_min = np.min(np.sqrt(fx**2+fy**2))
         info_mensaje = f"Magnitud: min ={mag_min:.2f}, max = {mag_max:.2f}"
+        campo_valido = True
     except Exception as error: 
         fx = np.zeros_like(X)
         fy = np.zeros_like(Y)
         info_mensaje = f"Error en las expresiones {str(error)}"
     
-    fig = go.Figure()
-
-    for i in range(n):
-        for j in range(n):
-            x0,y0=X[i,j], Y[i,j]
-            x1,y1 = x0+fx[i,j],y0+fy[i,j]
-            fig.add_trace(go.Scatter(
-                x = [x0,x1],
-                y = [y0,y1],
-                mode = "lines+markers",
-                line = dict(color="blue", width=2),
-                showlegend=False 
-            ))
-    fig.update_layout(
-        title=dict(
-            text = f"<b>Campo Vectorial:dx/dt = {fx_str}, dy/dt = {fy_str}",
-            x=0.5
-        ),
-        xaxis_title = "x",
-        yaxis_title="y",
-        paper_bgcolor="lightyellow",
-        plot_bgcolor="white",
-        
-    )
-    fig.update_xaxes(
-        showgrid=True, gridwidth=1, gridcolor = "lightpink",
-        zeroline=True, zerolinewidth=2, zerolinecolor="red",
-        showline=True, linecolor="black", linewidth=2, mirror=True,
-        range=[-xmax*1.1,xmax*1.1]
+    trazas = vector_field_traces(X, Y, fx, fy, webgl=webgl)
+    if campo_valido and "trayectorias" in opciones and semillas:
+        trayectorias = trazar_trayectorias(fx_str, fy_str, xmax, ymax, semillas, fx, fy, webgl)
+        if trayectorias is not None:
+            trazas.append(trayectorias)
+    fig = figure_dict(
+        trazas, tema="campo",
+        x_titulo="x", y_titulo="y",
+        title=dict(text=f"<b>Campo Vectorial:dx/dt = {fx_str}, dy/dt = {fy_str}", x=0.5),
+        xaxis=dict(range=[-xmax*1.1, xmax*1.1]),
+        yaxis=dict(range=[-ymax*1.1, ymax*1.1]),
     )
-    fig.update_yaxes(
-        showgrid=True, gridwidth=1, gridcolor = "lightpink",
-        zeroline=True, zerolinewidth=2, zerolinecolor="red",
-        showline=True, linecolor="black", linewidth=2, mirror=True,
-        range=[-ymax*1.1,ymax*1.1])
     return fig, info_mensaje
\ No newline at end of file
@@ -1,11 +1,17 @@
 import dash 
-from dash import html, dcc, callback, Input, Output, State
+from dash import html, dcc, callback, Input, Output, State, ctx
 import numpy as np
-import plotly.graph_objects as go
-from scipy.integrate import odeint
+from models.compartmental import SIR
+from utils.cache import cached_simulation
+from utils.downsample import decimate
+from utils.figures import figure_dict, line_trace
+from utils.jobs import default_runner, follow_job, job_components
+from utils import warmup
 
 dash.register_page(__name__, path="/clase6", name="Modelo SIR")
 
+warmup.register_import("scipy.integrate")
+
 layout = html.Div([
     html.Div([
         html.H2("Modelo SIR - Epidemiologia", className="title"),
@@ -31,6 +37,7 @@ layout = html.Div([
         ]),
         
         html.Button("Generar campo", id = "btn-generar"),
+        job_components("sir"),
         
         #Ejemplos
         # html.Div([
@@ -46,21 +53,28 @@ layout = html.Div([
         #html.Div(id="info-campo")
     ], className="contain-right")
 ], className="page-container")
-def modelo_sir(y, t, b, g, N):
-    S,I,R = y 
 
-    dS_dt = -b*S*I/N
-    dI_dt = b*S*I/N-g*I
-    dR_dt = g*I
 
-    return [dS_dt, dI_dt, dR_dt]
+@cached_simulation
+@default_runner.task
+def resolver_sir(n, beta, gamma, I0, tiempo_max):
+    t = np.linspace(0, tiempo_max, 200)
+    return SIR.simulate([n - I0, I0, 0], t, {"beta": beta, "gamma": gamma}, N=n)
+
+
+# Los valores por defecto del layout se precalculan al arrancar (utils.warmup)
+warmup.register(resolver_sir, 1000, 0.3, 0.1, 1, 100)
 
 
 @callback(
-    Output("grafica-sir", "figure")
+    Output("grafica-sir", "figure"),
      #Output("info-campo", "children")
-     ,
+    Output("trabajo-sir", "data"),
+    Output("sondeo-sir", "disabled"),
+    Output("estado-sir", "children"),
      Input("btn-generar", "n_clicks"),
+     Input("sondeo-sir", "n_intervals"),
+     State("trabajo-sir", "data"),
      State("input-n", "value"),
      State("input-b", "value"),
      State("input-g", "value"),
@@ -68,69 +82,43 @@ def modelo_sir(y, t, b, g, N):
      State("input-tiempo", "value"),
     prevent_initial_call=False
     )
-def simular_sir(n_clicks, n, beta, gamma, I0, tiempo_max):
+def simular_sir(n_clicks, n_intervals, trabajo, n, beta, gamma, I0, tiempo_max):
+    if None in (n, beta, gamma, I0, tiempo_max):
+        return figure_dict([], tema="sir"), None, True, "Complete todos los campos"
+    # La integración corre en un proceso aparte; el Interval consulta su estado
+    return follow_job(
+        ctx.triggered_id == "sondeo-sir", trabajo,
+        resolver_sir, (n, beta, gamma, I0, tiempo_max),
+        lambda solucion: figura_sir(solucion, n, I0, tiempo_max),
+    )
+
+
+def figura_sir(solucion, n, I0, tiempo_max):
     S0 = n-I0 
     R0_inicial = 0
-    y0 = [S0, I0, R0_inicial]
     t = np.linspace(0, tiempo_max, 200)
-    try:
-        solucion = odeint(modelo_sir, y0, t, args=(beta, gamma, n))
+    if solucion is not None:
         S, I, R = solucion.T
-    except Exception as e:
+    else:
         S = np.full_like(t, S0)
         I = np.full_like(t, I0)
         R = np.full_like(t, R0_inicial)
+    # Como mucho MAX_PUNTOS por curva, sin importar la resolución del integrador
+    (tS, S), (tI, I), (tR, R) = (decimate(t, serie) for serie in (S, I, R))
     
-    fig = go.Figure()
-
-    fig.add_trace(go.Scatter(
-        x=t, y=S,
-        mode = 'lines',
-        name = 'Suceptibles (S)',
-        line = dict(color='blue', width=2),
-        hovertemplate = "Día: %{x:.0f} <br> Suceptibles :%{y:.0f}<extra></extra>"
-    ))
-    fig.add_trace(go.Scatter(
-        x=t, y=I,
-        mode = 'lines',
-        name='Infectados(I)',
-        line = dict(color='red', width=2),
-        hovertemplate = "Día: %{x:.0f} <br> Infectados :%{y:.0f}<extra></extra>"
-    ))
-    fig.add_trace(go.Scatter(
-        x=t, y=R,
-        mode = 'lines',
-        name='Recuperados (R)',
-        line = dict(color='green', width=2),
-        hovertemplate = "Día: %{x:.0f} <br> Recuperados :%{y:.0f}<extra></extra>"
-    ))
-
-    fig.update_layout(
-        title=dict(
-            text = f"<b>Evolucion del modelo SIR</b>",
-            x=0.5, font=dict(size=16, color='darkblue')
-        ),
-        xaxis_title = "Tiempo (días)",
-        yaxis_title="Número de personas",
-        paper_bgcolor="lightcyan",
-        plot_bgcolor="white",
-        legend=dict(
-            orientation='h', yanchor='bottom',y=1.02,
-            xanchor='right', x=.5
-        )
+    return figure_dict(
+        [line_trace(tS, S, 'Suceptibles (S)', 'blue',
+                    hovertemplate="Día: %{x:.0f} <br> Suceptibles :%{y:.0f}<extra></extra>"),
+         line_trace(tI, I, 'Infectados(I)', 'red',
+                    hovertemplate="Día: %{x:.0f} <br> Infectados :%{y:.0f}<extra></extra>"),
+         line_trace(tR, R, 'Recuperados (R)', 'green',
+                    hovertemplate="Día: %{x:.0f} <br> Recuperados :%{y:.0f}<extra></extra>")],
+        tema="sir",
+        titulo="Evolucion del modelo SIR",
+        x_titulo="Tiempo (días)",
+        y_titulo="Número de personas",
+        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=.5),
     )
-    fig.update_xaxes(
-        showgrid=True, gridwidth=1, gridcolor = "lightpink",
-        zeroline=True, zerolinewidth=2, zerolinecolor="red",
-        showline=True, linecolor="black", linewidth=2, mirror=True,
-    )
-    fig.update_yaxes(
-        showgrid=True, gridwidth=1, gridcolor = "lightpink",
-        zeroline=True, zerolinewidth=2, zerolinecolor="red",
-        showline=True, linecolor="black", linewidth=2, mirror=True,
-    )
-
-    return fig
 
 # def generar_campo(n_clicks, fx_str, fy_str, xmax, ymax, n):
 #     x=np.linspace(-xmax,xmax, n )
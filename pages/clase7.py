@@ -1,11 +1,17 @@
 import dash 
-from dash import html, dcc, callback, Input, Output, State
+from dash import html, dcc, callback, Input, Output, State, ctx
 import numpy as np
-import plotly.graph_objects as go
-from scipy.integrate import odeint
+from models.compartmental import SEIR
+from utils.cache import cached_simulation
+from utils.downsample import decimate
+from utils.figures import figure_dict, line_trace
+from utils.jobs import default_runner, follow_job, job_components
+from utils import warmup
 
 dash.register_page(__name__, path="/clase7", name="Modelo SEIR")
 
+warmup.register_import("scipy.integrate")
+
 layout = html.Div([
     html.Div([
         html.H2("Modelo SEIR - Epidemiología", className="title"),
@@ -39,6 +45,7 @@ layout = html.Div([
         ]),
         
         html.Button("Simular modelo", id="btn-generar"),
+        job_components("seir"),
     ], className="contain-left"),
     
     html.Div([
@@ -48,20 +55,27 @@ layout = html.Div([
 ], className="page-container")
 
 
-# --- Modelo SEIR ---
-def modelo_seir(y, t, beta, sigma, gamma, N):
-    S, E, I, R = y
-    dS_dt = -beta * S * I / N
-    dE_dt = beta * S * I / N - sigma * E
-    dI_dt = sigma * E - gamma * I
-    dR_dt = gamma * I
-    return [dS_dt, dE_dt, dI_dt, dR_dt]
+@cached_simulation
+@default_runner.task
+def resolver_seir(N, beta, sigma, gamma, E0, I0, tiempo_max):
+    t = np.linspace(0, tiempo_max, 300)
+    y0 = [N - E0 - I0, E0, I0, 0]
+    return SEIR.simulate(y0, t, {"beta": beta, "sigma": sigma, "gamma": gamma}, N=N)
+
+
+# Los valores por defecto del layout se precalculan al arrancar (utils.warmup)
+warmup.register(resolver_seir, 1000, 0.3, 0.2, 0.1, 0, 1, 160)
 
 
 # --- Callback principal ---
 @callback(
     Output("grafica-seir", "figure"),
+    Output("trabajo-seir", "data"),
+    Output("sondeo-seir", "disabled"),
+    Output("estado-seir", "children"),
     Input("btn-generar", "n_clicks"),
+    Input("sondeo-seir", "n_intervals"),
+    State("trabajo-seir", "data"),
     State("input-n-2", "value"),
     State("input-b-2", "value"),
     State("input-s", "value"),
@@ -71,69 +85,45 @@ def modelo_seir(y, t, beta, sigma, gamma, N):
     State("input-tiempo-2", "value"),
     prevent_initial_call=False
 )
-def simular_seir(n_clicks, N, beta, sigma, gamma, E0, I0, tiempo_max):
+def simular_seir(n_clicks, n_intervals, trabajo, N, beta, sigma, gamma, E0, I0, tiempo_max):
+    if None in (N, beta, sigma, gamma, E0, I0, tiempo_max):
+        return figure_dict([], tema="sir"), None, True, "Complete todos los campos"
+    # La integración corre en un proceso aparte; el Interval consulta su estado
+    return follow_job(
+        ctx.triggered_id == "sondeo-seir", trabajo,
+        resolver_seir, (N, beta, sigma, gamma, E0, I0, tiempo_max),
+        lambda solucion: figura_seir(solucion, N, E0, I0, tiempo_max),
+    )
+
+
+def figura_seir(solucion, N, E0, I0, tiempo_max):
     S0 = N - E0 - I0
     R0_inicial = 0
-    y0 = [S0, E0, I0, R0_inicial]
     t = np.linspace(0, tiempo_max, 300)
 
-    try:
-        solucion = odeint(modelo_seir, y0, t, args=(beta, sigma, gamma, N))
+    if solucion is not None:
         S, E, I, R = solucion.T
-    except Exception as e:
+    else:
         S = np.full_like(t, S0)
         E = np.full_like(t, E0)
         I = np.full_like(t, I0)
         R = np.full_like(t, R0_inicial)
+    # Como mucho MAX_PUNTOS por curva, sin importar la resolución del integrador
+    (tS, S), (tE, E), (tI, I), (tR, R) = (decimate(t, serie) for serie in (S, E, I, R))
 
     # --- Gráfica ---
-    fig = go.Figure()
-
-    fig.add_trace(go.Scatter(
-        x=t, y=S,
-        mode='lines', name='Susceptibles (S)',
-        line=dict(color='blue', width=2),
-        hovertemplate="Día: %{x:.0f}<br>Susceptibles: %{y:.0f}<extra></extra>"
-    ))
-    fig.add_trace(go.Scatter(
-        x=t, y=E,
-        mode='lines', name='Expuestos (E)',
-        line=dict(color='orange', width=2),
-        hovertemplate="Día: %{x:.0f}<br>Expuestos: %{y:.0f}<extra></extra>"
-    ))
-    fig.add_trace(go.Scatter(
-        x=t, y=I,
-        mode='lines', name='Infectados (I)',
-        line=dict(color='red', width=2),
-        hovertemplate="Día: %{x:.0f}<br>Infectados: %{y:.0f}<extra></extra>"
-    ))
-    fig.add_trace(go.Scatter(
-        x=t, y=R,
-        mode='lines', name='Recuperados (R)',
-        line=dict(color='green', width=2),
-        hovertemplate="Día: %{x:.0f}<br>Recuperados: %{y:.0f}<extra></extra>"
-    ))
-
-    fig.update_layout(
-        title=dict(
-            text=f"<b>Evolución del modelo SEIR</b>",
-            x=0.5, font=dict(size=16, color='darkblue')
-        ),
-        xaxis_title="Tiempo (días)",
-        yaxis_title="Número de personas",
-        paper_bgcolor="lightcyan",
-        plot_bgcolor="white",
-        legend=dict(
-            orientation='h', yanchor='bottom', y=1.02,
-            xanchor='right', x=.5
-        )
+    return figure_dict(
+        [line_trace(tS, S, 'Susceptibles (S)', 'blue',
+                    hovertemplate="Día: %{x:.0f}<br>Susceptibles: %{y:.0f}<extra></extra>"),
+         line_trace(tE, E, 'Expuestos (E)', 'orange',
+                    hovertemplate="Día: %{x:.0f}<br>Expuestos: %{y:.0f}<extra></extra>"),
+         line_trace(tI, I, 'Infectados (I)', 'red',
+                    hovertemplate="Día: %{x:.0f}<br>Infectados: %{y:.0f}<extra></extra>"),
+         line_trace(tR, R, 'Recuperados (R)', 'green',
+                    hovertemplate="Día: %{x:.0f}<br>Recuperados: %{y:.0f}<extra></extra>")],
+        tema="sir",
+        titulo="Evolución del modelo SEIR",
+        x_titulo="Tiempo (días)",
+        y_titulo="Número de personas",
+        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=.5),
     )
-
-    fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor="lightpink",
-                     zeroline=True, zerolinewidth=2, zerolinecolor="red",
-                     showline=True, linecolor="black", linewidth=2, mirror=True)
-    fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor="lightpink",
-                     zeroline=True, zerolinewidth=2, zerolinecolor="red",
-                     showline=True, linecolor="black", linewidth=2, mirror=True)
-
-    return fig
@@ -1,11 +1,16 @@
 import dash
-from dash import html, dcc, callback, Input, Output, State
-import plotly.graph_objects as go
-import requests # Librería necesaria para llamadas API
-import pandas as pd
+from dash import html, dcc, callback, Input, Output, State, ctx
+import numpy as np
+from utils.downsample import decimate
+from utils.figures import figure_dict, line_trace
+from utils.weather import default_client
+from utils.weather_store import default_store
+from utils import metrics, warmup
 
 dash.register_page(__name__, path="/clase8", name="Datos API (Clima)")
 
+warmup.register_import("requests", "pandas")
+
 layout = html.Div([
     html.Div([
         html.H2("Consumo de API", className="title"),
@@ -27,6 +32,14 @@ layout = html.Div([
         
         html.Br(),
         html.Button("Obtener Datos", id="btn-api-call"),
+
+        # Comparación de varias ubicaciones (consultas en paralelo)
+        html.Div([
+            html.Label("Comparar ubicaciones (lat, lon; lat, lon; ...):"),
+            dcc.Input(id="input-ubicaciones", type="text", className="input-field",
+                      value="-12.05, -77.04; -33.45, -70.67; 4.71, -74.07"),
+            html.Button("Comparar", id="btn-api-comparar"),
+        ], style={'marginTop': '10px'}),
         
         # Explicación didáctica
         html.Div([
@@ -45,88 +58,112 @@ layout = html.Div([
 
 ], className="page-container")
 
+def leer_ubicaciones(texto):
+    """'lat, lon; lat, lon' -> [(lat, lon), ...]"""
+    ubicaciones = []
+    for par in (texto or "").split(";"):
+        if par.strip():
+            lat, lon = (float(v) for v in par.split(","))
+            ubicaciones.append((lat, lon))
+    return ubicaciones
+
+
+def comparar_ubicaciones(texto, days):
+    fig = figure_dict([], tema="clima")
+    try:
+        ubicaciones = leer_ubicaciones(texto)
+    except ValueError:
+        return fig, "Formato inválido: use 'lat, lon; lat, lon'"
+    if not ubicaciones:
+        return fig, "Ingrese al menos una ubicación"
+
+    # Todas las consultas en paralelo; las series se unen en un DataFrame
+    with metrics.timer("api"):
+        frame, errores = default_client.hourly_temperature_many(ubicaciones, days)
+
+    # Serie horaria con ciclo diario: min/max por tramo conserva la envolvente
+    trazas = [
+        line_trace(*decimate(frame.index.to_numpy(), frame[columna].to_numpy(), metodo="minmax"),
+                   f"Lat, Lon: {columna}")
+        for columna in frame.columns
+    ]
+    fig = figure_dict(trazas, tema="clima", titulo="Comparación de temperaturas",
+                      x_titulo="Tiempo", y_titulo="Temperatura (°C)", hovermode="x unified")
+
+    # Estadísticas por ubicación, calculadas por columna
+    resumen = frame.agg(["max", "min", "mean"]).T if not frame.empty else frame
+    info = [
+        html.Div(f"{etiqueta}: Máx {fila['max']:.1f}°C | Mín {fila['min']:.1f}°C | Promedio {fila['mean']:.2f}°C")
+        for etiqueta, fila in resumen.iterrows()
+    ]
+    info += [html.Div(f"{etiqueta}: error {error}") for etiqueta, error in errores.items()]
+    return fig, info
+
+
 @callback(
     [Output("grafica-api", "figure"),
      Output("info-api", "children")],
     Input("btn-api-call", "n_clicks"),
+    Input("btn-api-comparar", "n_clicks"),
     State("input-lat", "value"),
     State("input-lon", "value"),
     State("input-days", "value"),
+    State("input-ubicaciones", "value"),
     prevent_initial_call=False
 )
-def consultar_api_clima(n_clicks, lat, lon, days):
+def consultar_api_clima(n_clicks, n_comparar, lat, lon, days, ubicaciones=None):
+    import requests # Librería necesaria para llamadas API (se importa en la primera consulta)
+
+    if ctx.triggered_id == "btn-api-comparar":
+        return comparar_ubicaciones(ubicaciones, days or 3)
+
     # Valores por defecto para la primera carga si n_clicks es None
     if lat is None: lat = -12.04
     if lon is None: lon = -77.04
     if days is None: days = 3
 
     info_mensaje = "Esperando consulta..."
-    fig = go.Figure()
-
-    # URL de la API (Open Meteo es gratuita y no requiere Key)
-    # Pedimos temperatura horaria de los ultimos 'days' días
-    url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&past_days={days}&hourly=temperature_2m&forecast_days=1"
+    fig = figure_dict([], tema="clima")
 
+    # API de Open Meteo (gratuita y no requiere Key): temperatura horaria de
+    # los ultimos 'days' días. El almacén local solo descarga las horas que
+    # aún no tiene y lee el resto del disco (ver utils/weather_store.py)
     try:
         # 1. Realizar la llamada a la API
-        response = requests.get(url)
-        
-        if response.status_code == 200:
-            data = response.json()
-            
-            # 2. Procesar los datos (El JSON tiene una estructura específica)
-            # data['hourly']['time'] es una lista de fechas
-            # data['hourly']['temperature_2m'] es una lista de temperaturas
-            times = data['hourly']['time']
-            temps = data['hourly']['temperature_2m']
+        try:
+            with metrics.timer("api"):
+                times, temps = default_store.hourly_temperature(lat, lon, days)
+            status_code = 200
+        except requests.HTTPError as error:
+            status_code = error.response.status_code
+
+        if status_code == 200:
+            # 2. Procesar los datos
+            # times es un array de horas (datetime64)
+            # temps es un array de temperaturas (NaN en las horas sin dato)
             
             # Estadísticas simples
-            temp_max = max(temps)
-            temp_min = min(temps)
-            temp_avg = sum(temps) / len(temps)
+            temp_max = float(np.nanmax(temps))
+            temp_min = float(np.nanmin(temps))
+            temp_avg = float(np.nanmean(temps))
             
             info_mensaje = f"Temp Máx: {temp_max}°C | Temp Mín: {temp_min}°C | Promedio: {temp_avg:.2f}°C"
 
             # 3. Crear la gráfica
-            fig.add_trace(go.Scatter(
-                x=times,
-                y=temps,
-                mode="lines",
-                name="Temperatura",
-                line=dict(color="#ff7f50", width=3),
-                fill='tozeroy' # Relleno debajo de la linea
-            ))
-
-            fig.update_layout(
-                title=dict(
-                    text=f"<b>Temperatura en Lat:{lat}, Lon:{lon}</b>",
-                    x=0.5
-                ),
-                xaxis_title="Tiempo",
-                yaxis_title="Temperatura (°C)",
-                paper_bgcolor="lightyellow",
-                plot_bgcolor="white",
-                hovermode="x unified"
-            )
-            
-            fig.update_xaxes(
-                showgrid=True, gridwidth=1, gridcolor="lightgray",
-                showline=True, linecolor="black"
-            )
-            fig.update_yaxes(
-                showgrid=True, gridwidth=1, gridcolor="lightgray",
-                showline=True, linecolor="black"
+            x, y = decimate(times, temps, metodo="minmax")
+            fig = figure_dict(
+                [line_trace(x, y, "Temperatura", "#ff7f50", ancho=3,
+                            fill='tozeroy')],  # Relleno debajo de la linea
+                tema="clima", titulo=f"Temperatura en Lat:{lat}, Lon:{lon}",
+                x_titulo="Tiempo", y_titulo="Temperatura (°C)", hovermode="x unified",
             )
 
         else:
-            info_mensaje = f"Error en la API: Código {response.status_code}"
+            info_mensaje = f"Error en la API: Código {status_code}"
 
     except Exception as e:
         info_mensaje = f"Error de conexión o procesamiento: {str(e)}"
         # Gráfica vacía en caso de error
-        fig.update_layout(
-            paper_bgcolor="lightyellow",
-            plot_bgcolor="white"
-        )
+        fig = figure_dict([], tema="clima")
 
     return fig, info_mensaje
\ No newline at end of file
@@ -0,0 +1,188 @@
+import threading
+import uuid
+from collections import OrderedDict
+
+import dash
+from dash import html, dcc, callback, Input, Output, State, ctx, no_update, Patch
+import numpy as np
+from models.particle_life import ParticleLife
+from utils.figures import THEMES, encode_array, figure_dict
+
+dash.register_page(__name__, path="/particulas", name="Particle Life")
+
+MAX_PARTICULAS = 100_000
+MAX_PASOS_CUADRO = 20
+# Un radio menor hace una malla de (2 / radio)² celdas: 1e-4 ya serían 4e8
+MIN_RADIO, MAX_RADIO = 0.005, 1.0
+# Pares candidatos por cuadro (~80 ns cada uno): cada cuadro corre en el hilo de la
+# petición, así que los pasos por cuadro se reducen según las partículas y el radio,
+# y no se crea una simulación cuyo solo paso ya supere el presupuesto
+PRESUPUESTO_PARES = 2_000_000
+# Partículas dibujadas por cuadro; con más se muestra una submuestra fija
+MAX_PUNTOS = 20_000
+# Simulaciones vivas en este proceso (una por pestaña); la más antigua se descarta.
+# Los cuadros de una sesión deben llegar al mismo proceso: gunicorn usa un solo
+# worker (ver gunicorn.conf.py)
+MAX_SESIONES = 8
+COLORES = ["rgb(255,130,51)", "rgb(51,153,255)", "rgb(204,25,77)",
+           "rgb(51,204,77)", "rgb(153,77,204)", "rgb(255,255,51)"]
+
+_simulaciones = OrderedDict()
+_candado = threading.Lock()
+
+layout = html.Div([
+    html.Div([
+        html.H2("Particle Life en el servidor", className="title"),
+        html.P("Las mismas reglas del sketch de la página de inicio, calculadas con NumPy. "
+               "Cada cuadro avanza la simulación en el servidor y envía solo las posiciones.",
+               style={'color': 'gray', 'fontSize': '14px'}),
+        html.Div([
+            html.Label("Partículas = "),
+            dcc.Input(id="particulas-n", type="number", value=1000, min=1, max=MAX_PARTICULAS,
+                      className="input-field")
+        ]),
+        html.Div([
+            html.Label("Radio de interacción = "),
+            dcc.Input(id="particulas-radio", type="number", value=0.15, step=0.005, min=MIN_RADIO, max=MAX_RADIO,
+                      className="input-field")
+        ]),
+        html.Div([
+            html.Label("Semilla = "),
+            dcc.Input(id="particulas-semilla", type="number", value=2, className="input-field")
+        ]),
+        html.Div([
+            html.Label("Pasos por cuadro = "),
+            dcc.Input(id="particulas-pasos", type="number", value=2, min=1, max=MAX_PASOS_CUADRO,
+                      className="input-field")
+        ]),
+        html.Button("Reiniciar", id="btn-particulas"),
+        html.Button("Pausar / continuar", id="btn-particulas-pausa"),
+        dcc.Store(id="sesion-particulas"),
+        dcc.Interval(id="cuadro-particulas", interval=150, disabled=True),
+        html.Div(id="estado-particulas"),
+    ], className="contain-left"),
+    html.Div([
+        html.H2("Partículas", className="title"),
+        dcc.Graph(id="grafica-particulas", style={"height": "600px", "width": "100%"}),
+        dcc.Graph(id="grafica-particulas-stats", style={"height": "300px", "width": "100%"}),
+    ], className="contain-right")
+], className="page-container")
+
+
+def _visibles(sim):
+    """Índices dibujados: todos, o una submuestra fija para que cada punto siga a la misma partícula."""
+    n = len(sim.posicion)
+    return np.arange(n) if n <= MAX_PUNTOS else np.linspace(0, n - 1, MAX_PUNTOS).astype(np.intp)
+
+
+def _posiciones(sim):
+    """(x, y) por clase de las partículas visibles."""
+    visibles = _visibles(sim)
+    clase = sim.clase[visibles]
+    # Tres decimales bastan en pantalla y reducen el JSON de cada cuadro a la mitad
+    pos = np.round(sim.posicion[visibles], 3)
+    return [(pos[clase == k, 0], pos[clase == k, 1]) for k in range(len(sim.matriz))]
+
+
+@callback(
+    Output("grafica-particulas", "figure"),
+    Output("grafica-particulas-stats", "figure"),
+    Output("grafica-particulas-stats", "extendData"),
+    Output("sesion-particulas", "data"),
+    Output("cuadro-particulas", "disabled"),
+    Output("estado-particulas", "children"),
+    Input("btn-particulas", "n_clicks"),
+    Input("btn-particulas-pausa", "n_clicks"),
+    Input("cuadro-particulas", "n_intervals"),
+    State("sesion-particulas", "data"),
+    State("cuadro-particulas", "disabled"),
+    State("particulas-n", "value"),
+    State("particulas-radio", "value"),
+    State("particulas-semilla", "value"),
+    State("particulas-pasos", "value"),
+    prevent_initial_call=False
+)
+def animar_particulas(n_clicks, n_pausa, n_intervals, sesion, pausado, n, radio, semilla, pasos):
+    if ctx.triggered_id == "btn-particulas-pausa":
+        if sesion not in _simulaciones:
+            return no_update, no_update, no_update, no_update, True, "Pulse Reiniciar"
+        return no_update, no_update, no_update, no_update, not pausado, "En pausa" if not pausado else ""
+
+    if ctx.triggered_id == "cuadro-particulas":
+        with _candado:
+            entrada = _simulaciones.get(sesion)
+        if entrada is None:
+            # Sesión descartada o atendida por otro proceso del servidor
+            return no_update, no_update, no_update, no_update, True, "Simulación no encontrada: pulse Reiniciar"
+        sim, candado = entrada
+        # Si el cuadro anterior sigue calculándose, se salta este
+        if not candado.acquire(blocking=False):
+            return (no_update,) * 6
+        try:
+            sim.step(pasos=pasos_por_cuadro(sim, pasos))
+            figura = Patch()
+            for k, (x, y) in enumerate(_posiciones(sim)):
+                figura["data"][k]["x"] = encode_array(x)
+                figura["data"][k]["y"] = encode_array(y)
+            stats = sim.stats()
+        finally:
+            candado.release()
+        extension = ({"x": [[stats["tiempo"]], [stats["tiempo"]]],
+                      "y": [[stats["velocidad_media"]], [stats["vecinos_medios"]]]}, [0, 1], 2000)
+        return figura, no_update, extension, no_update, no_update, f"Paso {stats['paso']}"
+
+    if None in (n, radio, semilla) or not 1 <= n <= MAX_PARTICULAS:
+        return figure_dict([], tema="particulas"), figura_stats(), no_update, sesion, True, \
+            f"Complete todos los campos (hasta {MAX_PARTICULAS:,} partículas)"
+    radio = min(max(float(radio), MIN_RADIO), MAX_RADIO)
+    sim = ParticleLife(n=int(n), semilla=int(semilla), radio=radio)
+    if sim.candidate_pairs() > PRESUPUESTO_PARES:
+        return figure_dict([], tema="particulas"), figura_stats(), no_update, sesion, True, \
+            "Demasiadas interacciones por paso: reduzca las partículas o el radio"
+    sesion = sesion or uuid.uuid4().hex
+    with _candado:
+        _simulaciones[sesion] = (sim, threading.Lock())
+        _simulaciones.move_to_end(sesion)
+        while len(_simulaciones) > MAX_SESIONES:
+            _simulaciones.popitem(last=False)
+    estado = "" if n <= MAX_PUNTOS else f"Se dibujan {MAX_PUNTOS:,} de {int(n):,} partículas"
+    return figura_particulas(sim), figura_stats(), no_update, sesion, False, estado
+
+
+def pasos_por_cuadro(sim, pasos):
+    """Pasos pedidos, reducidos para que el cuadro no supere PRESUPUESTO_PARES (al menos uno)."""
+    pedidos = min(max(int(pasos or 1), 1), MAX_PASOS_CUADRO)
+    return max(1, min(pedidos, PRESUPUESTO_PARES // max(sim.candidate_pairs(), 1)))
+
+
+def figura_particulas(sim):
+    trazas = [
+        {"type": "scattergl", "mode": "markers", "name": f"Clase {k + 1}",
+         "x": encode_array(x), "y": encode_array(y),
+         "marker": {"color": COLORES[k % len(COLORES)], "size": 3}, "hoverinfo": "skip"}
+        for k, (x, y) in enumerate(_posiciones(sim))
+    ]
+    return figure_dict(
+        trazas, tema="particulas",
+        uirevision="particulas",
+        margin=dict(l=40, r=20, t=30, b=40),
+        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1),
+        xaxis=dict(range=[-1, 1]),
+        yaxis=dict(range=[-1, 1], scaleanchor="x", scaleratio=1),
+    )
+
+
+def figura_stats():
+    # Listas vacías y no typed arrays: extendData agrega un punto por cuadro
+    return figure_dict(
+        [{"type": "scatter", "mode": "lines", "x": [], "y": [], "name": 'Velocidad media',
+          "line": {"color": 'blue', "width": 2}},
+         {"type": "scatter", "mode": "lines", "x": [], "y": [], "name": 'Vecinos medios',
+          "line": {"color": 'red', "width": 2}, "yaxis": 'y2'}],
+        tema="casos",
+        x_titulo="Tiempo",
+        y_titulo="Velocidad media",
+        yaxis2=dict(THEMES["casos"]["ejes"], title=dict(text="Vecinos en el radio"), overlaying='y', side='right'),
+        margin=dict(l=60, r=60, t=30, b=40),
+        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1),
+    )
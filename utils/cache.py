@@ -0,0 +1,261 @@
+"""
+Caché de resultados de simulación.
+
+Las simulaciones de las páginas son funciones puras de sus parámetros, así
+que su resultado se guarda con una clave canónica construida a partir de
+esos parámetros. La caché en memoria está acotada en bytes con desalojo LRU
+y, opcionalmente, se respalda en un directorio local compartido entre los
+workers de gunicorn que sobrevive a los reinicios. El directorio también está
+acotado: al superar su límite se borran los archivos usados hace más tiempo
+(por fecha de modificación, que se renueva en cada lectura).
+
+Configuración por variables de entorno:
+
+    TECDEMODEL_CACHE_MB       tamaño máximo en memoria (por defecto 64)
+    TECDEMODEL_CACHE_DIR      directorio del almacenamiento en disco (opcional)
+    TECDEMODEL_CACHE_DISK_MB  tamaño máximo del directorio (por defecto 512)
+"""
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from utils import metrics
+
+
+def _canonical(valor):
+    """Forma canónica y hashable de un parámetro (1000 y 1000.0 coinciden)."""
+    if valor is None or isinstance(valor, (bool, str)):
+        return valor
+    if isinstance(valor, (int, float, np.integer, np.floating)):
+        return float(f"{float(valor):.12g}")
+    if isinstance(valor, np.ndarray):
+        contenido = hashlib.sha256(np.ascontiguousarray(valor).tobytes()).hexdigest()
+        return ("ndarray", valor.dtype.str, valor.shape, contenido)
+    if isinstance(valor, (list, tuple)):
+        return tuple(_canonical(v) for v in valor)
+    if isinstance(valor, dict):
+        return tuple(sorted((str(k), _canonical(v)) for k, v in valor.items()))
+    raise TypeError(f"Parámetro no cacheable: {type(valor).__name__}")
+
+
+def canonical_key(func, args, kwargs):
+    """Clave (nombre de la función, parámetros canónicos en orden de firma)."""
+    ligados = inspect.signature(func).bind(*args, **kwargs)
+    ligados.apply_defaults()
+    nombre = f"{func.__module__}.{func.__qualname__}"
+    return (nombre,) + tuple((p, _canonical(v)) for p, v in ligados.arguments.items())
+
+
+def _size(valor):
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    if isinstance(valor, (list, tuple)):
+        return sum(_size(v) for v in valor) + sys.getsizeof(valor)
+    if isinstance(valor, dict):
+        return sum(_size(v) for v in valor.values()) + sys.getsizeof(valor)
+    return sys.getsizeof(valor)
+
+
+def _freeze(valor):
+    """Marca los arrays como de solo lectura: el resultado se comparte entre llamadas."""
+    if isinstance(valor, np.ndarray):
+        valor.flags.writeable = False
+    elif isinstance(valor, (list, tuple)):
+        for v in valor:
+            _freeze(v)
+    elif isinstance(valor, dict):
+        for v in valor.values():
+            _freeze(v)
+    return valor
+
+
+class SimulationCache:
+    """
+    Caché LRU acotada por memoria con respaldo opcional en disco.
+
+    Parámetros:
+    -----------
+    max_bytes : int
+        Tamaño máximo aproximado de los resultados en memoria
+    directorio : str, opcional
+        Directorio para persistir los resultados (un archivo por clave)
+    max_bytes_disco : int
+        Tamaño máximo aproximado del directorio
+    """
+
+    def __init__(self, max_bytes=64 * 2**20, directorio=None, max_bytes_disco=512 * 2**20):
+        self.max_bytes = max_bytes
+        self.directorio = directorio
+        self.max_bytes_disco = max_bytes_disco
+        self._entradas = OrderedDict()
+        self._bytes = 0
+        self._bytes_disco = 0
+        self._lock = threading.RLock()
+        self._contadores = {"hits": 0, "misses": 0, "disk_hits": 0, "evictions": 0, "disk_evictions": 0}
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+            # Lo que dejó una ejecución anterior cuenta desde el inicio
+            self._podar_disco()
+
+    def _ruta(self, clave):
+        nombre = hashlib.sha256(repr(clave).encode()).hexdigest()
+        return os.path.join(self.directorio, f"{nombre}.pkl")
+
+    def get(self, clave):
+        """Retorna (encontrado, valor)."""
+        with self._lock:
+            if clave in self._entradas:
+                self._entradas.move_to_end(clave)
+                self._contadores["hits"] += 1
+                return True, self._entradas[clave][0]
+
+        if self.directorio:
+            ruta = self._ruta(clave)
+            try:
+                with open(ruta, "rb") as archivo:
+                    valor = pickle.load(archivo)
+                # Usado ahora: es de los últimos en borrarse al podar
+                os.utime(ruta)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+            else:
+                self._guardar_en_memoria(clave, _freeze(valor))
+                with self._lock:
+                    self._contadores["disk_hits"] += 1
+                return True, valor
+
+        with self._lock:
+            self._contadores["misses"] += 1
+        return False, None
+
+    def set(self, clave, valor):
+        valor = _freeze(valor)
+        self._guardar_en_memoria(clave, valor)
+        if self.directorio:
+            # Escritura atómica: otro worker nunca lee un archivo a medias
+            descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix=".tmp")
+            try:
+                with os.fdopen(descriptor, "wb") as archivo:
+                    pickle.dump(valor, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+                    escritos = archivo.tell()
+                os.replace(temporal, self._ruta(clave))
+            except OSError:
+                if os.path.exists(temporal):
+                    os.remove(temporal)
+            else:
+                with self._lock:
+                    self._bytes_disco += escritos
+                    podar = self._bytes_disco > self.max_bytes_disco
+                if podar:
+                    self._podar_disco()
+        return valor
+
+    def _podar_disco(self):
+        """Borra los archivos usados hace más tiempo hasta dejar el directorio en el 90 % del límite."""
+        archivos, total = [], 0
+        ahora = time.time()
+        for entrada in os.scandir(self.directorio):
+            try:
+                info = entrada.stat()
+            except OSError:
+                continue
+            if entrada.name.endswith(".pkl"):
+                archivos.append((info.st_mtime, info.st_size, entrada.path))
+                total += info.st_size
+            elif entrada.name.endswith(".tmp") and ahora - info.st_mtime > 3600:
+                # Temporal de una escritura interrumpida
+                try:
+                    os.remove(entrada.path)
+                except OSError:
+                    pass
+        borrados = 0
+        if total > self.max_bytes_disco:
+            for _, tamano, ruta in sorted(archivos):
+                if total <= 0.9 * self.max_bytes_disco:
+                    break
+                try:
+                    os.remove(ruta)
+                except OSError:
+                    continue
+                total -= tamano
+                borrados += 1
+        # Otros procesos comparten el directorio: el recuento se rehace desde el disco
+        with self._lock:
+            self._bytes_disco = total
+            self._contadores["disk_evictions"] += borrados
+
+    def _guardar_en_memoria(self, clave, valor):
+        tamano = _size(valor)
+        if tamano > self.max_bytes:
+            return
+        with self._lock:
+            if clave in self._entradas:
+                self._bytes -= self._entradas.pop(clave)[1]
+            self._entradas[clave] = (valor, tamano)
+            self._bytes += tamano
+            while self._bytes > self.max_bytes:
+                _, (_, liberado) = self._entradas.popitem(last=False)
+                self._bytes -= liberado
+                self._contadores["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return dict(self._contadores, entries=len(self._entradas), bytes=self._bytes,
+                        max_bytes=self.max_bytes, disk=bool(self.directorio), disk_bytes=self._bytes_disco)
+
+
+simulation_cache = SimulationCache(
+    max_bytes=int(float(os.environ.get("TECDEMODEL_CACHE_MB", 64)) * 2**20),
+    directorio=os.environ.get("TECDEMODEL_CACHE_DIR") or None,
+    max_bytes_disco=int(float(os.environ.get("TECDEMODEL_CACHE_DISK_MB", 512)) * 2**20),
+)
+
+
+def cached_simulation(func=None, *, cache=None):
+    """
+    Decorador que memoriza una función de simulación pura.
+
+    La clave es el nombre de la función más sus parámetros canonicalizados.
+    Los arrays del resultado quedan en solo lectura porque se comparten entre
+    llamadas. Las excepciones no se guardan.
+    """
+    if func is None:
+        return functools.partial(cached_simulation, cache=cache)
+
+    @functools.wraps(func)
+    def envoltura(*args, **kwargs):
+        almacen = cache or simulation_cache
+        clave = canonical_key(func, args, kwargs)
+        encontrado, valor = almacen.get(clave)
+        if encontrado:
+            return valor
+        inicio = time.perf_counter()
+        valor = func(*args, **kwargs)
+        metrics.SOLVER_SECONDS.observe(time.perf_counter() - inicio, funcion=f"{func.__module__}.{func.__qualname__}")
+        return almacen.set(clave, valor)
+
+    def lookup(*args, **kwargs):
+        """(encontrado, valor) sin ejecutar la simulación."""
+        return (cache or simulation_cache).get(canonical_key(func, args, kwargs))
+
+    def store(valor, *args, **kwargs):
+        """Guarda un resultado calculado en otro lado (p. ej. en un proceso hijo)."""
+        return (cache or simulation_cache).set(canonical_key(func, args, kwargs), valor)
+
+    envoltura.lookup = lookup
+    envoltura.store = store
+    return envoltura
@@ -0,0 +1,128 @@
+"""
+Reducción de series antes de enviarlas al navegador.
+
+El navegador no puede mostrar más puntos que píxeles tiene la gráfica, pero
+cada muestra del integrador viaja en el JSON de la figura. `decimate` se
+aplica a (x, y) justo antes de crear la traza y acota su tamaño sin
+importar la resolución de la simulación, conservando la forma de la curva:
+
+- "lttb" (Largest-Triangle-Three-Buckets): en cada tramo elige el punto que
+  forma el triángulo de mayor área con el punto elegido en el tramo anterior
+  y el promedio del siguiente. Conserva picos y cambios de pendiente.
+- "minmax": en cada tramo conserva el mínimo y el máximo (dos puntos por
+  tramo). Es totalmente vectorizado y adecuado para series ruidosas, donde
+  importa la envolvente.
+
+Configuración: TECDEMODEL_MAX_PUNTOS (puntos por traza, por defecto 1000).
+"""
+import os
+
+import numpy as np
+
+
+MAX_PUNTOS = int(os.environ.get("TECDEMODEL_MAX_PUNTOS", 1000))
+
+
+def _limites(n, tramos):
+    """Índices de inicio de `tramos` tramos casi iguales sobre los puntos 1..n-2."""
+    return 1 + (np.arange(tramos + 1) * (n - 2)) // tramos
+
+
+def lttb(x, y, objetivo):
+    """
+    Índices elegidos por Largest-Triangle-Three-Buckets.
+
+    Parámetros:
+    -----------
+    x, y : np.ndarray
+        Serie con x creciente
+    objetivo : int
+        Número de puntos de salida (≥ 3); se conservan el primero y el último
+
+    Retorna:
+    --------
+    indices : np.ndarray
+        Índices crecientes de los puntos conservados
+    """
+    n = len(x)
+    if objetivo >= n or objetivo < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    tramos = objetivo - 2
+    limites = _limites(n, tramos)
+    # Promedio de cada tramo de una sola vez; el "tramo" siguiente al último es el punto final
+    conteo = np.diff(limites)
+    promedio_x = np.append(np.add.reduceat(x[1:n - 1], limites[:-1] - 1) / conteo, x[-1])
+    promedio_y = np.append(np.add.reduceat(y[1:n - 1], limites[:-1] - 1) / conteo, y[-1])
+
+    indices = np.empty(objetivo, dtype=np.intp)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(tramos):
+        inicio, fin = limites[i], limites[i + 1]
+        cx, cy = promedio_x[i + 1], promedio_y[i + 1]
+        xa, ya = x[a], y[a]
+        # Doble del área del triángulo (a, b, c) para cada candidato b del tramo
+        area = np.abs((xa - cx) * (y[inicio:fin] - ya) - (xa - x[inicio:fin]) * (cy - ya))
+        a = inicio + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+def minmax(y, objetivo):
+    """
+    Índices del mínimo y el máximo de cada tramo (más el primer y el último punto).
+
+    Los NaN no se eligen salvo en tramos donde todo es NaN, de modo que los
+    huecos de la serie se mantienen.
+    """
+    n = len(y)
+    tramos = max((objetivo - 2) // 2, 1)
+    if objetivo >= n or n < 3:
+        return np.arange(n)
+    y = np.asarray(y, dtype=float)
+    # Tramos de igual tamaño: se rellena con NaN hasta completar la última fila
+    ancho = -(-(n - 2) // tramos)
+    relleno = np.full(tramos * ancho, np.nan)
+    relleno[:n - 2] = y[1:n - 1]
+    filas = relleno.reshape(tramos, ancho)
+    nan = np.isnan(filas)
+    i_min = np.argmin(np.where(nan, np.inf, filas), axis=1)
+    i_max = np.argmax(np.where(nan, -np.inf, filas), axis=1)
+    base = 1 + np.arange(tramos) * ancho
+    elegidos = np.concatenate([[0], base + np.minimum(i_min, i_max), base + np.maximum(i_min, i_max), [n - 1]])
+    return np.unique(elegidos[elegidos < n])
+
+
+def decimate(x, y, objetivo=None, metodo="lttb"):
+    """
+    Reduce la serie (x, y) a lo sumo a `objetivo` puntos.
+
+    Parámetros:
+    -----------
+    x, y : array_like
+        Serie a dibujar, con x creciente (números o fechas)
+    objetivo : int, opcional
+        Puntos máximos; por defecto MAX_PUNTOS
+    metodo : str
+        "lttb" o "minmax"
+
+    Retorna:
+    --------
+    (x, y) : tuple of np.ndarray
+        La serie reducida (la original si ya es suficientemente corta)
+    """
+    objetivo = MAX_PUNTOS if objetivo is None else int(objetivo)
+    x, y = np.asarray(x), np.asarray(y)
+    if len(x) <= objetivo:
+        return x, y
+    if metodo == "lttb":
+        # Las fechas se comparan como números para calcular áreas
+        numerico = x.astype("datetime64[ns]").astype(np.int64) if np.issubdtype(x.dtype, np.datetime64) else x
+        indices = lttb(numerico, y, objetivo)
+    elif metodo == "minmax":
+        indices = minmax(y, objetivo)
+    else:
+        raise ValueError(f"Método desconocido: {metodo}")
+    return x[indices], y[indices]
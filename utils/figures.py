@@ -0,0 +1,243 @@
+"""
+Utilidades compartidas para construir figuras.
+
+Las figuras de los callbacks se arman como diccionarios planos en lugar de
+`go.Figure`: así no pasan por la validación de propiedades de Plotly (que
+recorre cada traza y cada array) ni incluyen la plantilla por defecto
+(~6.5 kB por respuesta). Los arrays viajan como "typed arrays" de plotly.js
+({"dtype": "f8", "bdata": <base64>}), sin convertirlos a listas de JSON.
+
+Los estilos que se repetían en cada página (fondo, cuadrícula, ejes con
+marco) están en `THEMES`; `figure_dict` los aplica por nombre.
+"""
+import base64
+
+import numpy as np
+from plotly.colors import sample_colorscale
+
+
+# dtype de NumPy -> dtype de los typed arrays de plotly.js
+_TIPOS = {
+    np.dtype(np.float64): "f8", np.dtype(np.float32): "f4",
+    np.dtype(np.int8): "i1", np.dtype(np.uint8): "u1",
+    np.dtype(np.int16): "i2", np.dtype(np.uint16): "u2",
+    np.dtype(np.int32): "i4", np.dtype(np.uint32): "u4",
+}
+
+_EJES_CUADRICULA = dict(
+    showgrid=True, gridwidth=1, gridcolor="lightpink",
+    zeroline=True, zerolinewidth=2, zerolinecolor="red",
+    showline=True, linecolor="black", linewidth=2, mirror=True,
+)
+_EJES_MARCO = dict(showline=True, linecolor="black", linewidth=2, mirror=True)
+
+THEMES = {
+    # Clases 6 y 7 y la epidemia de aplicaciones
+    "sir": dict(layout=dict(paper_bgcolor="lightcyan", plot_bgcolor="white"), ejes=_EJES_CUADRICULA),
+    # Campo vectorial (clase 5)
+    "campo": dict(layout=dict(paper_bgcolor="lightyellow", plot_bgcolor="white"), ejes=_EJES_CUADRICULA),
+    # Casos de aplicaciones: marco negro y cuadrícula gris
+    "casos": dict(layout=dict(paper_bgcolor="lightcyan", plot_bgcolor="white"),
+                  ejes=dict(_EJES_MARCO, showgrid=True, gridcolor="lightgray")),
+    # Solo el marco (mapas de calor, comparaciones)
+    "marco": dict(layout=dict(paper_bgcolor="lightcyan", plot_bgcolor="white"), ejes=_EJES_MARCO),
+    # Crecimiento logístico (clases 3 y 4)
+    "logistica": dict(layout=dict(paper_bgcolor="#e8f0ff", plot_bgcolor="white", font=dict(family="Outfit", size=12),
+                                  margin=dict(l=40, r=40, t=60, b=40)),
+                      ejes=dict(gridcolor="lightgray", zeroline=True, zerolinecolor="red")),
+    # Series de temperatura (clase 8)
+    "clima": dict(layout=dict(paper_bgcolor="lightyellow", plot_bgcolor="white"),
+                  ejes=dict(showgrid=True, gridwidth=1, gridcolor="lightgray", showline=True, linecolor="black")),
+    # Partículas sobre fondo negro, sin cuadrícula
+    "particulas": dict(layout=dict(paper_bgcolor="lightcyan", plot_bgcolor="black"),
+                       ejes=dict(showgrid=False, zeroline=False)),
+}
+
+# Colores de la plantilla "plotly", que las figuras dict no incluyen
+_COLORES = ["#636efa", "#EF553B", "#00cc96", "#ab63fa", "#FFA15A",
+            "#19d3f3", "#FF6692", "#B6E880", "#FF97FF", "#FECB52"]
+
+
+def encode_array(valores):
+    """
+    Array como typed array de plotly.js, {"dtype", "bdata"[, "shape"]}.
+
+    Los enteros de 64 bits (que plotly.js no admite) se envían como f8; las
+    fechas y los valores no numéricos se envían como lista.
+    """
+    valores = np.asarray(valores)
+    if np.issubdtype(valores.dtype, np.datetime64):
+        return np.datetime_as_string(valores).tolist()
+    if valores.dtype == np.bool_:
+        valores = valores.astype(np.uint8)
+    elif valores.dtype not in _TIPOS:
+        if not np.issubdtype(valores.dtype, np.number):
+            return valores.tolist()
+        valores = valores.astype(np.float64)
+    codificado = {
+        "dtype": _TIPOS[valores.dtype],
+        "bdata": base64.b64encode(np.ascontiguousarray(valores).tobytes()).decode("ascii"),
+    }
+    if valores.ndim > 1:
+        codificado["shape"] = ", ".join(map(str, valores.shape))
+    return codificado
+
+
+def line_trace(x, y, nombre=None, color=None, ancho=2, webgl=False, **props):
+    """
+    Traza de líneas como diccionario.
+
+    Parámetros:
+    -----------
+    x, y : array_like
+        Datos de la traza (se codifican en base64)
+    nombre : str, opcional
+        Nombre en la leyenda
+    color : str, opcional
+        Color de la línea
+    ancho : float
+        Grosor de la línea
+    webgl : bool
+        Usar "scattergl"
+    **props
+        Otras propiedades de la traza (mode, hovertemplate, fill, line, ...)
+    """
+    traza = {"type": "scattergl" if webgl else "scatter", "mode": "lines",
+             "x": encode_array(x), "y": encode_array(y)}
+    if nombre is not None:
+        traza["name"] = nombre
+    linea = {"width": ancho}
+    if color is not None:
+        linea["color"] = color
+    traza["line"] = dict(linea, **props.pop("line", {}))
+    traza.update(props)
+    return traza
+
+
+def figure_dict(trazas, tema="sir", titulo=None, x_titulo=None, y_titulo=None, **layout):
+    """
+    Figura completa como diccionario, lista para la propiedad `figure` de dcc.Graph.
+
+    Parámetros:
+    -----------
+    trazas : list of dict
+        Trazas (por ejemplo de `line_trace`)
+    tema : str
+        Clave de THEMES con el fondo y el estilo de los ejes
+    titulo : str, opcional
+        Título centrado, en negrita
+    x_titulo, y_titulo : str, opcional
+        Títulos de los ejes
+    **layout
+        Propiedades adicionales del layout; `xaxis` y `yaxis` se combinan con
+        el estilo del tema en lugar de reemplazarlo
+    """
+    estilo = THEMES[tema]
+    xaxis = dict(estilo["ejes"], **layout.pop("xaxis", {}))
+    yaxis = dict(estilo["ejes"], **layout.pop("yaxis", {}))
+    if x_titulo is not None:
+        xaxis["title"] = {"text": x_titulo}
+    if y_titulo is not None:
+        yaxis["title"] = {"text": y_titulo}
+    figura_layout = dict(estilo["layout"], colorway=_COLORES, xaxis=xaxis, yaxis=yaxis)
+    if titulo is not None:
+        figura_layout["title"] = dict(text=f"<b>{titulo}</b>", x=0.5, font=dict(size=16, color="darkblue"))
+    figura_layout.update(layout)
+    return {"data": list(trazas), "layout": figura_layout}
+
+
+def reference_line(valor, texto=None, vertical=False, color="red", dash="dot"):
+    """
+    Línea de referencia de borde a borde, como `fig.add_hline` / `fig.add_vline`.
+
+    Retorna (forma, anotacion) para las listas `shapes` y `annotations` del
+    layout; la anotación es None si no hay texto. La etiqueta va arriba a la
+    derecha de una línea horizontal y arriba a la izquierda de una vertical.
+    """
+    linea = dict(color=color, dash=dash)
+    if vertical:
+        forma = dict(type="line", xref="x", x0=valor, x1=valor, yref="y domain", y0=0, y1=1, line=linea)
+        anotacion = dict(text=texto, showarrow=False, xref="x", x=valor, xanchor="right",
+                         yref="y domain", y=1, yanchor="top")
+    else:
+        forma = dict(type="line", xref="x domain", x0=0, x1=1, yref="y", y0=valor, y1=valor, line=linea)
+        anotacion = dict(text=texto, showarrow=False, xref="x domain", x=1, xanchor="right",
+                         yref="y", y=valor, yanchor="bottom")
+    return forma, (anotacion if texto is not None else None)
+
+
+def vector_field_traces(X, Y, fx, fy, escala=1.0, niveles=6, webgl=False, colorscale="Viridis"):
+    """
+    Trazas de un campo vectorial construidas con operaciones vectorizadas.
+
+    En lugar de una traza por flecha, los segmentos se agrupan por nivel de
+    magnitud en unas pocas trazas de líneas separadas por NaN, y las puntas
+    se dibujan en una sola traza de marcadores orientados y coloreados por
+    magnitud. El número de trazas no depende del tamaño de la malla.
+
+    Parámetros:
+    -----------
+    X, Y : np.ndarray
+        Coordenadas de la malla
+    fx, fy : np.ndarray
+        Componentes del campo en cada punto de la malla
+    escala : float
+        Factor de longitud de las flechas (1.0 dibuja el vector tal cual)
+    niveles : int
+        Número de trazas de líneas (bandas de magnitud)
+    webgl : bool
+        Usar "scattergl" (recomendado para mallas grandes)
+    colorscale : str
+        Escala de color de la magnitud
+
+    Retorna:
+    --------
+    trazas : list of dict
+        `niveles` trazas de segmentos (como máximo) y una de puntas
+    """
+    x0, y0 = np.ravel(X).astype(float), np.ravel(Y).astype(float)
+    u = np.ravel(np.broadcast_to(fx, np.shape(X))) * escala
+    v = np.ravel(np.broadcast_to(fy, np.shape(Y))) * escala
+
+    magnitud = np.hypot(u, v) / escala
+    validos = np.isfinite(magnitud)
+    x0, y0, u, v, magnitud = x0[validos], y0[validos], u[validos], v[validos], magnitud[validos]
+    if magnitud.size == 0:
+        return []
+
+    mag_min, mag_max = magnitud.min(), magnitud.max()
+    rango = mag_max - mag_min or 1.0
+    banda = np.minimum(((magnitud - mag_min) / rango * niveles).astype(int), niveles - 1)
+    colores = sample_colorscale(colorscale, (np.arange(niveles) + 0.5) / niveles)
+
+    trazas = []
+    for nivel in range(niveles):
+        en_banda = banda == nivel
+        if not en_banda.any():
+            continue
+        # Segmentos [inicio, fin, NaN] intercalados en una sola traza
+        xs = np.column_stack((x0[en_banda], x0[en_banda] + u[en_banda], np.full(en_banda.sum(), np.nan)))
+        ys = np.column_stack((y0[en_banda], y0[en_banda] + v[en_banda], np.full(en_banda.sum(), np.nan)))
+        trazas.append(line_trace(
+            xs.ravel(), ys.ravel(),
+            color=colores[nivel],
+            webgl=webgl,
+            hoverinfo="skip",
+            showlegend=False,
+        ))
+
+    # Ángulo del marcador: 0° apunta hacia arriba y crece en sentido horario
+    angulo = np.degrees(np.arctan2(u, v))
+    trazas.append(dict(
+        type="scattergl" if webgl else "scatter",
+        x=encode_array(x0 + u), y=encode_array(y0 + v),
+        mode="markers",
+        marker=dict(
+            symbol="triangle-up", size=8, angle=encode_array(angulo),
+            color=encode_array(magnitud), colorscale=colorscale, cmin=float(mag_min), cmax=float(mag_max),
+            showscale=True, colorbar=dict(title=dict(text="|F|")),
+        ),
+        hovertemplate="|F| = %{marker.color:.2f}<extra></extra>",
+        showlegend=False,
+    ))
+    return trazas
@@ -0,0 +1,530 @@
+"""
+Ejecutor local de trabajos en procesos hijos.
+
+Las simulaciones pesadas no deben correr en el hilo que atiende la petición:
+una integración larga bloquea al worker de gunicorn y, con él, al resto de
+usuarios. `JobRunner` mantiene un grupo de procesos (creados con fork, sin
+broker externo) al que los callbacks envían trabajos; la página guarda el
+identificador en un `dcc.Store` y consulta el estado con un `dcc.Interval`
+hasta que el resultado está listo.
+
+Un fork desde un proceso con varios hilos hereda los candados que esos hilos
+tenían tomados (imports, logging, reservas de memoria de C) y el hijo puede
+bloquearse. Por eso el proceso principal hace un único fork, el de un
+proceso plantilla, en `start` (gunicorn lo llama en `post_worker_init`,
+antes de que el worker gthread cree sus hilos), y es la plantilla, que
+tiene un solo hilo, la que crea los procesos de trabajo, también los que
+reemplazan a uno que venció su tiempo.
+
+- La cola de pendientes está acotada: si se llena, `submit` lanza
+  `JobQueueFull` en lugar de acumular trabajo sin límite.
+- Cada trabajo tiene un tiempo máximo; si lo excede, el proceso que lo
+  ejecuta se termina y se reemplaza por uno nuevo.
+- Las funciones se registran con `@runner.task` al importar el módulo, antes
+  de que existan los procesos: los hijos las heredan por fork y por el pipe
+  solo viajan el nombre y los argumentos.
+- Dentro de un trabajo, `report_progress(fraccion)` publica el avance.
+
+Configuración: TECDEMODEL_JOB_WORKERS (0 ejecuta los trabajos en línea),
+TECDEMODEL_JOB_QUEUE y TECDEMODEL_JOB_TIMEOUT.
+"""
+import logging
+import multiprocessing as mp
+import os
+import signal
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from multiprocessing.connection import Connection, wait
+from multiprocessing.reduction import recv_handle, send_handle
+
+from dash import dcc, html, no_update
+
+from utils import metrics, profiling, warmup
+
+logger = logging.getLogger(__name__)
+
+class JobQueueFull(RuntimeError):
+    """La cola de trabajos pendientes está llena."""
+
+
+# Solo existen dentro de un proceso hijo mientras ejecuta un trabajo
+_conexion = None
+_trabajo_actual = None
+
+
+def report_progress(fraccion, mensaje=None):
+    """Publica el avance (0 a 1) del trabajo en curso; fuera de un trabajo no hace nada."""
+    if _conexion is not None and _trabajo_actual is not None:
+        _conexion.send(("progreso", _trabajo_actual, float(fraccion), mensaje))
+
+
+def _nombre(func):
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def _trabajador(conexion, registro, heredadas):
+    global _conexion, _trabajo_actual
+    # Los extremos del padre copiados por fork impedirían detectar su cierre (EOF)
+    for otra in heredadas:
+        otra.close()
+    # Ctrl+C en desarrollo lo atiende el proceso principal
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _conexion = conexion
+    while True:
+        try:
+            tarea = conexion.recv()
+        except EOFError:
+            return
+        if tarea is None:
+            return
+        job_id, nombre, args, kwargs = tarea
+        _trabajo_actual = job_id
+        try:
+            mensaje = ("terminado", job_id, registro[nombre](*args, **kwargs))
+        except Exception as error:
+            mensaje = ("error", job_id, f"{type(error).__name__}: {error}")
+        _trabajo_actual = None
+        try:
+            conexion.send(mensaje)
+        except Exception as error:
+            # send serializa antes de escribir, así que el pipe sigue utilizable
+            conexion.send(("error", job_id, f"Resultado no serializable: {error}"))
+
+
+def _plantilla(conexion, registro, heredadas):
+    """
+    Proceso de un solo hilo que crea los procesos de trabajo.
+
+    Por cada petición "fork" devuelve el PID del hijo y, por la misma
+    conexión, el descriptor del extremo del pipe que usará el padre. Con
+    ("matar", pid) termina a ese hijo: como solo la plantilla recoge a sus
+    hijos, un PID que aún no recogió no puede pertenecer a otro proceso.
+    """
+    for otra in heredadas:
+        otra.close()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    hijos = set()
+    while True:
+        try:
+            peticion = conexion.recv()
+        except EOFError:
+            return
+        if peticion is None:
+            return
+        _recoger(hijos)
+        if peticion[0] == "matar":
+            pid = peticion[1]
+            if pid in hijos:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+                hijos.discard(pid)
+            conexion.send(True)
+            continue
+        padre, hijo = mp.Pipe()
+        pid = os.fork()
+        if pid == 0:
+            codigo = 0
+            try:
+                conexion.close()
+                padre.close()
+                _trabajador(hijo, registro, [])
+            except BaseException:
+                codigo = 1
+            finally:
+                sys.stdout.flush()
+                os._exit(codigo)
+        hijo.close()
+        hijos.add(pid)
+        conexion.send(pid)
+        send_handle(conexion, padre.fileno(), None)
+        padre.close()
+
+
+def _recoger(hijos):
+    while hijos:
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            hijos.clear()
+            return
+        if pid == 0:
+            return
+        hijos.discard(pid)
+
+
+class _Proceso:
+    def __init__(self, pid, conexion):
+        self.pid = pid
+        self.conexion = conexion
+        self.trabajo = None
+
+
+class JobRunner:
+    """
+    Grupo de procesos con cola acotada y tiempo máximo por trabajo.
+
+    Parámetros:
+    -----------
+    procesos : int
+        Procesos hijos; 0 ejecuta cada trabajo en línea dentro de `submit`
+        (también es lo que se usa si la plataforma no tiene fork)
+    max_pendientes : int
+        Trabajos que pueden esperar en cola
+    timeout : float
+        Segundos máximos de ejecución por trabajo
+    retener : float
+        Segundos que se conserva un resultado ya terminado para consultarlo
+    """
+
+    def __init__(self, procesos=2, max_pendientes=32, timeout=60.0, retener=300.0):
+        if "fork" not in mp.get_all_start_methods():
+            procesos = 0
+        self.procesos = procesos
+        self.max_pendientes = max_pendientes
+        self.timeout = timeout
+        self.retener = retener
+
+        self._registro = {}
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def task(self, func):
+        """Decorador que registra una función para poder enviarla con `submit`."""
+        self._registro[_nombre(func)] = func
+        return func
+
+    def start(self):
+        """
+        Crea el grupo de procesos de este proceso si aún no existe.
+
+        Conviene llamarla antes de que el proceso tenga otros hilos; si no,
+        el grupo se crea con el primer `submit`.
+        """
+        with self._lock:
+            self._iniciar()
+
+    def _iniciar(self):
+        # Perezoso y por PID: tras un fork (gunicorn --preload) cada proceso crea su propio grupo
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._trabajos = OrderedDict()
+        self._pendientes = deque()
+        self._procesos = []
+        self._contexto = mp.get_context("fork")
+        self._despertar, self._aviso = self._contexto.Pipe(duplex=False)
+        self._fabrica = None
+        self._completar()
+        threading.Thread(target=self._bucle, name="job-runner", daemon=True).start()
+
+    def _iniciar_plantilla(self):
+        warmup.wait_for_imports()
+        conexion, extremo = self._contexto.Pipe()
+        heredadas = [conexion, self._despertar, self._aviso, *(p.conexion for p in self._procesos)]
+        plantilla = self._contexto.Process(
+            target=_plantilla, args=(extremo, self._registro, heredadas), name="job-template", daemon=True)
+        plantilla.start()
+        extremo.close()
+        self._fabrica = (plantilla, conexion)
+
+    def _nuevo_proceso(self):
+        for intento in range(2):
+            if self._fabrica is None or not self._fabrica[0].is_alive():
+                # Solo la primera vez (o si la plantilla murió) hay un fork en este proceso
+                self._iniciar_plantilla()
+            conexion = self._fabrica[1]
+            try:
+                conexion.send(("fork",))
+                pid = conexion.recv()
+                return _Proceso(pid, Connection(recv_handle(conexion)))
+            except (EOFError, OSError):
+                if intento:
+                    raise
+                self._fabrica[0].kill()
+                conexion.close()
+                self._fabrica = None
+
+    def submit(self, func, *args, timeout=None, al_terminar=None, **kwargs):
+        """
+        Encola `func(*args, **kwargs)` y retorna el identificador del trabajo.
+
+        `al_terminar(resultado)` se llama en el proceso principal cuando el
+        trabajo termina bien (por ejemplo, para guardar el resultado en caché).
+        Lanza `JobQueueFull` si la cola está llena.
+        """
+        nombre = _nombre(func)
+        if nombre not in self._registro:
+            raise ValueError(f"{nombre} no está registrada; decórela con @runner.task")
+        with self._lock:
+            self._iniciar()
+            if len(self._pendientes) >= self.max_pendientes:
+                raise JobQueueFull(f"Hay {len(self._pendientes)} trabajos en cola")
+            job_id = uuid.uuid4().hex
+            self._trabajos[job_id] = {
+                "estado": "pendiente", "progreso": None, "mensaje": None,
+                "resultado": None, "error": None,
+                "enviado": time.monotonic(), "inicio": None, "fin": None,
+                "timeout": timeout or self.timeout,
+                "_tarea": (job_id, nombre, args, kwargs), "_al_terminar": al_terminar,
+            }
+            if self.procesos:
+                self._pendientes.append(job_id)
+                self._aviso.send(None)
+
+        if not self.procesos:
+            self._ejecutar_en_linea(job_id, func, args, kwargs)
+        return job_id
+
+    def _ejecutar_en_linea(self, job_id, func, args, kwargs):
+        with self._lock:
+            self._trabajos[job_id].update(estado="ejecutando", inicio=time.monotonic())
+        try:
+            self._finalizar(job_id, "terminado", resultado=func(*args, **kwargs))
+        except Exception as error:
+            self._finalizar(job_id, "error", error=f"{type(error).__name__}: {error}")
+
+    def status(self, job_id):
+        """
+        Estado de un trabajo, o None si no existe (o ya se descartó).
+
+        Retorna:
+        --------
+        estado : dict
+            "estado" ("pendiente", "ejecutando", "terminado", "error" o
+            "expirado"), "progreso", "mensaje", "resultado", "error",
+            "posicion" en la cola y "transcurrido" en segundos
+        """
+        with self._lock:
+            if self._pid != os.getpid() or job_id not in self._trabajos:
+                return None
+            trabajo = self._trabajos[job_id]
+            estado = {k: v for k, v in trabajo.items() if not k.startswith("_")}
+            estado["posicion"] = (self._pendientes.index(job_id) + 1
+                                  if trabajo["estado"] == "pendiente" and job_id in self._pendientes else None)
+            estado["transcurrido"] = (trabajo["fin"] or time.monotonic()) - (trabajo["inicio"] or trabajo["enviado"])
+            return estado
+
+    def cancel(self, job_id):
+        """Descarta un trabajo que aún no empezó. Retorna True si se canceló."""
+        with self._lock:
+            if self._pid != os.getpid() or job_id not in self._pendientes:
+                return False
+            self._pendientes.remove(job_id)
+            del self._trabajos[job_id]
+            return True
+
+    def _finalizar(self, job_id, estado, resultado=None, error=None):
+        with self._lock:
+            trabajo = self._trabajos.get(job_id)
+            if trabajo is None:
+                return
+            nombre = trabajo["_tarea"][1] if trabajo["_tarea"] else None
+            trabajo.update(estado=estado, resultado=resultado, error=error, fin=time.monotonic(), _tarea=None)
+            al_terminar = trabajo.pop("_al_terminar", None)
+        if estado == "terminado" and trabajo["inicio"] is not None:
+            metrics.SOLVER_SECONDS.observe(trabajo["fin"] - trabajo["inicio"], funcion=nombre)
+        if estado == "terminado" and al_terminar is not None:
+            try:
+                al_terminar(resultado)
+            except Exception:
+                pass
+
+    def _bucle(self):
+        while True:
+            try:
+                self._iteracion()
+            except Exception:
+                # Un error inesperado no debe dejar sin despachador a los trabajos en cola
+                logger.exception("Error en el despachador de trabajos")
+                time.sleep(1)
+
+    def _iteracion(self):
+        self._completar()
+        self._despachar()
+        conexiones = {p.conexion: p for p in self._procesos}
+        for lista in wait([self._despertar, *conexiones], timeout=0.25):
+            if lista is self._despertar:
+                self._despertar.recv()
+                continue
+            proceso = conexiones[lista]
+            try:
+                mensaje = lista.recv()
+            except (EOFError, OSError):
+                self._reemplazar(proceso, "error", "El proceso del trabajo terminó inesperadamente")
+                continue
+            self._recibir(proceso, mensaje)
+        self._vigilar_tiempos()
+        self._purgar()
+
+    def _completar(self):
+        # Repone los procesos que no se pudieron crear; si no queda ninguno, la cola falla en vez de esperar
+        while len(self._procesos) < self.procesos:
+            try:
+                self._procesos.append(self._nuevo_proceso())
+            except Exception:
+                logger.exception("No se pudo crear un proceso de trabajo")
+                if not self._procesos:
+                    with self._lock:
+                        pendientes = list(self._pendientes)
+                        self._pendientes.clear()
+                    for job_id in pendientes:
+                        self._finalizar(job_id, "error", error="No hay procesos de trabajo disponibles")
+                    time.sleep(1)
+                return
+
+    def _despachar(self):
+        for proceso in list(self._procesos):
+            with self._lock:
+                if proceso.trabajo is not None or not self._pendientes:
+                    continue
+                job_id = self._pendientes.popleft()
+                trabajo = self._trabajos[job_id]
+                trabajo.update(estado="ejecutando", inicio=time.monotonic())
+                proceso.trabajo = job_id
+                tarea = trabajo["_tarea"]
+            try:
+                proceso.conexion.send(tarea)
+            except OSError as error:
+                self._reemplazar(proceso, "error", f"No se pudo enviar el trabajo: {error}")
+            except Exception as error:
+                # send serializa antes de escribir: el pipe sigue utilizable
+                proceso.trabajo = None
+                self._finalizar(job_id, "error", error=f"Argumentos no serializables: {error}")
+
+    def _recibir(self, proceso, mensaje):
+        tipo, job_id, *datos = mensaje
+        if tipo == "progreso":
+            with self._lock:
+                if job_id in self._trabajos:
+                    self._trabajos[job_id].update(progreso=datos[0], mensaje=datos[1])
+            return
+        proceso.trabajo = None
+        if tipo == "terminado":
+            self._finalizar(job_id, "terminado", resultado=datos[0])
+        else:
+            self._finalizar(job_id, "error", error=datos[0])
+
+    def _vigilar_tiempos(self):
+        ahora = time.monotonic()
+        for proceso in list(self._procesos):
+            with self._lock:
+                trabajo = self._trabajos.get(proceso.trabajo)
+                vencido = trabajo is not None and ahora - trabajo["inicio"] > trabajo["timeout"]
+            if vencido:
+                self._reemplazar(proceso, "expirado", f"Superó el tiempo máximo de {trabajo['timeout']:g} s")
+
+    def _matar(self, proceso):
+        # Sin la plantilla el hijo ya no es de nadie que lo recoja y su PID podría
+        # haberse reutilizado: solo se cierra la conexión
+        if self._fabrica is None or not self._fabrica[0].is_alive():
+            return
+        try:
+            self._fabrica[1].send(("matar", proceso.pid))
+            self._fabrica[1].recv()
+        except (EOFError, OSError):
+            pass
+
+    def _reemplazar(self, proceso, estado, error):
+        self._matar(proceso)
+        proceso.conexion.close()
+        if proceso.trabajo is not None:
+            self._finalizar(proceso.trabajo, estado, error=error)
+        self._procesos.remove(proceso)
+        # Si falla, `_completar` lo vuelve a intentar en la siguiente vuelta
+        self._completar()
+
+    def _purgar(self):
+        limite = time.monotonic() - self.retener
+        with self._lock:
+            for job_id in [j for j, t in self._trabajos.items() if t["fin"] is not None and t["fin"] < limite]:
+                del self._trabajos[job_id]
+
+
+default_runner = JobRunner(
+    procesos=int(os.environ.get("TECDEMODEL_JOB_WORKERS", min(4, os.cpu_count() or 1))),
+    max_pendientes=int(os.environ.get("TECDEMODEL_JOB_QUEUE", 32)),
+    timeout=float(os.environ.get("TECDEMODEL_JOB_TIMEOUT", 60)),
+)
+
+
+def job_components(prefijo, intervalo=300):
+    """Store con el id del trabajo, Interval de sondeo y texto de estado de una página."""
+    return html.Div([
+        dcc.Store(id=f"trabajo-{prefijo}"),
+        dcc.Interval(id=f"sondeo-{prefijo}", interval=intervalo, disabled=True),
+        html.Div(id=f"estado-{prefijo}", style={"color": "gray", "fontSize": "14px"}),
+    ])
+
+
+def describe_status(estado):
+    if estado["estado"] == "pendiente":
+        return f"En cola (posición {estado['posicion']})..."
+    if estado["progreso"] is not None:
+        return f"Calculando... {estado['progreso']:.0%}"
+    return f"Calculando... {estado['transcurrido']:.0f} s"
+
+
+def follow_job(sondeo, trabajo, funcion, args, construir, runner=None):
+    """
+    Lógica común de un callback que delega una simulación al ejecutor.
+
+    Si el resultado ya está en la caché se construye la figura de inmediato;
+    si no, se envía el trabajo y el Interval sigue consultando su estado.
+
+    Parámetros:
+    -----------
+    sondeo : bool
+        True si el callback lo disparó el Interval
+    trabajo : str or None
+        Identificador guardado en el Store
+    funcion : callable
+        Función decorada con @cached_simulation cuyo original está
+        registrado con @runner.task
+    args : tuple
+        Argumentos de la simulación
+    construir : callable
+        construir(resultado) -> figura; solo se llama con un resultado. Si
+        el trabajo falla, la figura no cambia y el error va al texto de
+        estado.
+
+    Retorna:
+    --------
+    (figura, trabajo, intervalo desactivado, texto de estado)
+    """
+    runner = runner or default_runner
+    if not sondeo:
+        if trabajo:
+            # Un clic nuevo reemplaza la consulta anterior si aún no empezó
+            runner.cancel(trabajo)
+        if profiling.active():
+            # Perfil bajo demanda: se calcula aquí y sin caché para que el integrador aparezca en él.
+            # Un fallo termina igual que un trabajo con error
+            try:
+                valor = funcion.__wrapped__(*args)
+            except Exception as error:
+                return no_update, None, True, f"{type(error).__name__}: {error}"
+            funcion.store(valor, *args)
+            with metrics.timer("figura"):
+                return construir(valor), None, True, ""
+        encontrado, valor = funcion.lookup(*args)
+        if encontrado:
+            with metrics.timer("figura"):
+                return construir(valor), None, True, ""
+        try:
+            trabajo = runner.submit(funcion.__wrapped__, *args,
+                                    al_terminar=lambda resultado: funcion.store(resultado, *args))
+        except JobQueueFull:
+            return no_update, None, True, "Servidor ocupado, intente de nuevo en unos segundos"
+
+    estado = runner.status(trabajo)
+    if estado is None:
+        return no_update, None, True, "El trabajo ya no está disponible, vuelva a generar"
+    if estado["estado"] == "terminado":
+        with metrics.timer("figura"):
+            return construir(estado["resultado"]), None, True, ""
+    if estado["estado"] in ("error", "expirado"):
+        return no_update, None, True, estado["error"]
+    return no_update, trabajo, False, describe_status(estado)
@@ -0,0 +1,280 @@
+"""
+Métricas de rendimiento en el formato de texto de Prometheus.
+
+Con TECDEMODEL_METRICS=1, `init_app` envuelve cada callback de Dash y
+publica en `/metrics`:
+
+- tecdemodel_callback_seconds{callback}: tiempo total del callback.
+- tecdemodel_callback_phase_seconds{callback, fase}: "funcion" (el código
+  del callback), "respuesta" (validación y JSON de Dash, el resto del
+  total) y las fases que el código marca con `timer` ("figura", "api").
+- tecdemodel_callback_response_bytes_total{callback} y
+  tecdemodel_callback_responses_total{callback}: tamaño de las respuestas.
+- tecdemodel_callback_traces{callback}: trazas en las figuras devueltas.
+- tecdemodel_solver_seconds{funcion}: simulaciones, en línea o en los
+  procesos de `utils.jobs`.
+- tecdemodel_upstream_seconds{servicio, estado}: peticiones a APIs externas.
+
+La fase "funcion" se mide envolviendo `dash._callback._invoke_callback`,
+una función privada de Dash: solo se hace con las versiones probadas
+(DASH_PROBADO) y si la función existe; si no, se registra una advertencia
+y esa fase (y "respuesta") no se publica.
+
+Sin la variable no se envuelve nada, `/metrics` responde 404 y `timer` y
+`observe` retornan de inmediato. Cada proceso de gunicorn lleva sus propios
+contadores.
+"""
+import bisect
+import contextlib
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+
+import flask
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.environ.get("TECDEMODEL_METRICS", "0") == "1"
+
+BUCKETS_SEGUNDOS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BUCKETS_TRAZAS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+# Versiones mayores de Dash en las que `_invoke_callback(func, *args, **kwargs)` existe
+DASH_PROBADO = (3,)
+
+_local = threading.local()  # callback en curso en este hilo
+_NULO = contextlib.nullcontext()
+
+
+def _etiquetas(nombres, valores):
+    if not nombres:
+        return ""
+    pares = ",".join(
+        '{}="{}"'.format(n, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for n, v in zip(nombres, valores)
+    )
+    return "{" + pares + "}"
+
+
+class Counter:
+    """Contador monótono con etiquetas."""
+
+    def __init__(self, nombre, ayuda, etiquetas=()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self._valores = {}
+        self._lock = threading.Lock()
+
+    def inc(self, valor=1, **etiquetas):
+        if not ENABLED:
+            return
+        clave = tuple(etiquetas[n] for n in self.etiquetas)
+        with self._lock:
+            self._valores[clave] = self._valores.get(clave, 0) + valor
+
+    def exposition(self):
+        lineas = [f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} counter"]
+        with self._lock:
+            valores = list(self._valores.items())
+        for clave, valor in valores:
+            lineas.append(f"{self.nombre}{_etiquetas(self.etiquetas, clave)} {valor:g}")
+        return lineas
+
+
+class Histogram:
+    """Histograma acumulado con etiquetas (buckets fijos)."""
+
+    def __init__(self, nombre, ayuda, etiquetas=(), buckets=BUCKETS_SEGUNDOS):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self.buckets = tuple(buckets)
+        self._series = {}  # etiquetas -> [conteo por bucket (+Inf al final), suma]
+        self._lock = threading.Lock()
+
+    def observe(self, valor, **etiquetas):
+        if not ENABLED:
+            return
+        clave = tuple(etiquetas[n] for n in self.etiquetas)
+        indice = bisect.bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._series.get(clave)
+            if serie is None:
+                serie = self._series[clave] = [[0] * (len(self.buckets) + 1), 0.0]
+            serie[0][indice] += 1
+            serie[1] += valor
+
+    def exposition(self):
+        lineas = [f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} histogram"]
+        with self._lock:
+            series = [(clave, list(conteos), suma) for clave, (conteos, suma) in self._series.items()]
+        for clave, conteos, suma in series:
+            acumulado = 0
+            for limite, conteo in zip(self.buckets + ("+Inf",), conteos):
+                acumulado += conteo
+                etiquetas = _etiquetas(self.etiquetas + ("le",), clave + (f"{limite:g}" if limite != "+Inf" else limite,))
+                lineas.append(f"{self.nombre}_bucket{etiquetas} {acumulado}")
+            lineas.append(f"{self.nombre}_sum{_etiquetas(self.etiquetas, clave)} {suma:.6g}")
+            lineas.append(f"{self.nombre}_count{_etiquetas(self.etiquetas, clave)} {acumulado}")
+        return lineas
+
+
+CALLBACK_SECONDS = Histogram(
+    "tecdemodel_callback_seconds", "Tiempo total de cada callback de Dash.", ["callback"])
+PHASE_SECONDS = Histogram(
+    "tecdemodel_callback_phase_seconds", "Tiempo de cada fase de un callback.", ["callback", "fase"])
+RESPONSE_BYTES = Counter(
+    "tecdemodel_callback_response_bytes_total", "Bytes de JSON enviados por cada callback.", ["callback"])
+RESPONSES = Counter(
+    "tecdemodel_callback_responses_total", "Respuestas enviadas por cada callback.", ["callback"])
+CALLBACK_TRACES = Histogram(
+    "tecdemodel_callback_traces", "Trazas en las figuras que devuelve cada callback.", ["callback"],
+    buckets=BUCKETS_TRAZAS)
+SOLVER_SECONDS = Histogram(
+    "tecdemodel_solver_seconds", "Tiempo de cálculo de cada simulación.", ["funcion"])
+UPSTREAM_SECONDS = Histogram(
+    "tecdemodel_upstream_seconds", "Latencia de las peticiones a APIs externas.", ["servicio", "estado"])
+
+METRICAS = [CALLBACK_SECONDS, PHASE_SECONDS, RESPONSE_BYTES, RESPONSES, CALLBACK_TRACES,
+            SOLVER_SECONDS, UPSTREAM_SECONDS]
+
+
+def current_callback():
+    """Nombre del callback que se ejecuta en este hilo, o None."""
+    return getattr(_local, "callback", None)
+
+
+@contextlib.contextmanager
+def _medir_fase(fase, callback):
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        PHASE_SECONDS.observe(time.perf_counter() - inicio, callback=callback, fase=fase)
+
+
+def timer(fase):
+    """
+    Context manager que mide una fase del callback en curso.
+
+    Fuera de un callback, o con las métricas desactivadas, no hace nada.
+    """
+    callback = current_callback() if ENABLED else None
+    if callback is None:
+        return _NULO
+    return _medir_fase(fase, callback)
+
+
+def _contar_trazas(valor):
+    """Trazas de las figuras (dict o go.Figure) en la salida de un callback; None si no hay figuras."""
+    salidas = valor if isinstance(valor, (list, tuple)) else [valor]
+    total = None
+    for salida in salidas:
+        datos = salida.get("data") if isinstance(salida, dict) and "layout" in salida else getattr(salida, "data", None)
+        if isinstance(datos, (list, tuple)):
+            total = (total or 0) + len(datos)
+    return total
+
+
+def _instrumentar_invocacion(invocar):
+    """Envuelve la función con la que Dash llama al código de cada callback."""
+    def _invocar(func, *args, **kwargs):
+        callback = current_callback()
+        if callback is None:
+            return invocar(func, *args, **kwargs)
+        inicio = time.perf_counter()
+        valor = invocar(func, *args, **kwargs)
+        _local.funcion = time.perf_counter() - inicio
+        PHASE_SECONDS.observe(_local.funcion, callback=callback, fase="funcion")
+        trazas = _contar_trazas(valor)
+        if trazas is not None:
+            CALLBACK_TRACES.observe(trazas, callback=callback)
+        return valor
+    _invocar.instrumentada = True
+    return _invocar
+
+
+def _instrumentar_callback(nombre, envoltura_dash):
+    @functools.wraps(envoltura_dash)
+    def _callback(*args, **kwargs):
+        _local.callback, _local.funcion = nombre, None
+        inicio = time.perf_counter()
+        try:
+            respuesta = envoltura_dash(*args, **kwargs)
+        finally:
+            total = time.perf_counter() - inicio
+            _local.callback = None
+            CALLBACK_SECONDS.observe(total, callback=nombre)
+            if _local.funcion is not None:
+                PHASE_SECONDS.observe(total - _local.funcion, callback=nombre, fase="respuesta")
+        if isinstance(respuesta, str):
+            RESPONSE_BYTES.inc(len(respuesta.encode()), callback=nombre)
+            RESPONSES.inc(callback=nombre)
+        return respuesta
+    _callback.instrumentada = True
+    return _callback
+
+
+def _instrumentar_callbacks(app):
+    for entrada in app.callback_map.values():
+        original = entrada.get("callback")
+        if original is None or getattr(original, "instrumentada", False):
+            continue
+        func = inspect.unwrap(original)
+        nombre = f"{func.__module__}.{func.__name__}"
+        entrada["callback"] = _instrumentar_callback(nombre, original)
+
+
+def render():
+    """Todas las métricas en el formato de texto de Prometheus."""
+    lineas = []
+    for metrica in METRICAS:
+        lineas.extend(metrica.exposition())
+    return "\n".join(lineas) + "\n"
+
+
+def _instrumentar_dash():
+    """Envuelve el punto por el que Dash llama al código de cada callback, si es seguro hacerlo."""
+    import dash
+    from dash import _callback
+
+    mayor = int(dash.__version__.split(".")[0])
+    invocar = getattr(_callback, "_invoke_callback", None)
+    if mayor not in DASH_PROBADO or not callable(invocar):
+        logger.warning("Dash %s no probado o sin _invoke_callback: sin las fases 'funcion' y 'respuesta'",
+                       dash.__version__)
+        return
+    if not getattr(invocar, "instrumentada", False):
+        _callback._invoke_callback = _instrumentar_invocacion(invocar)
+
+
+def init_app(app):
+    """Instrumenta los callbacks de `app` y registra /metrics (404 sin TECDEMODEL_METRICS=1)."""
+    if not ENABLED:
+        # Sin esto la ruta caería en la página 404 de Dash, que responde 200
+        app.server.add_url_rule("/metrics", "metrics", lambda: flask.abort(404))
+        return
+    _instrumentar_dash()
+
+    # callback_map se completa con los callbacks de las páginas en el primer
+    # before_request de Dash; este se registra después y corre a continuación.
+    # Las primeras peticiones pueden llegar a la vez en varios hilos
+    candado = threading.Lock()
+    instrumentados = False
+
+    @app.server.before_request
+    def _instrumentar():
+        nonlocal instrumentados
+        if instrumentados:
+            return
+        with candado:
+            if not instrumentados:
+                _instrumentar_callbacks(app)
+                instrumentados = True
+
+    @app.server.route("/metrics")
+    def metrics():
+        return flask.Response(render(), content_type="text/plain; version=0.0.4; charset=utf-8")
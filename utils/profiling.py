@@ -0,0 +1,218 @@
+"""
+Perfiles de cProfile bajo demanda para callbacks individuales.
+
+Con TECDEMODEL_PROFILE_TOKEN definido, una invocación de callback se
+perfila si la petición trae ese token en la cabecera `X-Profile-Token`, o
+desde un navegador que abrió `/_perfiles?token=...` (cookie de acceso) y
+pulsó "Perfilar mis callbacks" (`?activar=1`). El perfil se guarda en
+TECDEMODEL_PROFILE_DIR (por defecto, un directorio temporal) con el
+callback y sus parámetros en el nombre, listo para `pstats` o snakeviz, y
+`/_perfiles` lista los más recientes con sus funciones más costosas.
+
+Mientras se perfila, `follow_job` calcula la simulación en línea y sin
+caché, de modo que el integrador aparece en el perfil aunque normalmente
+corra en un proceso de `utils.jobs`.
+
+Sin el token no se envuelve nada y las rutas responden 404.
+"""
+import cProfile
+import functools
+import hashlib
+import hmac
+import html
+import inspect
+import logging
+import os
+import pstats
+import re
+import tempfile
+import threading
+import time
+
+import flask
+
+logger = logging.getLogger(__name__)
+
+TOKEN = os.environ.get("TECDEMODEL_PROFILE_TOKEN") or None
+DIRECTORIO = os.environ.get("TECDEMODEL_PROFILE_DIR") or os.path.join(tempfile.gettempdir(), "tecdemodel-perfiles")
+MAX_PERFILES = int(os.environ.get("TECDEMODEL_PROFILE_MAX", 50))
+COOKIE = "tecdemodel_perfil"  # token: acceso a /_perfiles
+COOKIE_ACTIVO = "tecdemodel_perfilar"  # "1": perfilar los callbacks de este navegador
+FUNCIONES = 12  # filas por perfil en el listado
+
+_local = threading.local()
+# Un solo perfil a la vez: desde Python 3.12 cProfile no admite dos activos en el proceso
+_candado = threading.Lock()
+
+
+def active():
+    """True si el callback que corre en este hilo se está perfilando."""
+    return getattr(_local, "activo", False)
+
+
+def _autorizado():
+    valor = flask.request.headers.get("X-Profile-Token") or flask.request.cookies.get(COOKIE) or ""
+    return hmac.compare_digest(valor.encode(), TOKEN.encode())
+
+
+def _solicitado():
+    """True si la petición en curso pide perfilar su callback."""
+    if "X-Profile-Token" in flask.request.headers:
+        return _autorizado()
+    return flask.request.cookies.get(COOKIE_ACTIVO) == "1" and _autorizado()
+
+
+def _parametros(args):
+    """Parámetros del callback en forma apta para un nombre de archivo."""
+    texto = "_".join("-" if a is None else str(a) for a in args)
+    limpio = re.sub(r"_+", "_", re.sub(r"[^A-Za-z0-9.\-]+", "_", texto)).strip("_")[:80]
+    # Parámetros largos o truncados siguen siendo únicos
+    return f"{limpio}_{hashlib.sha1(texto.encode()).hexdigest()[:8]}"
+
+
+def _guardar(perfil, callback, args):
+    os.makedirs(DIRECTORIO, exist_ok=True)
+    nombre = f"{time.strftime('%Y%m%d-%H%M%S')}__{callback}__{_parametros(args)}.prof"
+    perfil.dump_stats(os.path.join(DIRECTORIO, nombre))
+    for viejo in _archivos()[MAX_PERFILES:]:
+        try:
+            os.remove(os.path.join(DIRECTORIO, viejo))
+        except OSError:
+            pass
+    return nombre
+
+
+def _archivos():
+    """Perfiles guardados, del más reciente al más antiguo."""
+    try:
+        nombres = [n for n in os.listdir(DIRECTORIO) if n.endswith(".prof")]
+    except FileNotFoundError:
+        return []
+    return sorted(nombres, reverse=True)
+
+
+def _perfilar_callback(nombre, envoltura_dash):
+    @functools.wraps(envoltura_dash)
+    def _callback(*args, **kwargs):
+        if not _solicitado() or not _candado.acquire(blocking=False):
+            return envoltura_dash(*args, **kwargs)
+        perfil = cProfile.Profile()
+        _local.activo = True
+        try:
+            return perfil.runcall(envoltura_dash, *args, **kwargs)
+        finally:
+            _local.activo = False
+            _candado.release()
+            try:
+                logger.info("Perfil guardado: %s", _guardar(perfil, nombre, args))
+            except OSError:
+                logger.exception("No se pudo guardar el perfil de %s", nombre)
+    return _callback
+
+
+def top_functions(ruta, n=FUNCIONES):
+    """
+    Funciones con más tiempo propio de un perfil (el acumulado lo encabeza
+    siempre la misma cadena de envolturas del callback).
+
+    Retorna:
+    --------
+    total : float
+        Segundos perfilados
+    filas : list of tuple
+        (función, llamadas, tiempo propio, tiempo acumulado)
+    """
+    estadisticas = pstats.Stats(ruta)
+    filas = sorted(estadisticas.stats.items(), key=lambda kv: kv[1][2], reverse=True)[:n]
+    return estadisticas.total_tt, [
+        (f"{funcion} ({os.path.basename(archivo)}:{linea})", llamadas, propio, acumulado)
+        for (archivo, linea, funcion), (_, llamadas, propio, acumulado, _) in filas
+    ]
+
+
+def _pagina(mensaje):
+    partes = [
+        "<!doctype html><meta charset='utf-8'><title>Perfiles</title>",
+        "<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;margin-bottom:2em}"
+        "td,th{padding:2px 10px;text-align:right}td:first-child,th:first-child{text-align:left}</style>",
+        f"<h1>Perfiles recientes</h1><p>{html.escape(mensaje)}</p>",
+        "<p><a href='?activar=1'>Perfilar mis callbacks</a> · <a href='?desactivar=1'>Dejar de perfilar</a></p>",
+    ]
+    for nombre in _archivos()[:20]:
+        fecha, callback, parametros = nombre[:-len(".prof")].split("__", 2)
+        try:
+            total, filas = top_functions(os.path.join(DIRECTORIO, nombre))
+        except Exception as error:
+            partes.append(f"<p>{html.escape(nombre)}: {html.escape(str(error))}</p>")
+            continue
+        partes.append(
+            f"<h3>{html.escape(callback)} — {html.escape(fecha)} — {total * 1000:.1f} ms "
+            f"<a href='/_perfiles/{html.escape(nombre)}'>.prof</a></h3>"
+            f"<p>Parámetros: <code>{html.escape(parametros)}</code></p>"
+            "<table><tr><th>función</th><th>llamadas</th><th>propio (ms)</th><th>acumulado (ms)</th></tr>"
+        )
+        for funcion, llamadas, propio, acumulado in filas:
+            partes.append(f"<tr><td>{html.escape(funcion)}</td><td>{llamadas}</td>"
+                          f"<td>{propio * 1000:.2f}</td><td>{acumulado * 1000:.2f}</td></tr>")
+        partes.append("</table>")
+    return "".join(partes)
+
+
+def _listado():
+    consulta = flask.request.args
+    if consulta.get("token"):
+        # Intercambia el token de la URL por la cookie y lo quita de la barra de direcciones
+        if not hmac.compare_digest(consulta["token"].encode(), TOKEN.encode()):
+            flask.abort(403)
+        respuesta = flask.redirect(flask.url_for("perfiles", **{k: v for k, v in consulta.items() if k != "token"}))
+        respuesta.set_cookie(COOKIE, TOKEN, httponly=True, samesite="Strict", secure=flask.request.is_secure)
+        return respuesta
+    if not _autorizado():
+        flask.abort(403)
+    activo = flask.request.cookies.get(COOKIE_ACTIVO) == "1"
+    if consulta.get("activar") or consulta.get("desactivar"):
+        activo = bool(consulta.get("activar"))
+    respuesta = flask.make_response(_pagina(
+        "Cada callback que dispare este navegador se perfila." if activo
+        else "Perfilado desactivado para este navegador (la cabecera X-Profile-Token sigue funcionando)."))
+    if consulta.get("activar"):
+        respuesta.set_cookie(COOKIE_ACTIVO, "1", httponly=True, samesite="Strict", secure=flask.request.is_secure)
+    elif consulta.get("desactivar"):
+        respuesta.delete_cookie(COOKIE_ACTIVO)
+    return respuesta
+
+
+def _descargar(nombre):
+    if not _autorizado() or nombre not in _archivos():
+        flask.abort(404)
+    return flask.send_from_directory(DIRECTORIO, nombre, as_attachment=True)
+
+
+def init_app(app):
+    """Envuelve los callbacks de `app` y registra /_perfiles (404 sin TECDEMODEL_PROFILE_TOKEN)."""
+    if TOKEN is None:
+        # Sin esto las rutas caerían en la página 404 de Dash, que responde 200
+        app.server.add_url_rule("/_perfiles", "perfiles", lambda: flask.abort(404))
+        app.server.add_url_rule("/_perfiles/<nombre>", "perfil", lambda nombre: flask.abort(404))
+        return
+    candado = threading.Lock()
+    envueltos = False
+
+    @app.server.before_request
+    def _envolver():
+        # Después del before_request de Dash, que completa callback_map con las páginas;
+        # las primeras peticiones pueden llegar a la vez en varios hilos
+        nonlocal envueltos
+        if envueltos:
+            return
+        with candado:
+            if envueltos:
+                return
+            for entrada in app.callback_map.values():
+                if entrada.get("callback") is not None:
+                    func = inspect.unwrap(entrada["callback"])
+                    entrada["callback"] = _perfilar_callback(f"{func.__module__}.{func.__name__}", entrada["callback"])
+            envueltos = True
+
+    app.server.add_url_rule("/_perfiles", "perfiles", _listado)
+    app.server.add_url_rule("/_perfiles/<nombre>", "perfil", _descargar)
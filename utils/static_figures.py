@@ -0,0 +1,103 @@
+"""
+Figuras estáticas preserializadas.
+
+Las figuras que no dependen de ningún parámetro se serializan a JSON una sola
+vez y se sirven como bytes desde `/_figuras/<nombre>.json` con ETag, de modo
+que el navegador revalida con `If-None-Match` y recibe un 304 sin cuerpo. El
+`dcc.Graph` de la página se llena con una callback del lado del cliente
+(`assets/figuras.js`) que descarga ese JSON; el layout ya no incluye la
+figura y Dash no la vuelve a serializar en cada carga.
+
+En lugar de la figura se puede registrar la función que la construye: se
+llama en la primera petición (o en el precálculo de `utils.warmup`), de modo
+que importar la página no cuesta construir ni serializar nada.
+"""
+import hashlib
+import threading
+
+import dash
+import flask
+import plotly.io as pio
+from dash import dcc, Input, Output, ClientsideFunction
+
+
+PREFIJO_ID = "figura-estatica-"
+
+_figuras = {}  # nombre -> (json en bytes, etag)
+_pendientes = {}  # nombre -> función que construye la figura
+_candado = threading.Lock()
+
+
+def register_static_figure(nombre, figura):
+    """
+    Publica `figura` con el nombre dado y retorna la URL.
+
+    Si `figura` es una función, se llama y se serializa en el primer uso;
+    si no, se serializa de inmediato.
+    """
+    if callable(figura):
+        _pendientes[nombre] = figura
+    else:
+        _serializar(nombre, figura)
+    return f"/_figuras/{nombre}.json"
+
+
+def _serializar(nombre, figura):
+    contenido = pio.to_json(figura, validate=False).encode()
+    _figuras[nombre] = (contenido, hashlib.sha1(contenido).hexdigest())
+
+
+def _obtener(nombre):
+    """(json, etag) de la figura, construyéndola si todavía está pendiente."""
+    if nombre not in _figuras and nombre in _pendientes:
+        with _candado:
+            if nombre not in _figuras:
+                _serializar(nombre, _pendientes[nombre]())
+    return _figuras.get(nombre)
+
+
+def build_pending():
+    """Construye todas las figuras pendientes; retorna cuántas había."""
+    pendientes = [nombre for nombre in _pendientes if nombre not in _figuras]
+    for nombre in pendientes:
+        _obtener(nombre)
+    return len(pendientes)
+
+
+def static_graph(nombre, figura, **kwargs):
+    """
+    `dcc.Graph` cuya figura se sirve preserializada.
+
+    Parámetros:
+    -----------
+    nombre : str
+        Identificador único de la figura (aparece en la URL)
+    figura : go.Figure, dict o callable
+        Figura constante, o función sin argumentos que la construye
+    **kwargs
+        Argumentos de `dcc.Graph` (style, className, ...)
+    """
+    register_static_figure(nombre, figura)
+    grafica_id = PREFIJO_ID + nombre
+    dash.clientside_callback(
+        ClientsideFunction(namespace="figuras", function_name="cargar"),
+        Output(grafica_id, "figure"),
+        Input(grafica_id, "id"),
+    )
+    return dcc.Graph(id=grafica_id, **kwargs)
+
+
+def _servir_figura(nombre):
+    figura = _obtener(nombre)
+    if figura is None:
+        flask.abort(404)
+    contenido, etag = figura
+    respuesta = flask.Response(contenido, mimetype="application/json")
+    respuesta.set_etag(etag)
+    respuesta.cache_control.no_cache = True  # siempre revalidar: el ETag evita reenviar el cuerpo
+    return respuesta.make_conditional(flask.request)
+
+
+def init_app(server):
+    """Registra la ruta de figuras estáticas en el servidor Flask."""
+    server.add_url_rule("/_figuras/<nombre>.json", "figura_estatica", _servir_figura)
@@ -0,0 +1,157 @@
+"""
+Precálculo de las simulaciones por defecto al arrancar.
+
+Cada página registra las llamadas que su primer render va a pedir (las
+funciones decoradas con `@cached_simulation` y sus parámetros por defecto).
+Al arrancar la aplicación `warm_up` las calcula y deja en la caché, de
+modo que el callback inicial encuentra el resultado con `lookup` y devuelve
+la figura sin enviar ningún trabajo: la primera carga es tan rápida como
+una imagen estática.
+
+Las dependencias pesadas (scipy.integrate, pandas, requests) se importan
+dentro de las funciones que las usan y las figuras estáticas se construyen
+en su primera petición, así que importar la aplicación es barato. Las
+páginas registran aquí esos módulos con `register_import` y `warm_up` los
+importa junto con las figuras pendientes y las simulaciones.
+
+Configuración:
+- TECDEMODEL_WARMUP=0 desactiva el precálculo de simulaciones y, en modo
+  diferido, todo el trabajo en segundo plano (cada cosa se hace en su
+  primer uso).
+- TECDEMODEL_LAZY=0 hace todo el precálculo al importar la aplicación (el
+  proceso tarda más en arrancar pero la primera visita no paga nada; útil
+  si el servidor importa la aplicación antes de crear los workers). Por
+  defecto (1) se hace en un hilo después de importarla.
+"""
+import importlib
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+LAZY = os.environ.get("TECDEMODEL_LAZY", "1") != "0"
+
+_registro = []  # (función cacheada, args, kwargs)
+_modulos = []  # módulos cuya importación se difiere hasta el primer uso
+# Activo mientras ningún hilo del precálculo está importando módulos
+_sin_importaciones = threading.Event()
+_sin_importaciones.set()
+# Activo cuando el precálculo terminó (o no se va a hacer)
+_listo = threading.Event()
+
+
+def _activo():
+    return os.environ.get("TECDEMODEL_WARMUP", "1") != "0"
+
+
+def ready():
+    """True cuando `warm_up` terminó o el precálculo en segundo plano está desactivado."""
+    return _listo.is_set()
+
+
+def register(funcion, *args, **kwargs):
+    """Registra una llamada a precalcular; `funcion` debe estar decorada con @cached_simulation."""
+    _registro.append((funcion, args, kwargs))
+    return funcion
+
+
+def register_import(*nombres):
+    """Registra módulos que se importan en el primer uso para importarlos durante el precálculo."""
+    _modulos.extend(nombre for nombre in nombres if nombre not in _modulos)
+
+
+def wait_for_imports(timeout=30):
+    """
+    Espera a que el precálculo termine de importar los módulos diferidos.
+
+    Un fork mientras otro hilo ejecuta un import hereda el candado de ese
+    módulo sin el hilo que lo libera, y el hijo se bloquea si intenta
+    importarlo. `utils.jobs` llama a esta función antes de crear procesos.
+    """
+    return _sin_importaciones.wait(timeout)
+
+
+def warm_up(en_segundo_plano=False):
+    """
+    Importa los módulos diferidos, construye las figuras estáticas
+    pendientes y precalcula las simulaciones registradas (esto último
+    salvo con TECDEMODEL_WARMUP=0).
+
+    Parámetros:
+    -----------
+    en_segundo_plano : bool
+        Si es True se hace en un hilo y la función retorna de inmediato
+
+    Retorna:
+    --------
+    hilo : threading.Thread o None
+        El hilo de precálculo, o None si se hizo en línea o está desactivado
+    """
+    if en_segundo_plano:
+        if not _activo():
+            _listo.set()
+            return None
+        _sin_importaciones.clear()
+        hilo = threading.Thread(target=warm_up, name="warmup", daemon=True)
+        hilo.start()
+        return hilo
+
+    from utils import static_figures
+
+    inicio = time.perf_counter()
+    _sin_importaciones.clear()
+    try:
+        for nombre in list(_modulos):
+            try:
+                importlib.import_module(nombre)
+            except ImportError:
+                logger.exception("No se pudo importar %s", nombre)
+    finally:
+        _sin_importaciones.set()
+    try:
+        figuras = static_figures.build_pending()
+        logger.info("Precálculo: %d módulos y %d figuras en %.2f s",
+                    len(_modulos), figuras, time.perf_counter() - inicio)
+        warm_cache()
+    finally:
+        _listo.set()
+    return None
+
+
+def warm_cache(en_segundo_plano=False):
+    """
+    Calcula las llamadas registradas que aún no están en la caché.
+
+    Parámetros:
+    -----------
+    en_segundo_plano : bool
+        Si es True se calcula en un hilo y la función retorna de inmediato
+
+    Retorna:
+    --------
+    hilo : threading.Thread o None
+        El hilo de precálculo, o None si se calculó en línea o está desactivado
+    """
+    if not _activo():
+        return None
+    if en_segundo_plano:
+        hilo = threading.Thread(target=warm_cache, name="warmup", daemon=True)
+        hilo.start()
+        return hilo
+
+    inicio = time.perf_counter()
+    calculadas = 0
+    for funcion, args, kwargs in list(_registro):
+        if funcion.lookup(*args, **kwargs)[0]:
+            continue
+        try:
+            funcion(*args, **kwargs)
+            calculadas += 1
+        except Exception:
+            # Un precálculo fallido no debe impedir el arranque; el callback lo reintentará
+            logger.exception("Falló el precálculo de %s", getattr(funcion, "__qualname__", funcion))
+    logger.info("Precálculo: %d de %d simulaciones en %.2f s",
+                calculadas, len(_registro), time.perf_counter() - inicio)
+    return None
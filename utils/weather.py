@@ -0,0 +1,221 @@
+"""
+Cliente HTTP para la API de Open-Meteo.
+
+Reutiliza una sesión con pool de conexiones (sin repetir el saludo TCP/TLS en
+cada clic), aplica timeouts de conexión y lectura para que un servidor lento
+no bloquee un worker indefinidamente, reintenta los errores transitorios con
+backoff exponencial y guarda las respuestas en una caché con TTL indexada por
+latitud/longitud redondeadas y número de días.
+
+`requests` y `pandas` se importan recién cuando se usan (la sesión se crea
+en la primera consulta), así que importar el módulo no alarga el arranque.
+
+La URL base se puede cambiar con TECDEMODEL_OPEN_METEO_URL (por ejemplo, para
+apuntar a un servidor local de pruebas).
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from utils import metrics
+
+
+OPEN_METEO_URL = os.environ.get("TECDEMODEL_OPEN_METEO_URL", "https://api.open-meteo.com/v1/forecast")
+
+
+class WeatherClient:
+    """
+    Cliente de temperaturas horarias.
+
+    Parámetros:
+    -----------
+    base_url : str
+        Endpoint de pronóstico de Open-Meteo (o un sustituto local)
+    timeout : tuple
+        (conexión, lectura) en segundos
+    reintentos : int
+        Reintentos ante errores de conexión y códigos 429/5xx
+    backoff : float
+        Factor de espera exponencial entre reintentos
+    ttl : float
+        Segundos que una respuesta permanece en caché
+    decimales : int
+        Redondeo de latitud y longitud para la clave de caché (2 ≈ 1 km)
+    max_entradas : int
+        Tamaño máximo de la caché
+    pool : int
+        Conexiones simultáneas por host
+    """
+
+    def __init__(self, base_url=OPEN_METEO_URL, timeout=(3.05, 10), reintentos=3, backoff=0.5,
+                 ttl=600, decimales=2, max_entradas=256, pool=10):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.ttl = ttl
+        self.decimales = decimales
+        self.max_entradas = max_entradas
+        self.reintentos = reintentos
+        self.backoff = backoff
+        self.pool = pool
+
+        self._session = None
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """`requests.Session` con reintentos y pool, creada en el primer uso."""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            reintento = Retry(
+                total=self.reintentos, connect=self.reintentos, read=self.reintentos,
+                backoff_factor=self.backoff, status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("GET",), raise_on_status=False,
+            )
+            adaptador = HTTPAdapter(pool_connections=self.pool, pool_maxsize=self.pool, max_retries=reintento)
+            session = requests.Session()
+            session.mount("http://", adaptador)
+            session.mount("https://", adaptador)
+            with self._lock:
+                if self._session is None:
+                    self._session = session
+        return self._session
+
+    def _get(self, params):
+        inicio = time.perf_counter()
+        estado = "error"
+        try:
+            respuesta = self.session.get(self.base_url, params=params, timeout=self.timeout)
+            estado = str(respuesta.status_code)
+            return respuesta
+        finally:
+            metrics.UPSTREAM_SECONDS.observe(time.perf_counter() - inicio, servicio="open-meteo", estado=estado)
+
+    def _clave(self, lat, lon, days):
+        return (round(float(lat), self.decimales), round(float(lon), self.decimales), int(days))
+
+    def hourly_temperature(self, lat, lon, days):
+        """
+        Temperaturas horarias de los últimos `days` días (más el día actual).
+
+        Retorna:
+        --------
+        times : list of str
+            Instantes en formato ISO 8601 (GMT)
+        temps : list of float
+            Temperatura a 2 m en °C
+
+        Lanza `requests.HTTPError` si la API responde con un código de error
+        y `requests.RequestException` ante fallos de red o timeouts.
+        """
+        clave = self._clave(lat, lon, days)
+        ahora = time.monotonic()
+        with self._lock:
+            if clave in self._cache:
+                expira, valor = self._cache[clave]
+                if expira > ahora:
+                    self._cache.move_to_end(clave)
+                    return valor
+                del self._cache[clave]
+
+        lat, lon, days = clave
+        respuesta = self._get({
+            "latitude": lat,
+            "longitude": lon,
+            "past_days": days,
+            "hourly": "temperature_2m",
+            "forecast_days": 1,
+        })
+        respuesta.raise_for_status()
+        data = respuesta.json()
+        valor = (data["hourly"]["time"], data["hourly"]["temperature_2m"])
+
+        with self._lock:
+            self._cache[clave] = (ahora + self.ttl, valor)
+            while len(self._cache) > self.max_entradas:
+                self._cache.popitem(last=False)
+        return valor
+
+    def hourly_temperature_range(self, lat, lon, inicio, fin):
+        """
+        Temperaturas horarias entre dos horas (ambas incluidas), sin caché TTL.
+
+        Parámetros:
+        -----------
+        lat, lon : float
+            Coordenadas (se redondean como en `hourly_temperature`)
+        inicio, fin : np.datetime64 o str
+            Primera y última hora, en GMT
+
+        Retorna:
+        --------
+        times, temps : list
+            Igual que `hourly_temperature`
+        """
+        lat, lon, _ = self._clave(lat, lon, 0)
+        respuesta = self._get({
+            "latitude": lat,
+            "longitude": lon,
+            "hourly": "temperature_2m",
+            "start_hour": str(np.datetime64(inicio, "m")),
+            "end_hour": str(np.datetime64(fin, "m")),
+        })
+        respuesta.raise_for_status()
+        data = respuesta.json()
+        return data["hourly"]["time"], data["hourly"]["temperature_2m"]
+
+    def hourly_temperature_many(self, ubicaciones, days, max_workers=8):
+        """
+        Consulta varias ubicaciones en paralelo y une las series.
+
+        Las peticiones se lanzan en un pool de hilos acotado, así que la
+        latencia total es cercana a la de la petición más lenta y no a la
+        suma de todas.
+
+        Parámetros:
+        -----------
+        ubicaciones : list of tuple
+            Pares (lat, lon)
+        days : int
+            Días pasados a consultar
+        max_workers : int
+            Máximo de peticiones simultáneas
+
+        Retorna:
+        --------
+        frame : pd.DataFrame
+            Índice temporal y una columna "lat, lon" por ubicación
+        errores : dict
+            Etiqueta -> excepción de las ubicaciones que fallaron
+        """
+        import pandas as pd
+
+        etiquetas = [f"{lat}, {lon}" for lat, lon in ubicaciones]
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(ubicaciones)))) as pool:
+            futuros = [pool.submit(self.hourly_temperature, lat, lon, days) for lat, lon in ubicaciones]
+
+        series, errores = [], {}
+        for etiqueta, futuro in zip(etiquetas, futuros):
+            try:
+                times, temps = futuro.result()
+            except Exception as error:
+                errores[etiqueta] = error
+                continue
+            series.append(pd.Series(temps, index=pd.to_datetime(times), name=etiqueta, dtype=float))
+
+        frame = pd.concat(series, axis=1) if series else pd.DataFrame()
+        return frame, errores
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+default_client = WeatherClient()
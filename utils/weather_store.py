@@ -0,0 +1,247 @@
+"""
+Almacén local e incremental de temperaturas horarias.
+
+Cada ubicación (latitud/longitud redondeadas) tiene un índice y un archivo
+de datos:
+
+    <clave>.json    índice: {"inicio": primera hora (horas desde 1970),
+                    "horas": n, "version": v}
+    <clave>.<v>.f4  temperaturas float32 consecutivas, una por hora (NaN si falta)
+
+El índice registra el rango de horas que ya se tiene. Una consulta solo pide
+a la API las horas que faltan y las agrega al final del archivo; las horas
+guardadas como NaN (la API no las tenía) cuentan como faltantes mientras
+sigan dentro de la historia de la API y se rellenan en su lugar. Si faltan
+horas anteriores al inicio, los datos se escriben completos en la versión
+siguiente y el índice pasa a apuntarla con un reemplazo atómico: el índice
+nunca describe un archivo con otro inicio, y los bytes que una escritura
+interrumpida deje tras las `horas` indexadas se descartan en la siguiente.
+Las lecturas toman el candado compartido y usan `np.memmap`, así que ver 90
+días de una ubicación ya guardada no requiere red ni casi ningún análisis.
+
+El directorio se configura con TECDEMODEL_WEATHER_DIR.
+"""
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: sin flock; basta un candado del proceso (ahí no hay varios workers de gunicorn)
+    fcntl = None
+
+import numpy as np
+
+from utils.weather import default_client
+
+
+# Open-Meteo solo ofrece ~92 días hacia atrás en el endpoint de pronóstico
+MAX_HORAS_HISTORIA = 92 * 24
+
+DIRECTORIO = os.environ.get(
+    "TECDEMODEL_WEATHER_DIR", os.path.join(tempfile.gettempdir(), "tecdemodel", "clima")
+)
+
+
+def _hora(valor):
+    """np.datetime64 / str -> horas desde 1970 (int)."""
+    return int(np.datetime64(valor, "h").astype(np.int64))
+
+
+_candado_local = threading.Lock()
+
+
+class WeatherStore:
+    """
+    Series horarias de temperatura persistidas en disco por ubicación.
+
+    Parámetros:
+    -----------
+    directorio : str
+        Carpeta de los archivos
+    cliente : WeatherClient
+        Cliente usado para descargar las horas faltantes
+    """
+
+    def __init__(self, directorio=DIRECTORIO, cliente=default_client):
+        self.directorio = directorio
+        self.cliente = cliente
+        os.makedirs(directorio, exist_ok=True)
+
+    def _base(self, lat, lon):
+        lat, lon, _ = self.cliente._clave(lat, lon, 0)
+        return os.path.join(self.directorio, f"{lat:+.{self.cliente.decimales}f}_{lon:+.{self.cliente.decimales}f}")
+
+    @staticmethod
+    def _ruta_datos(base, version):
+        return f"{base}.{version}.f4"
+
+    @contextmanager
+    def _bloqueo(self, base, exclusivo=True):
+        # Exclusivo para escribir (serializa a varios workers sobre la misma
+        # ubicación); compartido para leer un índice y sus datos a la vez
+        if fcntl is None:
+            with _candado_local:
+                yield
+            return
+        with open(base + ".lock", "a") as candado:
+            fcntl.flock(candado, fcntl.LOCK_EX if exclusivo else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(candado, fcntl.LOCK_UN)
+
+    def _leer_indice(self, ruta_indice):
+        try:
+            with open(ruta_indice) as archivo:
+                indice = json.load(archivo)
+        except (OSError, ValueError):
+            return None
+        # Índices sin versión (datos en <clave>.f4) se descartan y se vuelven a descargar
+        return indice if "version" in indice else None
+
+    def _escribir_indice(self, ruta_indice, inicio, horas, version):
+        temporal = ruta_indice + ".tmp"
+        with open(temporal, "w") as archivo:
+            json.dump({"inicio": inicio, "horas": horas, "version": version}, archivo)
+        os.replace(temporal, ruta_indice)
+
+    def _descargar(self, lat, lon, inicio, fin):
+        """Horas [inicio, fin) como array float32 alineado (NaN si la API no las trae)."""
+        times, temps = self.cliente.hourly_temperature_range(
+            lat, lon, np.datetime64(inicio, "h"), np.datetime64(fin - 1, "h"))
+        valores = np.full(fin - inicio, np.nan, dtype=np.float32)
+        posiciones = np.array(times, dtype="datetime64[h]").astype(np.int64) - inicio
+        dentro = (posiciones >= 0) & (posiciones < len(valores))
+        valores[posiciones[dentro]] = np.array(temps, dtype=float)[dentro]
+        return valores
+
+    def ensure(self, lat, lon, inicio, fin):
+        """Garantiza que las horas [inicio, fin) estén guardadas; descarga solo lo que falta."""
+        base = self._base(lat, lon)
+        ruta_indice = base + ".json"
+        with self._bloqueo(base):
+            indice = self._leer_indice(ruta_indice)
+            version = indice["version"] if indice is not None else 0
+            if indice is not None:
+                guardado_inicio = indice["inicio"]
+                guardado_fin = guardado_inicio + indice["horas"]
+                # Un hueco mayor que la historia de la API no se puede rellenar: se reinicia
+                if inicio - guardado_fin > MAX_HORAS_HISTORIA or guardado_inicio - fin > MAX_HORAS_HISTORIA:
+                    indice = None
+
+            if indice is None:
+                self._reemplazar(base, version, version + 1, inicio, self._descargar(lat, lon, inicio, fin))
+                return
+
+            ruta_datos = self._ruta_datos(base, version)
+            huecos = self._horas_nan(ruta_datos, guardado_inicio, max(inicio, guardado_inicio, fin - MAX_HORAS_HISTORIA),
+                                     min(fin, guardado_fin))
+            if huecos is not None or fin > guardado_fin:
+                # Una sola descarga: desde el primer NaN (o el final guardado) hasta lo que falte
+                desde = huecos[0] if huecos is not None else guardado_fin
+                hasta = fin if fin > guardado_fin else huecos[1]
+                nuevos = self._descargar(lat, lon, desde, hasta)
+                with open(ruta_datos, "r+b") as archivo:
+                    # Descarta bytes de una escritura previa interrumpida antes de agregar
+                    archivo.truncate(indice["horas"] * 4)
+                    if huecos is not None:
+                        n = min(hasta, guardado_fin) - desde
+                        archivo.seek((desde - guardado_inicio) * 4)
+                        guardados = np.frombuffer(archivo.read(n * 4), dtype=np.float32)
+                        archivo.seek((desde - guardado_inicio) * 4)
+                        archivo.write(np.where(np.isnan(guardados), nuevos[:n], guardados).tobytes())
+                        nuevos = nuevos[n:]
+                    archivo.seek(0, os.SEEK_END)
+                    archivo.write(nuevos.tobytes())
+                guardado_fin = max(fin, guardado_fin)
+
+            if inicio < guardado_inicio:
+                anteriores = self._descargar(lat, lon, inicio, guardado_inicio)
+                actuales = np.fromfile(ruta_datos, dtype=np.float32, count=guardado_fin - guardado_inicio)
+                self._reemplazar(base, version, version + 1, inicio, np.concatenate([anteriores, actuales]))
+                return
+
+            # Solo se agregaron horas: mismo archivo, índice con la nueva longitud
+            self._escribir_indice(ruta_indice, guardado_inicio, guardado_fin - guardado_inicio, version)
+
+    @staticmethod
+    def _horas_nan(ruta_datos, guardado_inicio, desde, hasta):
+        """Primera hora y última + 1 de [desde, hasta) guardadas como NaN, o None si no hay."""
+        if hasta <= desde:
+            return None
+        valores = np.fromfile(ruta_datos, dtype=np.float32, count=hasta - desde,
+                              offset=(desde - guardado_inicio) * 4)
+        nan = np.flatnonzero(np.isnan(valores))
+        if nan.size == 0:
+            return None
+        return desde + int(nan[0]), desde + int(nan[-1]) + 1
+
+    def _reemplazar(self, base, anterior, version, inicio, valores):
+        """Escribe `valores` como una versión nueva de los datos y apunta el índice a ella."""
+        ruta_datos = self._ruta_datos(base, version)
+        temporal = ruta_datos + ".tmp"
+        valores.astype(np.float32).tofile(temporal)
+        os.replace(temporal, ruta_datos)
+        # El reemplazo del índice es el punto de confirmación: antes, los lectores
+        # siguen viendo la versión anterior completa
+        self._escribir_indice(base + ".json", inicio, len(valores), version)
+        try:
+            os.remove(self._ruta_datos(base, anterior))
+        except OSError:
+            pass
+
+    def read(self, lat, lon, inicio, fin):
+        """
+        Lee las horas [inicio, fin) ya guardadas, mapeadas en memoria.
+
+        Retorna:
+        --------
+        times : np.ndarray
+            Horas como datetime64[m]
+        temps : np.ndarray
+            Vista float32 de solo lectura sobre el archivo
+        """
+        vacio = np.array([], dtype="datetime64[m]"), np.array([], dtype=np.float32)
+        base = self._base(lat, lon)
+        # El índice y sus datos se leen juntos: un mapeo abierto sigue siendo
+        # válido aunque después una escritura reemplace o borre el archivo
+        with self._bloqueo(base, exclusivo=False):
+            indice = self._leer_indice(base + ".json")
+            if indice is None or indice["horas"] == 0:
+                return vacio
+            ruta_datos = self._ruta_datos(base, indice["version"])
+            try:
+                if os.path.getsize(ruta_datos) < indice["horas"] * 4:
+                    return vacio
+                datos = np.memmap(ruta_datos, dtype=np.float32, mode="r", shape=(indice["horas"],))
+            except OSError:
+                return vacio
+        desde = max(inicio, indice["inicio"]) - indice["inicio"]
+        hasta = min(fin, indice["inicio"] + indice["horas"]) - indice["inicio"]
+        desde, hasta = min(desde, hasta), max(desde, hasta)
+        # En minutos, para que se serialicen como "AAAA-MM-DDTHH:MM", igual que la API
+        times = np.arange(indice["inicio"] + desde, indice["inicio"] + hasta).astype("datetime64[h]").astype("datetime64[m]")
+        return times, datos[desde:hasta]
+
+    def hourly_temperature(self, lat, lon, days, ahora=None):
+        """
+        Temperaturas desde las 00:00 (GMT) de hace `days` días hasta la hora actual.
+
+        Retorna:
+        --------
+        times : np.ndarray
+            Horas como datetime64[m]
+        temps : np.ndarray
+            Temperatura a 2 m en °C (float32, NaN si la API no la tiene)
+        """
+        fin = _hora(ahora if ahora is not None else np.datetime64("now")) + 1
+        inicio = (fin - 1) // 24 * 24 - int(days) * 24
+        self.ensure(lat, lon, inicio, fin)
+        return self.read(lat, lon, inicio, fin)
+
+
+default_store = WeatherStore()
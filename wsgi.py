@@ -0,0 +1,10 @@
+"""
+Punto de entrada WSGI de producción.
+
+    gunicorn -c gunicorn.conf.py wsgi:server
+
+`app.py` queda para el servidor de desarrollo (`python app.py`).
+"""
+from app import app
+
+server = app.server